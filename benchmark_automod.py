@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+AutoMod Throughput Benchmark for Discord Moderation Bot
+Replays a JSONL message corpus through AutoModerationCog.on_message using
+lightweight stand-ins for discord.py objects, so no gateway connection is needed.
+
+Usage:
+    python benchmark_automod.py                         # built-in synthetic corpus
+    python benchmark_automod.py --generate corpus.jsonl # write the synthetic corpus
+    python benchmark_automod.py --corpus corpus.jsonl   # replay a saved corpus
+
+Each corpus line is a JSON object:
+    {"scenario": "spam_wave", "author_id": 1001, "channel_id": 10, "content": "..."}
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+import json
+import random
+import sqlite3
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+from main import ModerationBot
+from cogs.automod import AutoModerationCog
+
+BENCH_GUILD_ID = 1
+
+# ---------------------------------------------------------------------------
+# Lightweight stand-ins for discord.py objects
+# ---------------------------------------------------------------------------
+
+class FakePermissions:
+    def __init__(self, manage_messages: bool = False):
+        self.manage_messages = manage_messages
+        self.administrator = False
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.bot = False
+        self.mention = f"<@{user_id}>"
+
+class FakeMember(FakeUser):
+    def __init__(self, user_id: int, guild: "FakeGuild"):
+        super().__init__(user_id)
+        self.guild = guild
+        self.guild_permissions = FakePermissions()
+        self._roles = []
+
+    async def timeout(self, until, *, reason=None):
+        pass
+
+    async def kick(self, *, reason=None):
+        pass
+
+    def __str__(self):
+        return f"member{self.id}"
+
+class FakeChannel:
+    def __init__(self, channel_id: int, guild: "FakeGuild"):
+        self.id = channel_id
+        self.guild = guild
+        self.name = f"channel-{channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self.category_id = None
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+    async def delete_messages(self, messages, *, reason=None):
+        pass
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.owner_id = 0
+        self.roles = []
+        self.channels = {}
+        self.members = {}
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def channel(self, channel_id: int) -> FakeChannel:
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(channel_id, self)
+        return self.channels[channel_id]
+
+    def member(self, user_id: int) -> FakeMember:
+        if user_id not in self.members:
+            self.members[user_id] = FakeMember(user_id, self)
+        return self.members[user_id]
+
+    async def ban(self, user, *, reason=None, delete_message_seconds=86400):
+        pass
+
+class FakeMessage:
+    def __init__(self, message_id: int, content: str, author: FakeMember, channel: FakeChannel):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.created_at = datetime.now(timezone.utc)
+
+    async def delete(self):
+        pass
+
+class BenchBot:
+    """Minimal bot stand-in exposing what AutoModerationCog touches"""
+
+    def __init__(self):
+        self.db = None
+        self.db_path = ':memory:'
+        self.user = FakeUser(0)
+
+    def dispatch(self, event, *args):
+        pass
+
+    async def setup_database(self):
+        await ModerationBot.setup_database(self)
+        self.db.execute(
+            "INSERT OR REPLACE INTO guild_settings (guild_id, automod_enabled) VALUES (?, 1)",
+            (BENCH_GUILD_ID,)
+        )
+        self.db.commit()
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+CLEAN_LINES = [
+    "hey everyone, how's it going?",
+    "did anyone watch the game last night",
+    "I think the new update is pretty good honestly",
+    "lol that's hilarious",
+    "can someone help me with my python code? it keeps crashing on startup",
+    "brb grabbing food",
+    "welcome to the server! make sure to read the rules channel",
+    "anyone up for a match later tonight?",
+]
+
+def generate_corpus(seed: int = 1234) -> list:
+    """Build a synthetic corpus covering clean chat, spam waves, invite raids and caps"""
+    rng = random.Random(seed)
+    corpus = []
+
+    # Clean chat: many users, many channels, low rate per user
+    for _ in range(2000):
+        corpus.append({
+            "scenario": "clean_chat",
+            "author_id": rng.randint(1000, 1999),
+            "channel_id": rng.randint(10, 19),
+            "content": rng.choice(CLEAN_LINES)
+        })
+
+    # Spam waves: a handful of users repeating themselves quickly
+    for _ in range(1000):
+        corpus.append({
+            "scenario": "spam_wave",
+            "author_id": rng.randint(2000, 2019),
+            "channel_id": 20,
+            "content": rng.choice(["buy now!!!", "free nitro here", "spam spam spam"])
+        })
+
+    # Invite raids: many fresh accounts posting invites
+    for i in range(1000):
+        corpus.append({
+            "scenario": "invite_raid",
+            "author_id": 3000 + i,
+            "channel_id": rng.randint(10, 19),
+            "content": f"join my server discord.gg/{rng.randrange(16 ** 8):08x} best community"
+        })
+
+    # Caps: long shouty messages
+    for _ in range(1000):
+        corpus.append({
+            "scenario": "caps",
+            "author_id": rng.randint(4000, 4499),
+            "channel_id": rng.randint(10, 19),
+            "content": rng.choice(CLEAN_LINES).upper() * rng.randint(1, 8)
+        })
+
+    return corpus
+
+def load_corpus(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def write_corpus(path: str, corpus: list):
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in corpus:
+            f.write(json.dumps(entry) + "\n")
+
+def build_messages(entries: list, guild: FakeGuild) -> list:
+    return [
+        FakeMessage(i, entry["content"], guild.member(entry["author_id"]), guild.channel(entry["channel_id"]))
+        for i, entry in enumerate(entries, start=1)
+    ]
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def new_cog() -> AutoModerationCog:
+    bot = BenchBot()
+    await bot.setup_database()
+    return AutoModerationCog(bot)
+
+async def bench_listener(entries: list, trace_memory: bool) -> dict:
+    """Replay entries through on_message and time each call"""
+    cog = await new_cog()
+    guild = FakeGuild(BENCH_GUILD_ID)
+    messages = build_messages(entries, guild)
+    latencies = []
+
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    for message in messages:
+        t0 = time.perf_counter()
+        await cog.on_message(message)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "messages": len(messages),
+        "msgs_per_sec": len(messages) / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+        "peak_kib": peak / 1024,
+        "deletes_queued": sum(len(m) for m in cog.pending_deletes.values())
+    }
+
+async def bench_rules(entries: list, trace_memory: bool) -> dict:
+    """Time each automod rule in isolation over the same messages"""
+    results = {}
+    for rule in ("spam", "links", "invites", "bad_words"):
+        cog = await new_cog()
+        guild = FakeGuild(BENCH_GUILD_ID)
+        messages = build_messages(entries, guild)
+
+        if rule == "spam":
+            check = cog.is_spam
+        elif rule == "links":
+            check = lambda m: cog.contains_links(m.content)
+        elif rule == "invites":
+            check = lambda m: cog.contains_invites(m.content)
+        else:
+            check = lambda m: cog.contains_bad_words(m.content, cog.default_bad_words)
+
+        if trace_memory:
+            tracemalloc.start()
+
+        latencies = []
+        hits = 0
+        start = time.perf_counter()
+        for message in messages:
+            t0 = time.perf_counter()
+            hits += bool(check(message))
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+
+        peak = 0
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        latencies.sort()
+        results[rule] = {
+            "messages": len(messages),
+            "hits": hits,
+            "msgs_per_sec": len(messages) / elapsed if elapsed else 0.0,
+            "p50_us": percentile(latencies, 50) * 1e6,
+            "p99_us": percentile(latencies, 99) * 1e6,
+            "peak_kib": peak / 1024
+        }
+    return results
+
+def print_table(title: str, rows: dict):
+    print(f"\n{title}")
+    print("-" * 78)
+    print(f"{'name':<14}{'msgs':>8}{'msgs/s':>12}{'p50 µs':>10}{'p99 µs':>10}{'peak KiB':>11}{'hits/dels':>11}")
+    for name, row in rows.items():
+        extra = row.get("hits", row.get("deletes_queued", 0))
+        print(f"{name:<14}{row['messages']:>8}{row['msgs_per_sec']:>12.0f}{row['p50_us']:>10.1f}"
+              f"{row['p99_us']:>10.1f}{row['peak_kib']:>11.1f}{extra:>11}")
+
+async def run_benchmark(corpus: list, trace_memory: bool) -> dict:
+    by_scenario = defaultdict(list)
+    for entry in corpus:
+        by_scenario[entry.get("scenario", "default")].append(entry)
+
+    # Timing and memory are measured in separate passes since tracemalloc skews latency
+    report = {"listener": {}, "rules": {}}
+    for scenario, entries in by_scenario.items():
+        timing = await bench_listener(entries, trace_memory=False)
+        if trace_memory:
+            timing["peak_kib"] = (await bench_listener(entries, trace_memory=True))["peak_kib"]
+        report["listener"][scenario] = timing
+
+    timing = await bench_rules(corpus, trace_memory=False)
+    if trace_memory:
+        memory = await bench_rules(corpus, trace_memory=True)
+        for rule in timing:
+            timing[rule]["peak_kib"] = memory[rule]["peak_kib"]
+    report["rules"] = timing
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AutoModerationCog.on_message throughput")
+    parser.add_argument("--corpus", help="JSONL corpus to replay (default: built-in synthetic corpus)")
+    parser.add_argument("--generate", metavar="PATH", help="Write the synthetic corpus to PATH and exit")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak memory measurement")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH")
+    args = parser.parse_args()
+
+    if args.generate:
+        write_corpus(args.generate, generate_corpus())
+        print(f"✅ Wrote synthetic corpus to {args.generate}")
+        return 0
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus()
+
+    print("⏱️ AUTOMOD THROUGHPUT BENCHMARK")
+    print("=" * 50)
+    print(f"discord.py {discord.__version__} • {len(corpus)} messages")
+
+    report = asyncio.run(run_benchmark(corpus, trace_memory=not args.no_memory))
+
+    print_table("📨 on_message by scenario", report["listener"])
+    print_table("🔍 Individual rules (full corpus)", report["rules"])
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report written to {args.json}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
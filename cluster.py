@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Cluster Launcher for Discord Moderation Bot
+Runs the bot as several worker processes, each owning a contiguous shard range,
+so shards are spread over CPU cores. The launcher hosts a local IPC hub (Unix
+socket) that workers use for cross-cluster queries (e.g. /botinfo totals) and
+broadcasts (e.g. settings-cache invalidation), and restarts workers that exit.
+
+Usage:
+    python cluster.py                       # workers run main.py (settings from "cluster" in config.json)
+    python cluster.py --clusters 4 --shards 16
+    python cluster.py --standin             # workers stub out the gateway; no token needed
+    python cluster.py --standin --smoke     # start, check IPC/restarts, then exit
+
+Workers receive BOT_CLUSTER_ID, BOT_SHARD_COUNT, BOT_SHARD_IDS ("first-last")
+and BOT_IPC_SOCKET in their environment.
+"""
+
+import sys
+import os
+import asyncio
+import argparse
+import json
+import logging
+import random
+import signal
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.ipc import IPCServer
+
+logger = logging.getLogger('cluster')
+
+def shard_ranges(shard_count: int, clusters: int) -> list:
+    """Split shards 0..shard_count-1 into contiguous, near-equal ranges"""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges = []
+    first = 0
+    for i in range(clusters):
+        last = first + size + (1 if i < extra else 0)
+        ranges.append(range(first, last))
+        first = last
+    return ranges
+
+async def recommended_shard_count(token: str) -> int:
+    """Ask Discord how many shards the bot should run"""
+    import aiohttp
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            'https://discord.com/api/v10/gateway/bot',
+            headers={'Authorization': f'Bot {token}'}
+        ) as response:
+            response.raise_for_status()
+            return (await response.json())['shards']
+
+class Worker:
+    """One supervised cluster process"""
+
+    def __init__(self, cluster_id: int, shard_ids: range):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.process = None
+        self.started_at = 0.0
+        self.restarts = 0
+
+    @property
+    def shard_spec(self) -> str:
+        return f"{self.shard_ids.start}-{self.shard_ids.stop - 1}"
+
+class ClusterLauncher:
+    """Starts one worker per shard range, hosts the IPC hub and restarts crashed workers"""
+
+    def __init__(self, command: list, shard_count: int, clusters: int, socket_path: str,
+                 restart_delay: float = 1.0, max_restart_delay: float = 60.0, stable_after: float = 60.0):
+        self.command = command
+        self.shard_count = shard_count
+        self.socket_path = socket_path
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_after = stable_after
+        self.ipc = IPCServer(socket_path)
+        self.workers = [Worker(i, shards) for i, shards in enumerate(shard_ranges(shard_count, clusters))]
+        self.supervisors = []
+        self.stopping = False
+
+    async def start(self):
+        await self.ipc.start()
+        for worker in self.workers:
+            await self.spawn(worker)
+            self.supervisors.append(asyncio.create_task(self.supervise(worker)))
+        logger.info(f'Started {len(self.workers)} clusters for {self.shard_count} shards')
+
+    async def spawn(self, worker: Worker):
+        env = dict(os.environ)
+        env.update({
+            'BOT_CLUSTER_ID': str(worker.cluster_id),
+            'BOT_SHARD_COUNT': str(self.shard_count),
+            'BOT_SHARD_IDS': worker.shard_spec,
+            'BOT_IPC_SOCKET': self.socket_path
+        })
+        worker.process = await asyncio.create_subprocess_exec(*self.command, env=env)
+        worker.started_at = time.monotonic()
+        logger.info(f'Cluster {worker.cluster_id} (shards {worker.shard_spec}) started as pid {worker.process.pid}')
+
+    async def supervise(self, worker: Worker):
+        """Restart the worker whenever it exits, backing off while it keeps crashing"""
+        delay = self.restart_delay
+        while not self.stopping:
+            returncode = await worker.process.wait()
+            if self.stopping:
+                return
+            if time.monotonic() - worker.started_at >= self.stable_after:
+                delay = self.restart_delay
+            logger.warning(f'Cluster {worker.cluster_id} exited with code {returncode}; restarting in {delay:.1f}s')
+            await asyncio.sleep(delay)
+            if self.stopping:
+                return
+            worker.restarts += 1
+            await self.spawn(worker)
+            delay = min(delay * 2, self.max_restart_delay)
+
+    async def stop(self, timeout: float = 10.0):
+        """Terminate every worker, killing any that don't exit in time"""
+        self.stopping = True
+        for task in self.supervisors:
+            task.cancel()
+        running = [w.process for w in self.workers if w.process and w.process.returncode is None]
+        for process in running:
+            process.terminate()
+        for process in running:
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        await self.ipc.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def wait_for_clusters(self, timeout: float = 30.0) -> bool:
+        """Wait until every worker has connected to the IPC hub"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if len(self.ipc.clients) == len(self.workers):
+                return True
+            await asyncio.sleep(0.1)
+        return False
+
+# ---------------------------------------------------------------------------
+# Stand-in gateway worker (local testing without a token)
+# ---------------------------------------------------------------------------
+
+class StandinGuild:
+    def __init__(self, guild_id: int, member_count: int):
+        self.id = guild_id
+        self.member_count = member_count
+
+class StandinGateway:
+    """Fake guilds for a shard range, using Discord's guild -> shard mapping"""
+
+    def __init__(self, shard_ids: range, shard_count: int, guilds_per_shard: int = 50):
+        rng = random.Random(shard_ids.start)
+        self.shard_ids = shard_ids
+        self.guilds = []
+        guild_id = 1 << 22
+        while len(self.guilds) < guilds_per_shard * len(shard_ids):
+            guild_id += 1 << 22
+            if (guild_id >> 22) % shard_count in shard_ids:
+                self.guilds.append(StandinGuild(guild_id, rng.randint(2, 5000)))
+
+async def run_standin_worker():
+    """The real ModerationBot with its gateway stubbed out: it never logs in,
+    but its IPC relay, event dispatch and stats run unchanged"""
+    # main reads its cluster id, shard range and socket from the environment
+    import main
+
+    cluster_id = int(os.environ['BOT_CLUSTER_ID'])
+    shard_count = int(os.environ['BOT_SHARD_COUNT'])
+    first, _, last = os.environ['BOT_SHARD_IDS'].partition('-')
+    gateway = StandinGateway(range(int(first), int(last) + 1), shard_count)
+
+    class StandinBot(main.ModerationBot):
+        @property
+        def guilds(self):
+            return gateway.guilds
+
+        def shard_latencies(self):
+            return [(shard_id, 0.0) for shard_id in gateway.shard_ids]
+
+    bot = StandinBot()
+    invalidated = []
+
+    async def on_guild_settings_update(guild_id):
+        invalidated.append(guild_id)
+
+    async def invalidations(data=None):
+        return invalidated
+
+    async def update_settings(guild_id):
+        # What /settings does after saving a change
+        bot.dispatch('guild_settings_update', guild_id)
+        return True
+
+    bot.add_listener(on_guild_settings_update)
+    # Sets up the event loop hooks without logging in
+    async with bot:
+        bot.start_ipc(os.environ['BOT_IPC_SOCKET'])
+        bot.ipc.on_query('invalidations', invalidations)
+        bot.ipc.on_query(f'update_settings:{cluster_id}', update_settings)
+        await asyncio.Event().wait()
+
+async def smoke_test(launcher: ClusterLauncher) -> bool:
+    """Cross-cluster stats, settings invalidation broadcast and worker restart"""
+    ok = True
+
+    def check(name: str, passed: bool, detail: str = ""):
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {name}{': ' + detail if detail else ''}")
+
+    check("All clusters connected", await launcher.wait_for_clusters(), f"{len(launcher.ipc.clients)}/{len(launcher.workers)}")
+
+    stats = await launcher.ipc.query('stats')
+    shards = sorted(shard for entry in stats for shard in entry['shards'])
+    check("Cross-cluster stats", shards == list(range(launcher.shard_count)),
+          f"{sum(e['guilds'] for e in stats)} guilds, {sum(e['users'] for e in stats)} users from {len(stats)} clusters")
+
+    # Cluster 0 handles the update locally and relays it; the others must see it exactly once
+    await launcher.ipc.query('update_settings:0', 1234)
+    await asyncio.sleep(0.2)
+    seen = await launcher.ipc.query('invalidations')
+    check("Settings invalidation broadcast", seen == [[1234]] * len(launcher.workers), str(seen))
+
+    victim = launcher.workers[-1]
+    victim.process.kill()
+    await asyncio.sleep(0.5)
+    restarted = await launcher.wait_for_clusters(timeout=launcher.restart_delay + 15)
+    check("Crashed worker restarted", restarted and victim.restarts == 1, f"cluster {victim.cluster_id}, restarts={victim.restarts}")
+    return ok
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def load_cluster_config() -> dict:
+    try:
+        with open('config.json', 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        config = {}
+    return {'token': config.get('token', ''), **config.get('cluster', {})}
+
+async def run(args) -> int:
+    settings = load_cluster_config()
+    clusters = args.clusters or settings.get('clusters') or 2
+    shard_count = args.shards or settings.get('shard_count')
+    socket_path = args.socket or settings.get('socket') or 'cluster.sock'
+
+    if args.standin:
+        command = [sys.executable, os.path.abspath(__file__), '--standin-worker']
+        shard_count = shard_count or clusters * 2
+    else:
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')]
+        if not shard_count:
+            shard_count = await recommended_shard_count(settings['token'])
+
+    launcher = ClusterLauncher(command, shard_count, clusters, socket_path,
+                               restart_delay=0.5 if args.smoke else 1.0)
+    await launcher.start()
+
+    try:
+        if args.smoke:
+            return 0 if await smoke_test(launcher) else 1
+
+        stop = asyncio.Event()
+        if sys.platform != 'win32':
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        await stop.wait()
+        return 0
+    finally:
+        await launcher.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as multiple shard-range cluster processes")
+    parser.add_argument("--clusters", type=int, help="Number of worker processes")
+    parser.add_argument("--shards", type=int, help="Total shard count (default: Discord's recommendation)")
+    parser.add_argument("--socket", help="IPC socket path, or host:port for TCP")
+    parser.add_argument("--standin", action="store_true", help="Run stand-in gateway workers instead of main.py")
+    parser.add_argument("--smoke", action="store_true", help="Run IPC and supervision checks, then exit")
+    parser.add_argument("--standin-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.standin_worker:
+        asyncio.run(run_standin_worker())
+        return 0
+
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
 from typing import Optional, Union, List
 import asyncio
+import time
 import sys
 import os
 import logging
+from collections import defaultdict
 
 # Add the parent directory to the path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -141,11 +143,97 @@ class CreateChannelModal(discord.ui.Modal):
             embed = EmbedBuilder.error("Error", f"Failed to create channel: {str(e)}")
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
+# Slowmode steps the auto-slowmode controller moves between (seconds)
+SLOWMODE_STEPS = [0, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 21600]
+SLOWMODE_INTERVAL = 10  # seconds between auto-slowmode controller ticks
+
 class AdminCog(commands.Cog, name="Administration"):
     """Administrative commands for server management"""
     
     def __init__(self, bot):
         self.bot = bot
+        
+        # Auto-slowmode config and per-channel message rate tracking
+        self.auto_slowmode = {}
+        self.channel_message_counts = defaultdict(int)
+        self.channel_rates = {}
+        self.slowmode_changed_at = {}
+        self.slowmode_alpha = 0.3  # EWMA smoothing factor
+        self.slowmode_cooldown = 120  # minimum seconds between changes per channel
+        self.slowmode_lower_ratio = 0.4  # step down below this fraction of the threshold
+    
+    @property
+    def db(self):
+        return self.bot.db
+    
+    async def cog_load(self):
+        cursor = self.db.cursor()
+        cursor.execute("SELECT channel_id, min_delay, max_delay, threshold FROM auto_slowmode")
+        for channel_id, min_delay, max_delay, threshold in cursor.fetchall():
+            self.auto_slowmode[channel_id] = {
+                'min_delay': min_delay,
+                'max_delay': max_delay,
+                'threshold': threshold
+            }
+        self.slowmode_controller.start()
+    
+    async def cog_unload(self):
+        self.slowmode_controller.cancel()
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Count messages in channels with auto-slowmode enabled"""
+        if message.channel.id in self.auto_slowmode:
+            self.channel_message_counts[message.channel.id] += 1
+    
+    def next_slowmode_delay(self, current: int, rate: float, config: dict) -> int:
+        """Pick the slowmode step for a channel given its smoothed message rate (per minute)"""
+        if rate > config['threshold']:
+            # Next step above the current delay
+            delay = next((step for step in SLOWMODE_STEPS if step > current), SLOWMODE_STEPS[-1])
+        elif rate < config['threshold'] * self.slowmode_lower_ratio:
+            # Next step below the current delay
+            delay = next((step for step in reversed(SLOWMODE_STEPS) if step < current), 0)
+        else:
+            # Inside the hysteresis band: keep whatever is set, even an off-ladder manual delay
+            delay = current
+        
+        return max(config['min_delay'], min(config['max_delay'], delay))
+    
+    @tasks.loop(seconds=SLOWMODE_INTERVAL)
+    async def slowmode_controller(self):
+        """Raise or lower slowmode in auto-slowmode channels based on message rate"""
+        now = time.monotonic()
+        
+        for channel_id, config in list(self.auto_slowmode.items()):
+            count = self.channel_message_counts.pop(channel_id, 0)
+            rate = count * 60 / SLOWMODE_INTERVAL
+            previous = self.channel_rates.get(channel_id, rate)
+            ewma = self.slowmode_alpha * rate + (1 - self.slowmode_alpha) * previous
+            self.channel_rates[channel_id] = ewma
+            
+            # Hysteresis: leave recently changed channels alone
+            if now - self.slowmode_changed_at.get(channel_id, 0) < self.slowmode_cooldown:
+                continue
+            
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            
+            target = self.next_slowmode_delay(channel.slowmode_delay, ewma, config)
+            if target == channel.slowmode_delay:
+                continue
+            
+            try:
+                await channel.edit(
+                    slowmode_delay=target,
+                    reason=f"Auto-slowmode: {ewma:.0f} messages/min"
+                )
+                self.slowmode_changed_at[channel_id] = now
+                admin_logger.info(f'Auto-slowmode set to {target}s in #{channel.name} ({channel.id}) at {ewma:.0f} messages/min')
+            except discord.HTTPException:
+                # Back off instead of retrying every tick
+                self.slowmode_changed_at[channel_id] = now
     
     @app_commands.command(name="purge", description="Delete multiple messages from a channel")
     @app_commands.describe(
@@ -296,6 +384,71 @@ class AdminCog(commands.Cog, name="Administration"):
             embed = EmbedBuilder.error("Error", f"An error occurred: {str(e)}")
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @app_commands.command(name="autoslowmode", description="Automatically adjust slowmode based on message rate")
+    @app_commands.describe(
+        enabled="Whether auto-slowmode is enabled for the channel",
+        channel="The channel to configure (defaults to current channel)",
+        threshold="Messages per minute above which slowmode is raised",
+        min_delay="Lowest slowmode the controller may set (seconds)",
+        max_delay="Highest slowmode the controller may set (seconds)"
+    )
+    async def autoslowmode(
+        self,
+        interaction: discord.Interaction,
+        enabled: bool,
+        channel: Optional[discord.TextChannel] = None,
+        threshold: app_commands.Range[int, 5, 1000] = 60,
+        min_delay: app_commands.Range[int, 0, 21600] = 0,
+        max_delay: app_commands.Range[int, 1, 21600] = 30
+    ):
+        """Enable or disable adaptive slowmode for a channel"""
+        if not interaction.user.guild_permissions.manage_channels:
+            # Log unauthorized access attempt
+            security_logger.warning(f'UNAUTHORIZED ADMIN COMMAND: {interaction.user} ({interaction.user.id}) attempted /autoslowmode in {interaction.guild.name} ({interaction.guild.id}) without Manage Channels permission')
+            
+            embed = EmbedBuilder.error("Missing Permissions", "You need the 'Manage Channels' permission to use this command.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        channel = channel or interaction.channel
+        
+        if min_delay > max_delay:
+            embed = EmbedBuilder.error("Invalid Bounds", "Minimum delay cannot be greater than maximum delay.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        cursor = self.db.cursor()
+        if enabled:
+            cursor.execute(
+                "INSERT OR REPLACE INTO auto_slowmode (channel_id, guild_id, min_delay, max_delay, threshold) VALUES (?, ?, ?, ?, ?)",
+                (channel.id, interaction.guild.id, min_delay, max_delay, threshold)
+            )
+            self.auto_slowmode[channel.id] = {
+                'min_delay': min_delay,
+                'max_delay': max_delay,
+                'threshold': threshold
+            }
+            embed = EmbedBuilder.success(
+                "Auto-Slowmode Enabled",
+                f"Slowmode in {channel.mention} will now follow the channel's message rate."
+            )
+            embed.add_field(name="Threshold", value=f"{threshold} messages/min", inline=True)
+            embed.add_field(name="Bounds", value=f"{min_delay}s - {max_delay}s", inline=True)
+        else:
+            cursor.execute("DELETE FROM auto_slowmode WHERE channel_id = ?", (channel.id,))
+            self.auto_slowmode.pop(channel.id, None)
+            self.channel_message_counts.pop(channel.id, None)
+            self.channel_rates.pop(channel.id, None)
+            embed = EmbedBuilder.success(
+                "Auto-Slowmode Disabled",
+                f"Auto-slowmode has been disabled in {channel.mention}. The current slowmode was left unchanged."
+            )
+        self.db.commit()
+        
+        embed.add_field(name="Moderator", value=interaction.user.mention, inline=True)
+        await interaction.response.send_message(embed=embed)
+        admin_logger.info(f'Auto-slowmode {"enabled" if enabled else "disabled"} in #{channel.name} ({channel.id}) by {interaction.user} ({interaction.user.id})')
+    
     @app_commands.command(name="lock", description="Lock a channel to prevent users from sending messages")
     @app_commands.describe(
         channel="The channel to lock",
@@ -538,7 +691,7 @@ class AdminCog(commands.Cog, name="Administration"):
             color=discord.Color.red()
         )
         embed.add_field(name="Role Name", value=role.name, inline=True)
-        embed.add_field(name="Members with Role", value=str(len(role.members)), inline=True)
+        embed.add_field(name="Members with Role", value=self.bot.role_index.count_text(interaction.guild, role), inline=True)
         embed.add_field(name="Reason", value=reason, inline=False)
         
         view = ConfirmationView()
@@ -558,14 +711,14 @@ class AdminCog(commands.Cog, name="Administration"):
         
         try:
             role_name = role.name
-            member_count = len(role.members)
+            member_count = self.bot.role_index.count_text(interaction.guild, role)
             await role.delete(reason=f"Role deleted by {interaction.user} | {reason}")
             
             embed = EmbedBuilder.success(
                 "Role Deleted",
                 f"Successfully deleted role **{role_name}**."
             )
-            embed.add_field(name="Affected Members", value=str(member_count), inline=True)
+            embed.add_field(name="Affected Members", value=member_count, inline=True)
             embed.add_field(name="Reason", value=reason, inline=False)
             embed.add_field(name="Moderator", value=interaction.user.mention, inline=True)
             
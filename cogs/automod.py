@@ -1,13 +1,15 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
 import re
 import asyncio
+import math
+import time
 import sys
 import os
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 
 # Add the parent directory to the path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,6 +25,35 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         self.message_cache = defaultdict(lambda: deque(maxlen=10))
         self.spam_tracking = defaultdict(int)
         
+        # Recent message contents (LRU) used to diff edits against
+        self.recent_contents = OrderedDict()
+        self.recent_contents_size = 1000
+        self.edit_context_chars = 32
+        
+        # Per-guild automod settings and exemption sets, keyed by guild ID
+        self.settings_cache = {}
+        
+        # Offending messages waiting for bulk deletion, keyed by channel ID
+        self.pending_deletes = defaultdict(dict)
+        
+        # Time-decayed infraction scores, keyed by (guild_id, user_id)
+        self.infraction_scores = {}
+        self.dirty_scores = set()
+        self.score_half_life = 3600  # seconds
+        self.violation_weights = {
+            'spam': 1.0,
+            'bad_words': 1.0,
+            'invites': 1.0,
+            'links': 0.5
+        }
+        # Escalation tiers as (minimum score, action), lowest first.
+        # Half-point margins so N rapid hits reach tier N despite decay.
+        self.escalation_thresholds = [
+            (2.5, 'timeout'),
+            (4.5, 'kick'),
+            (7.5, 'ban')
+        ]
+        
         # Default filter lists
         self.default_bad_words = [
             # Add your own bad words list here
@@ -39,23 +70,31 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
             r'discord\.gg/[a-zA-Z0-9]+|discord\.com/invite/[a-zA-Z0-9]+|discordapp\.com/invite/[a-zA-Z0-9]+'
         )
     
+    async def cog_load(self):
+        self.load_infraction_scores()
+        self.flush_deletes.start()
+        self.checkpoint_scores.start()
+    
+    async def cog_unload(self):
+        self.flush_deletes.cancel()
+        self.checkpoint_scores.cancel()
+        self.save_infraction_scores()
+    
     @property
     def db(self):
         return self.bot.db
     
     def get_automod_settings(self, guild_id: int) -> Dict:
-        """Get automod settings for a guild"""
-        cursor = self.db.cursor()
-        cursor.execute("SELECT * FROM guild_settings WHERE guild_id = ?", (guild_id,))
-        result = cursor.fetchone()
-        
+        """Get automod settings for a guild (cached until invalidated)"""
+        settings = self.settings_cache.get(guild_id)
+        if settings is None:
+            settings = self.load_automod_settings(guild_id)
+            self.settings_cache[guild_id] = settings
+        return settings
+    
+    def settings_from_row(self, result: Optional[tuple]) -> Dict:
+        """Build the settings dict from a guild_settings row (or defaults)"""
         if not result:
-            # Create default settings
-            cursor.execute(
-                "INSERT INTO guild_settings (guild_id) VALUES (?)",
-                (guild_id,)
-            )
-            self.db.commit()
             return {
                 'automod_enabled': False,
                 'max_warnings': 3,
@@ -76,6 +115,97 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
             'bad_word_filtering': False
         }
     
+    def apply_exemptions(self, settings: Dict, rows: list) -> Dict:
+        """Attach exemption frozensets built from (target_id, target_type) rows"""
+        exemptions = defaultdict(set)
+        for target_id, target_type in rows:
+            exemptions[target_type].add(target_id)
+        
+        settings['exempt_roles'] = frozenset(exemptions['role'])
+        settings['exempt_channels'] = frozenset(exemptions['channel'])
+        settings['exempt_categories'] = frozenset(exemptions['category'])
+        settings['exempt_users'] = frozenset(exemptions['user'])
+        return settings
+    
+    def load_automod_settings(self, guild_id: int) -> Dict:
+        """Load automod settings and exemptions for a guild from the database"""
+        cursor = self.db.cursor()
+        cursor.execute("SELECT * FROM guild_settings WHERE guild_id = ?", (guild_id,))
+        result = cursor.fetchone()
+        
+        if not result:
+            # Create default settings
+            cursor.execute(
+                "INSERT INTO guild_settings (guild_id) VALUES (?)",
+                (guild_id,)
+            )
+            self.db.commit()
+        
+        cursor.execute(
+            "SELECT target_id, target_type FROM automod_exemptions WHERE guild_id = ?",
+            (guild_id,)
+        )
+        return self.apply_exemptions(self.settings_from_row(result), cursor.fetchall())
+    
+    def prefetch_settings(self, guild_ids: List[int]) -> int:
+        """Load settings for many guilds with two queries; returns how many were cached.
+        
+        Guilds without a settings row are skipped and loaded lazily as usual.
+        """
+        guild_ids = [guild_id for guild_id in guild_ids if guild_id not in self.settings_cache]
+        if not guild_ids:
+            return 0
+        
+        placeholders = ", ".join("?" * len(guild_ids))
+        cursor = self.db.cursor()
+        cursor.execute(f"SELECT * FROM guild_settings WHERE guild_id IN ({placeholders})", guild_ids)
+        rows = {row[0]: row for row in cursor.fetchall()}
+        
+        cursor.execute(
+            f"SELECT guild_id, target_id, target_type FROM automod_exemptions WHERE guild_id IN ({placeholders})",
+            guild_ids
+        )
+        exemptions = defaultdict(list)
+        for guild_id, target_id, target_type in cursor.fetchall():
+            exemptions[guild_id].append((target_id, target_type))
+        
+        for guild_id, row in rows.items():
+            self.settings_cache[guild_id] = self.apply_exemptions(self.settings_from_row(row), exemptions[guild_id])
+        return len(rows)
+    
+    @commands.Cog.listener()
+    async def on_guild_warmup(self, guilds: List[discord.Guild]):
+        """Prefetch automod settings for a batch of guilds after startup"""
+        self.prefetch_settings([guild.id for guild in guilds])
+    
+    def invalidate_settings(self, guild_id: int):
+        """Drop cached settings so the next message reloads them"""
+        self.settings_cache.pop(guild_id, None)
+    
+    @commands.Cog.listener()
+    async def on_guild_settings_update(self, guild_id: int):
+        """Refresh cached settings when another cog changes them"""
+        self.invalidate_settings(guild_id)
+    
+    def invalidate_manager_roles(self, guild_id: int):
+        """Recompute the manage_messages roles on the next message"""
+        settings = self.settings_cache.get(guild_id)
+        if settings is not None:
+            settings.pop('manager_roles', None)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.invalidate_manager_roles(role.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.permissions != after.permissions:
+            self.invalidate_manager_roles(after.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.invalidate_manager_roles(role.guild.id)
+    
     def is_spam(self, message: discord.Message) -> bool:
         """Check if a message is spam"""
         user_id = message.author.id
@@ -107,9 +237,12 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         if recent_content.count(message.content.lower()) >= 3:
             return True
         
-        # Check for excessive caps (70%+ caps in messages over 10 characters)
-        if len(message.content) > 10:
-            caps_ratio = sum(1 for c in message.content if c.isupper()) / len(message.content)
+        return self.has_excessive_caps(message.content)
+    
+    def has_excessive_caps(self, content: str) -> bool:
+        """Check for excessive caps (70%+ caps in messages over 10 characters)"""
+        if len(content) > 10:
+            caps_ratio = sum(1 for c in content if c.isupper()) / len(content)
             if caps_ratio > 0.7:
                 return True
         
@@ -128,6 +261,97 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         """Check if content contains Discord invites"""
         return bool(self.invite_pattern.search(content))
     
+    def remember_content(self, message_id: int, content: str):
+        """Store a message's latest content in the recent-messages LRU"""
+        self.recent_contents[message_id] = content
+        self.recent_contents.move_to_end(message_id)
+        if len(self.recent_contents) > self.recent_contents_size:
+            self.recent_contents.popitem(last=False)
+    
+    def get_added_text(self, old: str, new: str) -> str:
+        """Return the part of an edited message that was not in the previous version.
+        
+        Strips the common prefix and suffix, then pads the changed region with a
+        little surrounding context so patterns split across the edit boundary
+        (e.g. ``discord.gg/`` + ``abc``) are still matched.
+        """
+        if old == new:
+            return ""
+        
+        max_prefix = min(len(old), len(new))
+        prefix = 0
+        while prefix < max_prefix and old[prefix] == new[prefix]:
+            prefix += 1
+        
+        max_suffix = max_prefix - prefix
+        suffix = 0
+        while suffix < max_suffix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+        
+        start = max(0, prefix - self.edit_context_chars)
+        end = min(len(new), len(new) - suffix + self.edit_context_chars)
+        return new[start:end]
+    
+    def is_exempt(self, message: discord.Message, settings: Dict) -> bool:
+        """Check if the message author or channel bypasses automod"""
+        author = message.author
+        channel = message.channel
+        
+        if author.id in settings['exempt_users']:
+            return True
+        
+        # Threads inherit their parent channel's exemption
+        if channel.id in settings['exempt_channels'] or getattr(channel, 'parent_id', None) in settings['exempt_channels']:
+            return True
+        
+        if settings['exempt_categories'] and getattr(channel, 'category_id', None) in settings['exempt_categories']:
+            return True
+        
+        # Member._roles is the raw role id list, so these are plain set checks
+        role_ids = getattr(author, '_roles', ())
+        if not settings['exempt_roles'].isdisjoint(role_ids):
+            return True
+        
+        # Ignore the owner and users with a role granting manage_messages
+        guild = message.guild
+        manager_roles = settings.get('manager_roles')
+        if manager_roles is None:
+            manager_roles = settings['manager_roles'] = self.manager_roles(guild)
+        return author.id == guild.owner_id or guild.id in manager_roles or not manager_roles.isdisjoint(role_ids)
+    
+    def manager_roles(self, guild: discord.Guild) -> frozenset:
+        """IDs of roles granting manage_messages (the @everyone role's id is the guild id)"""
+        return frozenset(
+            role.id for role in guild.roles
+            if role.permissions.manage_messages or role.permissions.administrator
+        )
+    
+    def collect_violations(self, message: discord.Message, content: str, settings: Dict, check_spam: bool = True) -> List[str]:
+        """Run the automod rule pipeline over some message content"""
+        violations = []
+        
+        # Spam detection (rate and duplicate checks only apply to new messages)
+        if settings['spam_detection']:
+            if check_spam:
+                if self.is_spam(message):
+                    violations.append("spam")
+            elif self.has_excessive_caps(content):
+                violations.append("spam")
+        
+        # Link filtering
+        if settings['link_filtering'] and self.contains_links(content):
+            violations.append("links")
+        
+        # Invite filtering
+        if settings['invite_filtering'] and self.contains_invites(content):
+            violations.append("invites")
+        
+        # Bad word filtering
+        if settings['bad_word_filtering'] and self.contains_bad_words(content, self.default_bad_words):
+            violations.append("bad_words")
+        
+        return violations
+    
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Main automod message listener"""
@@ -135,43 +359,198 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         if message.author.bot or not message.guild:
             return
         
-        # Ignore users with manage_messages permission
-        if message.author.guild_permissions.manage_messages:
+        settings = self.get_automod_settings(message.guild.id)
+        
+        if not settings['automod_enabled']:
+            return
+        
+        if self.is_exempt(message, settings):
             return
         
-        settings = self.get_automod_settings(message.guild.id)
+        self.remember_content(message.id, message.content)
+        
+        violations = self.collect_violations(message, message.content, settings)
+        
+        if violations:
+            await self.handle_violations(message, violations)
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Re-check edited messages, scanning only the newly added text"""
+        # Embed unfurls and other non-content updates don't carry new text
+        if not payload.guild_id or 'content' not in payload.data:
+            return
+        
+        message = payload.message
+        if message.author.bot or not isinstance(message.author, discord.Member):
+            return
+        
+        settings = self.get_automod_settings(payload.guild_id)
         
         if not settings['automod_enabled']:
             return
         
-        violations = []
+        if self.is_exempt(message, settings):
+            return
         
-        # Spam detection
-        if settings['spam_detection'] and self.is_spam(message):
-            violations.append("spam")
+        previous = self.recent_contents.get(payload.message_id)
+        if previous is None and payload.cached_message:
+            previous = payload.cached_message.content
         
-        # Link filtering
-        if settings['link_filtering'] and self.contains_links(message.content):
-            violations.append("links")
+        self.remember_content(payload.message_id, message.content)
         
-        # Invite filtering
-        if settings['invite_filtering'] and self.contains_invites(message.content):
-            violations.append("invites")
+        added_text = message.content if previous is None else self.get_added_text(previous, message.content)
+        if not added_text:
+            return
         
-        # Bad word filtering
-        if settings['bad_word_filtering'] and self.contains_bad_words(message.content, self.default_bad_words):
-            violations.append("bad_words")
+        violations = self.collect_violations(message, added_text, settings, check_spam=False)
         
         if violations:
             await self.handle_violations(message, violations)
     
+    def load_infraction_scores(self):
+        """Load checkpointed infraction scores into memory"""
+        cursor = self.db.cursor()
+        cursor.execute("SELECT user_id, guild_id, score, level, updated_at FROM automod_scores")
+        for user_id, guild_id, score, level, updated_at in cursor.fetchall():
+            self.infraction_scores[(guild_id, user_id)] = [score, level, updated_at]
+    
+    def save_infraction_scores(self):
+        """Write changed infraction scores back to the database"""
+        if not self.dirty_scores:
+            return
+        
+        dirty, self.dirty_scores = self.dirty_scores, set()
+        now = time.time()
+        updates = []
+        expired = []
+        for key in dirty:
+            entry = self.infraction_scores.get(key)
+            if entry is None:
+                continue
+            score = self.decay_score(entry, now)
+            if score < 0.01:
+                # Fully decayed, no need to keep it around
+                del self.infraction_scores[key]
+                expired.append((key[1], key[0]))
+            else:
+                updates.append((key[1], key[0], score, entry[1], now))
+        
+        cursor = self.db.cursor()
+        cursor.executemany(
+            "INSERT OR REPLACE INTO automod_scores (user_id, guild_id, score, level, updated_at) VALUES (?, ?, ?, ?, ?)",
+            updates
+        )
+        cursor.executemany("DELETE FROM automod_scores WHERE user_id = ? AND guild_id = ?", expired)
+        self.db.commit()
+    
+    @tasks.loop(minutes=1)
+    async def checkpoint_scores(self):
+        """Periodically checkpoint infraction scores to SQLite"""
+        self.save_infraction_scores()
+    
+    def decay_score(self, entry: list, now: float) -> float:
+        """Apply exponential decay to a score entry in place and return the new score"""
+        elapsed = now - entry[2]
+        if elapsed > 0:
+            entry[0] *= math.pow(0.5, elapsed / self.score_half_life)
+            entry[2] = now
+        return entry[0]
+    
+    def add_infraction(self, guild_id: int, user_id: int, violations: List[str]) -> tuple:
+        """Add violations to a user's score.
+        
+        Returns the new score and the escalation action to take, if the score
+        crossed a higher tier than the last one acted on.
+        """
+        now = time.time()
+        key = (guild_id, user_id)
+        entry = self.infraction_scores.get(key)
+        if entry is None:
+            entry = self.infraction_scores[key] = [0.0, 0, now]
+        
+        score = self.decay_score(entry, now)
+        score += sum(self.violation_weights.get(v, 1.0) for v in violations)
+        entry[0] = score
+        self.dirty_scores.add(key)
+        
+        # Tier the score currently sits in (0 = below every threshold)
+        tier = 0
+        for i, (threshold, _) in enumerate(self.escalation_thresholds, start=1):
+            if score >= threshold:
+                tier = i
+        
+        action = None
+        if tier > entry[1]:
+            action = self.escalation_thresholds[tier - 1][1]
+        # Let the acted-on level fall back as the score decays
+        entry[1] = tier
+        return score, action
+    
+    async def escalate(self, message: discord.Message, action: str, score: float) -> bool:
+        """Apply an automatic escalation action to the message author"""
+        member = message.author
+        reason = f"AutoMod escalation: infraction score {score:.1f}"
+        
+        try:
+            if action == "timeout":
+                await member.timeout(timedelta(hours=1), reason=reason)
+            elif action == "kick":
+                await member.kick(reason=reason)
+            elif action == "ban":
+                await message.guild.ban(member, reason=reason, delete_message_seconds=86400)
+        except discord.HTTPException:
+            return False
+        
+        # Escalations are rare, so record them alongside manual warnings
+        cursor = self.db.cursor()
+        cursor.execute(
+            "INSERT INTO warnings (user_id, guild_id, moderator_id, reason) VALUES (?, ?, ?, ?)",
+            (member.id, message.guild.id, self.bot.user.id, f"AutoMod: {action} (score {score:.1f})")
+        )
+        self.db.commit()
+        return True
+    
+    def queue_delete(self, message: discord.Message):
+        """Queue a message for the next bulk deletion of its channel"""
+        self.pending_deletes[message.channel.id][message.id] = message
+    
+    @tasks.loop(seconds=1)
+    async def flush_deletes(self):
+        """Delete queued messages in batches of up to 100 per channel"""
+        if not self.pending_deletes:
+            return
+        
+        pending, self.pending_deletes = self.pending_deletes, defaultdict(dict)
+        # Bulk delete only accepts messages younger than 14 days
+        cutoff = discord.utils.utcnow() - timedelta(days=14) + timedelta(minutes=1)
+        
+        for messages in pending.values():
+            messages = list(messages.values())
+            channel = messages[0].channel
+            recent = [m for m in messages if m.created_at > cutoff]
+            old = [m for m in messages if m.created_at <= cutoff]
+            
+            for i in range(0, len(recent), 100):
+                try:
+                    await channel.delete_messages(recent[i:i + 100], reason="AutoMod violation")
+                except discord.HTTPException:
+                    pass
+            
+            for message in old:
+                try:
+                    await message.delete()
+                except discord.HTTPException:
+                    pass
+    
     async def handle_violations(self, message: discord.Message, violations: List[str]):
         """Handle automod violations"""
-        try:
-            # Delete the message
-            await message.delete()
-        except:
-            pass
+        # Delete the message (batched with other violations in this channel)
+        self.queue_delete(message)
+        
+        # Update the in-memory infraction score and escalate if needed
+        score, action = self.add_infraction(message.guild.id, message.author.id, violations)
+        escalated = action is not None and await self.escalate(message, action, score)
         
         # Create violation embed
         violation_text = {
@@ -198,21 +577,10 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         
         # Send warning message (delete after 10 seconds)
         try:
-            warning_msg = await message.channel.send(embed=embed)
-            await asyncio.sleep(10)
-            await warning_msg.delete()
+            await message.channel.send(embed=embed, delete_after=10)
         except:
             pass
         
-        # Add warning to database if spam or bad words
-        if 'spam' in violations or 'bad_words' in violations:
-            cursor = self.db.cursor()
-            cursor.execute(
-                "INSERT INTO warnings (user_id, guild_id, moderator_id, reason) VALUES (?, ?, ?, ?)",
-                (message.author.id, message.guild.id, self.bot.user.id, f"AutoMod: {', '.join(violations)}")
-            )
-            self.db.commit()
-        
         # Log to mod channel
         log_embed = discord.Embed(
             title="🤖 AutoMod Action",
@@ -223,6 +591,9 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
         log_embed.add_field(name="User", value=f"{message.author.mention} ({message.author.id})", inline=True)
         log_embed.add_field(name="Channel", value=message.channel.mention, inline=True)
         log_embed.add_field(name="Violations", value=", ".join(violations), inline=False)
+        log_embed.add_field(name="Infraction Score", value=f"{score:.1f}", inline=True)
+        if escalated:
+            log_embed.add_field(name="Auto-Action", value=action.title(), inline=True)
         log_embed.add_field(name="Original Message", value=message.content[:1000] + ("..." if len(message.content) > 1000 else ""), inline=False)
         
         # Send to log channel
@@ -238,7 +609,10 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
             except:
                 pass
     
-    @app_commands.command(name="automod", description="Configure automoderation settings")
+    # /automod settings, /automod exempt and /automod exemptions share one global command slot
+    automod_group = app_commands.Group(name="automod", description="Configure automoderation")
+    
+    @automod_group.command(name="settings", description="Configure automoderation settings")
     async def automod_config(self, interaction: discord.Interaction):
         """Interactive automod configuration"""
         if not interaction.user.guild_permissions.administrator:
@@ -273,8 +647,102 @@ class AutoModerationCog(commands.Cog, name="AutoModeration"):
             inline=True
         )
         
+        embed.add_field(
+            name="🛡️ Exemptions",
+            value=f"**Roles:** {len(settings['exempt_roles'])}\n"
+                  f"**Channels:** {len(settings['exempt_channels'])}\n"
+                  f"**Categories:** {len(settings['exempt_categories'])}\n"
+                  f"**Users:** {len(settings['exempt_users'])}",
+            inline=True
+        )
+        
         view = AutoModView(settings)
         await interaction.response.send_message(embed=embed, view=view)
+    
+    @automod_group.command(name="exempt", description="Exempt a role, channel, category or user from automod")
+    @app_commands.describe(
+        action="Whether to add or remove the exemption",
+        role="Role to exempt",
+        channel="Channel to exempt (e.g. #bot-spam)",
+        category="Category to exempt",
+        user="User to exempt"
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Add", value="add"),
+        app_commands.Choice(name="Remove", value="remove")
+    ])
+    async def automod_exempt(
+        self,
+        interaction: discord.Interaction,
+        action: Literal["add", "remove"],
+        role: Optional[discord.Role] = None,
+        channel: Optional[discord.TextChannel] = None,
+        category: Optional[discord.CategoryChannel] = None,
+        user: Optional[discord.Member] = None
+    ):
+        """Add or remove automod exemptions"""
+        if not interaction.user.guild_permissions.administrator:
+            embed = EmbedBuilder.error("Missing Permissions", "You need the 'Administrator' permission to configure automod.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        targets = [
+            (target, target_type)
+            for target, target_type in ((role, 'role'), (channel, 'channel'), (category, 'category'), (user, 'user'))
+            if target is not None
+        ]
+        
+        if not targets:
+            embed = EmbedBuilder.error("No Target", "Please provide a role, channel, category or user.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        cursor = self.db.cursor()
+        for target, target_type in targets:
+            if action == "add":
+                cursor.execute(
+                    "INSERT OR REPLACE INTO automod_exemptions (guild_id, target_id, target_type) VALUES (?, ?, ?)",
+                    (interaction.guild.id, target.id, target_type)
+                )
+            else:
+                cursor.execute(
+                    "DELETE FROM automod_exemptions WHERE guild_id = ? AND target_id = ?",
+                    (interaction.guild.id, target.id)
+                )
+        self.db.commit()
+        self.invalidate_settings(interaction.guild.id)
+        
+        mentions = ", ".join(target.mention for target, _ in targets)
+        if action == "add":
+            embed = EmbedBuilder.success("Exemption Added", f"AutoMod will now ignore {mentions}.")
+        else:
+            embed = EmbedBuilder.success("Exemption Removed", f"AutoMod will no longer ignore {mentions}.")
+        await interaction.response.send_message(embed=embed)
+    
+    @automod_group.command(name="exemptions", description="List automod exemptions")
+    async def automod_exemptions(self, interaction: discord.Interaction):
+        """Show all automod exemptions for this server"""
+        settings = self.get_automod_settings(interaction.guild.id)
+        
+        embed = discord.Embed(
+            title="🛡️ AutoMod Exemptions",
+            color=discord.Color.blue(),
+            timestamp=datetime.utcnow()
+        )
+        
+        sections = [
+            ("Roles", settings['exempt_roles'], "<@&{}>"),
+            ("Channels", settings['exempt_channels'], "<#{}>"),
+            ("Categories", settings['exempt_categories'], "<#{}>"),
+            ("Users", settings['exempt_users'], "<@{}>")
+        ]
+        for name, ids, fmt in sections:
+            value = ", ".join(fmt.format(target_id) for target_id in list(ids)[:20]) or "None"
+            if len(ids) > 20:
+                value += f" (+{len(ids) - 20} more)"
+            embed.add_field(name=name, value=value, inline=False)
+        
+        await interaction.response.send_message(embed=embed)
 
 class AutoModView(discord.ui.View):
     """Interactive automod settings panel"""
@@ -601,8 +601,9 @@ class EconomyCog(commands.Cog, name="Economy & Leveling"):
         leaderboard_text = ""
         medals = ["🥇", "🥈", "🥉"] + ["🏅"] * 7
         
+        members = await self.bot.member_resolver.get_many(interaction.guild, (user_id for user_id, _ in results))
         for i, (user_id, value) in enumerate(results):
-            user_obj = interaction.guild.get_member(user_id)
+            user_obj = members[user_id]
             username = user_obj.display_name if user_obj else "Unknown User"
             
             leaderboard_text += f"{medals[i]} **{username}** - {value_format(value)}\n"
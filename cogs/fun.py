@@ -92,34 +92,49 @@ class PollView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
 class GiveawayView(discord.ui.View):
-    """Interactive giveaway with entry button"""
+    """Interactive giveaway with entry button.
     
-    def __init__(self, *, timeout=None):
-        super().__init__(timeout=timeout)
-        self.entries = set()
+    Persistent (fixed custom_id, no timeout) with entries stored in the
+    giveaway_entries table, so one registered instance serves every
+    giveaway message, including ones posted before a restart.
+    """
     
-    @discord.ui.button(label='Enter Giveaway 🎉', style=discord.ButtonStyle.primary, emoji='🎉')
+    def __init__(self, bot):
+        super().__init__(timeout=None)
+        self.bot = bot
+    
+    @discord.ui.button(label='Enter Giveaway 🎉', style=discord.ButtonStyle.primary, emoji='🎉', custom_id='giveaway:enter')
     async def enter_giveaway(self, interaction: discord.Interaction, button: discord.ui.Button):
+        message_id = interaction.message.id
         user_id = interaction.user.id
         
-        if user_id in self.entries:
-            self.entries.remove(user_id)
+        cursor = self.bot.db.cursor()
+        cursor.execute("DELETE FROM giveaway_entries WHERE message_id = ? AND user_id = ?", (message_id, user_id))
+        if cursor.rowcount:
             embed = EmbedBuilder.warning("Left Giveaway", "You have left the giveaway.")
-            button.label = f'Enter Giveaway 🎉 ({len(self.entries)})'
         else:
-            self.entries.add(user_id)
+            cursor.execute("INSERT INTO giveaway_entries (message_id, user_id) VALUES (?, ?)", (message_id, user_id))
             embed = EmbedBuilder.success("Entered Giveaway", "You have entered the giveaway! Good luck! 🍀")
-            button.label = f'Enter Giveaway 🎉 ({len(self.entries)})'
+        self.bot.db.commit()
+        cursor.execute("SELECT COUNT(*) FROM giveaway_entries WHERE message_id = ?", (message_id,))
+        
+        # This instance may serve every giveaway, so the count goes on a fresh view
+        view = GiveawayView(self.bot)
+        view.enter_giveaway.label = f'Enter Giveaway 🎉 ({cursor.fetchone()[0]})'
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await interaction.edit_original_response(view=self)
+        await interaction.message.edit(view=view)
 
 class FunCog(commands.Cog, name="Fun & Interactive"):
     """Fun and interactive commands for entertainment"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.active_giveaways = {}
+    
+    async def cog_load(self):
+        # Keep giveaway buttons working and end giveaways that ran out while offline
+        self.bot.add_view(GiveawayView(self.bot))
+        self.bot.scheduler.register('giveaway_end', self.end_giveaway)
     
     @app_commands.command(name="poll", description="Create an interactive poll")
     @app_commands.describe(
@@ -220,36 +235,52 @@ class FunCog(commands.Cog, name="Fun & Interactive"):
             icon_url=interaction.user.display_avatar.url
         )
         
-        view = GiveawayView()
-        await interaction.response.send_message(embed=embed, view=view)
+        await interaction.response.send_message(embed=embed, view=GiveawayView(self.bot))
         
-        # Store giveaway info for ending later
+        # Schedule giveaway end; the timer survives restarts
         message = await interaction.original_response()
-        self.active_giveaways[message.id] = {
-            'end_time': end_time,
-            'winners': winners,
-            'prize': prize,
-            'host': interaction.user,
-            'view': view
-        }
-        
-        # Schedule giveaway end
-        await asyncio.sleep(time_delta.total_seconds())
-        await self.end_giveaway(message.id, interaction.channel)
+        self.bot.scheduler.schedule(
+            'giveaway_end',
+            end_time,
+            {
+                'message_id': message.id,
+                'channel_id': interaction.channel.id,
+                'winners': winners,
+                'prize': prize,
+                'host_id': interaction.user.id
+            },
+            guild_id=interaction.guild.id
+        )
     
-    async def end_giveaway(self, message_id: int, channel: discord.TextChannel):
-        """End a giveaway and pick winners"""
-        if message_id not in self.active_giveaways:
-            return
+    def clear_giveaway_entries(self, message_id: int):
+        self.bot.db.cursor().execute("DELETE FROM giveaway_entries WHERE message_id = ?", (message_id,))
+        self.bot.db.commit()
+    
+    async def end_giveaway(self, giveaway_data: dict):
+        """End a giveaway and pick winners (scheduler handler).
         
-        giveaway_data = self.active_giveaways[message_id]
-        entries = list(giveaway_data['view'].entries)
+        Transient Discord errors propagate so the scheduler retries; entries
+        are only cleared once the result is posted (or the giveaway is gone).
+        """
+        message_id = giveaway_data['message_id']
+        cursor = self.bot.db.cursor()
+        cursor.execute("SELECT user_id FROM giveaway_entries WHERE message_id = ?", (message_id,))
+        entries = [row[0] for row in cursor.fetchall()]
         
         try:
+            channel = self.bot.get_channel(giveaway_data['channel_id']) or await self.bot.fetch_channel(giveaway_data['channel_id'])
             message = await channel.fetch_message(message_id)
-        except:
+        except (discord.NotFound, discord.Forbidden):
+            # The channel or message was deleted, or we lost access to it
+            self.clear_giveaway_entries(message_id)
             return
         
+        try:
+            host = self.bot.get_user(giveaway_data['host_id']) or await self.bot.fetch_user(giveaway_data['host_id'])
+        except discord.HTTPException:
+            host = None  # e.g. the host deleted their account
+        host_mention = f"<@{giveaway_data['host_id']}>"
+        
         if not entries:
             embed = EmbedBuilder.warning(
                 "Giveaway Ended",
@@ -262,12 +293,8 @@ class FunCog(commands.Cog, name="Fun & Interactive"):
         winner_count = min(giveaway_data['winners'], len(entries))
         winners = random.sample(entries, winner_count)
         
-        # Get winner objects
-        winner_mentions = []
-        for winner_id in winners:
-            user = self.bot.get_user(winner_id)
-            if user:
-                winner_mentions.append(user.mention)
+        # Mentions work without the users being cached
+        winner_mentions = [f"<@{winner_id}>" for winner_id in winners]
         
         embed = discord.Embed(
             title="🎉 GIVEAWAY ENDED 🎉",
@@ -284,25 +311,30 @@ class FunCog(commands.Cog, name="Fun & Interactive"):
         
         embed.add_field(name="Total Entries", value=str(len(entries)), inline=True)
         
-        embed.set_footer(
-            text=f"Hosted by {giveaway_data['host'].display_name}",
-            icon_url=giveaway_data['host'].display_avatar.url
-        )
+        if host is not None:
+            embed.set_footer(
+                text=f"Hosted by {host.display_name}",
+                icon_url=host.display_avatar.url
+            )
+        else:
+            embed.set_footer(text="Hosted by a deleted user")
         
         await message.edit(embed=embed, view=None)
+        # The result is posted; a retry from here on would re-draw the winners
+        self.clear_giveaway_entries(message_id)
         
         # Announce winners
         if winner_mentions:
             winner_embed = EmbedBuilder.success(
                 "🎉 Congratulations!",
-                f"You won **{giveaway_data['prize']}**!\n\nContact {giveaway_data['host'].mention} to claim your prize."
+                f"You won **{giveaway_data['prize']}**!\n\nContact {host_mention} to claim your prize."
             )
             
             content = f"🎉 Giveaway Winners: {', '.join(winner_mentions)}"
-            await channel.send(content=content, embed=winner_embed)
-        
-        # Remove from active giveaways
-        del self.active_giveaways[message_id]
+            try:
+                await channel.send(content=content, embed=winner_embed)
+            except discord.HTTPException:
+                pass  # The winners are already on the giveaway message
     
     @app_commands.command(name="8ball", description="Ask the magic 8-ball a question")
     @app_commands.describe(question="Your question for the 8-ball")
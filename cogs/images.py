@@ -4,21 +4,107 @@ from discord import app_commands
 from datetime import datetime
 from typing import Optional
 import random
-import aiohttp
 import io
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to the path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.helpers import EmbedBuilder
+from utils.prefetch import PrefetchBuffer
+from utils.listing_cache import RedditListingCache
+from utils.render import QR_AVAILABLE, RenderCache, render_ascii, render_qr, render_swatch
+
+CAT_API = 'https://api.thecatapi.com/v1/images/search'
+DOG_API = 'https://dog.ceo/api/breeds/image/random'
+FOX_API = 'https://randomfox.ca/floof/'
+DUCK_API = 'https://random-d.uk/api/random'
+MEME_SUBREDDITS = ['memes', 'dankmemes', 'wholesomememes', 'programmerhumor', 'funny']
+# Hot listings are refetched at most this often per subreddit
+MEME_LISTING_TTL = 300
+
+# Prefetch buffer watermarks: refill below low, fill up to high
+PREFETCH_WATERMARKS = {
+    'cat': (2, 5),
+    'dog': (2, 5),
+    'fox': (2, 5),
+    'duck': (2, 5)
+}
+
+# Bytes of rendered QR codes, swatches and banners kept in memory,
+# and threads used to render misses
+RENDER_CACHE_BYTES = 8 * 1024 * 1024
+RENDER_WORKERS = 2
 
 class ImagesCog(commands.Cog, name="Images & Memes"):
     """Image and meme related commands"""
     
     def __init__(self, bot):
         self.bot = bot
+        fetchers = {
+            'cat': self.fetch_cat,
+            'dog': self.fetch_dog,
+            'fox': self.fetch_fox,
+            'duck': self.fetch_duck
+        }
+        self.buffers = {
+            name: PrefetchBuffer(name, fetcher, *PREFETCH_WATERMARKS[name])
+            for name, fetcher in fetchers.items()
+        }
+        self.render_executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='render')
+        self.renders = RenderCache(self.render_executor, RENDER_CACHE_BYTES)
+        self.meme_listings = RedditListingCache(self.get_json, ttl=MEME_LISTING_TTL)
+    
+    async def cog_load(self):
+        for buffer in self.buffers.values():
+            buffer.start()
+        # Warm the meme listings so the first /meme doesn't wait on Reddit
+        for subreddit in MEME_SUBREDDITS:
+            self.bot.run_in_background(self.meme_listings.refresh(subreddit), f'warm-r/{subreddit}')
+    
+    async def cog_unload(self):
+        for buffer in self.buffers.values():
+            buffer.stop()
+        self.render_executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def get_json(self, url: str, **kwargs):
+        """GET a JSON API through the shared client; None unless it answers 200.
+
+        Raises CircuitOpenError while the API's host is failing.
+        """
+        return await self.bot.api_client.get_json(url, **kwargs)
+    
+    async def fetch_cat(self) -> Optional[dict]:
+        data = await self.get_json(CAT_API)
+        return {'url': data[0]['url']} if data else None
+    
+    async def fetch_dog(self) -> Optional[dict]:
+        data = await self.get_json(DOG_API)
+        return {'url': data['message']} if data and data.get('status') == 'success' else None
     
+    async def fetch_fox(self) -> Optional[dict]:
+        data = await self.get_json(FOX_API)
+        return {'url': data['image']} if data else None
+    
+    async def fetch_duck(self) -> Optional[dict]:
+        data = await self.get_json(DUCK_API)
+        return {'url': data['url']} if data else None
+    
+    async def next_payload(self, interaction: discord.Interaction, name: str) -> Optional[dict]:
+        """Pop a prefetched payload; defer and fetch live only when the buffer is empty"""
+        buffer = self.buffers[name]
+        payload = buffer.pop()
+        if payload is None:
+            await interaction.response.defer()
+            payload = await buffer.fetch()
+        return payload
+    
+    async def respond(self, interaction: discord.Interaction, **kwargs):
+        if interaction.response.is_done():
+            await interaction.followup.send(**kwargs)
+        else:
+            await interaction.response.send_message(**kwargs)
     
     @app_commands.command(name="servericon", description="Display the server's icon")
     async def servericon(self, interaction: discord.Interaction):
@@ -62,70 +148,42 @@ class ImagesCog(commands.Cog, name="Images & Memes"):
     @app_commands.command(name="meme", description="Get a random meme")
     async def meme(self, interaction: discord.Interaction):
         """Get a random meme from Reddit"""
-        await interaction.response.defer()
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                # Try multiple subreddits
-                subreddits = ['memes', 'dankmemes', 'wholesomememes', 'programmerhumor', 'funny']
-                chosen_sub = random.choice(subreddits)
-                
-                async with session.get(f'https://www.reddit.com/r/{chosen_sub}/random.json', 
-                                     headers={'User-Agent': 'Discord Bot'}) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        
-                        if data and len(data) > 0:
-                            post = data[0]['data']['children'][0]['data']
-                            
-                            # Skip NSFW content
-                            if post.get('over_18', False):
-                                embed = EmbedBuilder.warning("NSFW Content", "Got NSFW content, try again!")
-                                await interaction.followup.send(embed=embed, ephemeral=True)
-                                return
-                            
-                            embed = discord.Embed(
-                                title=post['title'][:256],  # Discord title limit
-                                url=f"https://reddit.com{post['permalink']}",
-                                color=discord.Color.orange(),
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            # Check if it's an image
-                            if post.get('url', '').endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                                embed.set_image(url=post['url'])
-                            elif post.get('selftext'):
-                                # Text post
-                                text = post['selftext'][:1024]  # Discord description limit
-                                embed.description = text
-                            
-                            embed.add_field(
-                                name="📊 Stats",
-                                value=f"👍 {post.get('ups', 0)} | 💬 {post.get('num_comments', 0)}",
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="📍 Source",
-                                value=f"r/{chosen_sub}",
-                                inline=True
-                            )
-                            
-                            embed.set_footer(
-                                text=f"Posted by u/{post.get('author', 'unknown')}",
-                                icon_url="https://www.redditstatic.com/shreddit/assets/favicon/192x192.png"
-                            )
-                            
-                            await interaction.followup.send(embed=embed)
-                            return
-            
-            # Fallback if Reddit API fails
+        if not self.meme_listings.is_warm(MEME_SUBREDDITS):
+            await interaction.response.defer()
+        post = await self.meme_listings.random_post(interaction.channel_id, MEME_SUBREDDITS)
+        if post is None:
             embed = EmbedBuilder.error("Meme Not Found", "Couldn't fetch a meme right now. Try again later!")
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except Exception as e:
-            embed = EmbedBuilder.error("Error", "Failed to fetch meme. Please try again!")
-            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.respond(interaction, embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=post['title'],
+            url=f"https://reddit.com{post['permalink']}",
+            color=discord.Color.orange(),
+            timestamp=datetime.utcnow()
+        )
+        
+        # Listings only keep image posts
+        embed.set_image(url=post['image'])
+        
+        embed.add_field(
+            name="📊 Stats",
+            value=f"👍 {post['ups']} | 💬 {post['comments']}",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="📍 Source",
+            value=f"r/{post['subreddit']}",
+            inline=True
+        )
+        
+        embed.set_footer(
+            text=f"Posted by u/{post['author']}",
+            icon_url="https://www.redditstatic.com/shreddit/assets/favicon/192x192.png"
+        )
+        
+        await self.respond(interaction, embed=embed)
     
     
     @app_commands.command(name="pickup", description="Get a cheesy pickup line")
@@ -174,180 +232,119 @@ class ImagesCog(commands.Cog, name="Images & Memes"):
     @app_commands.command(name="cat", description="Get a random cat image")
     async def cat(self, interaction: discord.Interaction):
         """Get a random cat image"""
-        await interaction.response.defer()
+        payload = await self.next_payload(interaction, 'cat')
+        if payload is None:
+            # Fallback if API fails
+            embed = EmbedBuilder.error("Cat Error", "Couldn't fetch a cat image right now. The cats are probably napping! 😴")
+            await self.respond(interaction, embed=embed, ephemeral=True)
+            return
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://api.thecatapi.com/v1/images/search') as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        cat_url = data[0]['url']
-                        
-                        embed = discord.Embed(
-                            title="🐱 Random Cat",
-                            color=discord.Color.orange(),
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        embed.set_image(url=cat_url)
-                        embed.set_footer(
-                            text=f"Meow! Requested by {interaction.user.display_name}",
-                            icon_url=interaction.user.display_avatar.url
-                        )
-                        
-                        await interaction.followup.send(embed=embed)
-                        return
-        except:
-            pass
+        embed = discord.Embed(
+            title="🐱 Random Cat",
+            color=discord.Color.orange(),
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.set_image(url=payload['url'])
+        embed.set_footer(
+            text=f"Meow! Requested by {interaction.user.display_name}",
+            icon_url=interaction.user.display_avatar.url
+        )
         
-        # Fallback if API fails
-        embed = EmbedBuilder.error("Cat Error", "Couldn't fetch a cat image right now. The cats are probably napping! 😴")
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await self.respond(interaction, embed=embed)
     
     @app_commands.command(name="dog", description="Get a random dog image")
     async def dog(self, interaction: discord.Interaction):
         """Get a random dog image"""
-        await interaction.response.defer()
+        payload = await self.next_payload(interaction, 'dog')
+        if payload is None:
+            # Fallback if API fails
+            embed = EmbedBuilder.error("Dog Error", "Couldn't fetch a dog image right now. The dogs are probably playing fetch! 🎾")
+            await self.respond(interaction, embed=embed, ephemeral=True)
+            return
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://dog.ceo/api/breeds/image/random') as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data['status'] == 'success':
-                            dog_url = data['message']
-                            
-                            embed = discord.Embed(
-                                title="🐶 Random Dog",
-                                color=discord.Color.brown(),
-                                timestamp=datetime.utcnow()
-                            )
-                            
-                            embed.set_image(url=dog_url)
-                            embed.set_footer(
-                                text=f"Woof! Requested by {interaction.user.display_name}",
-                                icon_url=interaction.user.display_avatar.url
-                            )
-                            
-                            await interaction.followup.send(embed=embed)
-                            return
-        except:
-            pass
+        embed = discord.Embed(
+            title="🐶 Random Dog",
+            color=discord.Color.brown(),
+            timestamp=datetime.utcnow()
+        )
         
-        # Fallback if API fails
-        embed = EmbedBuilder.error("Dog Error", "Couldn't fetch a dog image right now. The dogs are probably playing fetch! 🎾")
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        embed.set_image(url=payload['url'])
+        embed.set_footer(
+            text=f"Woof! Requested by {interaction.user.display_name}",
+            icon_url=interaction.user.display_avatar.url
+        )
+        
+        await self.respond(interaction, embed=embed)
     
     @app_commands.command(name="fox", description="Get a random fox image")
     async def fox(self, interaction: discord.Interaction):
         """Get a random fox image"""
-        await interaction.response.defer()
+        payload = await self.next_payload(interaction, 'fox')
+        if payload is None:
+            # Fallback if API fails
+            embed = EmbedBuilder.error("Fox Error", "Couldn't fetch a fox image right now. The foxes are being sneaky! 🦊")
+            await self.respond(interaction, embed=embed, ephemeral=True)
+            return
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://randomfox.ca/floof/') as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        fox_url = data['image']
-                        
-                        embed = discord.Embed(
-                            title="🦊 Random Fox",
-                            color=discord.Color.orange(),
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        embed.set_image(url=fox_url)
-                        embed.set_footer(
-                            text=f"What does the fox say? Requested by {interaction.user.display_name}",
-                            icon_url=interaction.user.display_avatar.url
-                        )
-                        
-                        await interaction.followup.send(embed=embed)
-                        return
-        except:
-            pass
+        embed = discord.Embed(
+            title="🦊 Random Fox",
+            color=discord.Color.orange(),
+            timestamp=datetime.utcnow()
+        )
         
-        # Fallback if API fails
-        embed = EmbedBuilder.error("Fox Error", "Couldn't fetch a fox image right now. The foxes are being sneaky! 🦊")
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        embed.set_image(url=payload['url'])
+        embed.set_footer(
+            text=f"What does the fox say? Requested by {interaction.user.display_name}",
+            icon_url=interaction.user.display_avatar.url
+        )
+        
+        await self.respond(interaction, embed=embed)
     
     @app_commands.command(name="duck", description="Get a random duck image")
     async def duck(self, interaction: discord.Interaction):
         """Get a random duck image"""
-        await interaction.response.defer()
+        payload = await self.next_payload(interaction, 'duck')
+        if payload is None:
+            # Fallback if API fails
+            embed = EmbedBuilder.error("Duck Error", "Couldn't fetch a duck image right now. The ducks are swimming away! 🏊‍♂️")
+            await self.respond(interaction, embed=embed, ephemeral=True)
+            return
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://random-d.uk/api/random') as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        duck_url = data['url']
-                        
-                        embed = discord.Embed(
-                            title="🦆 Random Duck",
-                            color=discord.Color.yellow(),
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        embed.set_image(url=duck_url)
-                        embed.set_footer(
-                            text=f"Quack! Requested by {interaction.user.display_name}",
-                            icon_url=interaction.user.display_avatar.url
-                        )
-                        
-                        await interaction.followup.send(embed=embed)
-                        return
-        except:
-            pass
+        embed = discord.Embed(
+            title="🦆 Random Duck",
+            color=discord.Color.yellow(),
+            timestamp=datetime.utcnow()
+        )
         
-        # Fallback if API fails
-        embed = EmbedBuilder.error("Duck Error", "Couldn't fetch a duck image right now. The ducks are swimming away! 🏊‍♂️")
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        embed.set_image(url=payload['url'])
+        embed.set_footer(
+            text=f"Quack! Requested by {interaction.user.display_name}",
+            icon_url=interaction.user.display_avatar.url
+        )
+        
+        await self.respond(interaction, embed=embed)
     
     @app_commands.command(name="ascii", description="Convert text to ASCII art")
-    @app_commands.describe(text="Text to convert to ASCII art (max 10 characters)")
-    async def ascii(self, interaction: discord.Interaction, text: str):
-        """Convert text to simple ASCII art"""
+    @app_commands.describe(text="Text to convert to ASCII art (max 10 characters)", font="Lettering style")
+    @app_commands.choices(font=[
+        app_commands.Choice(name="Block", value="block"),
+        app_commands.Choice(name="Pixel", value="pixel"),
+        app_commands.Choice(name="Banner", value="banner")
+    ])
+    async def ascii(self, interaction: discord.Interaction, text: str, font: str = "block"):
+        """Convert text to ASCII art"""
         if len(text) > 10:
             embed = EmbedBuilder.error("Text Too Long", "Please use 10 characters or less!")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Simple ASCII art mapping
-        ascii_chars = {
-            'A': ['  ▄▀█  ', ' █▀▀█  ', ' █▄▄█  ', ' ▀  ▀  '],
-            'B': [' █▀▀▄  ', ' █▀▀▄  ', ' █▄▄▀  ', '       '],
-            'C': [' ▄▀█▀▄ ', ' █     ', ' ▀▄█▄▀ ', '       '],
-            'D': [' █▀▀▄  ', ' █   █ ', ' █▄▄▀  ', '       '],
-            'E': [' █▀▀▀  ', ' █▀▀   ', ' █▄▄▄  ', '       '],
-            'H': [' █   █ ', ' █▀▀▀█ ', ' █   █ ', '       '],
-            'I': [' ▀█▀   ', '  █    ', ' ▄█▄   ', '       '],
-            'L': [' █     ', ' █     ', ' █▄▄▄  ', '       '],
-            'O': [' ▄▀█▀▄ ', ' █   █ ', ' ▀▄█▄▀ ', '       '],
-            'R': [' █▀▀▄  ', ' █▀▀▄  ', ' █  ▀▄ ', '       '],
-            'S': [' ▄▀▀▀▄ ', ' ▀▀▀▄  ', ' ▄▄▄▀  ', '       '],
-            'T': [' ▀▀█▀▀ ', '   █   ', '   █   ', '       '],
-            'U': [' █   █ ', ' █   █ ', ' ▀▄▄▄▀ ', '       '],
-            ' ': ['       ', '       ', '       ', '       ']
-        }
-        
         text = text.upper()
-        ascii_lines = ['', '', '', '']
-        
-        for char in text:
-            if char in ascii_chars:
-                for i in range(4):
-                    ascii_lines[i] += ascii_chars[char][i]
-            else:
-                # Use a generic pattern for unsupported characters
-                for i in range(4):
-                    ascii_lines[i] += ' █████ '
-        
-        ascii_art = '\\n'.join(ascii_lines)
+        ascii_art = await self.renders.get(render_ascii, text, font)
         
         embed = discord.Embed(
             title="🎨 ASCII Art",
-            description=f"```\\n{ascii_art}\\n```",
+            description=f"```\n{ascii_art}\n```",
             color=discord.Color.blue(),
             timestamp=datetime.utcnow()
         )
@@ -414,26 +411,21 @@ class ImagesCog(commands.Cog, name="Images & Memes"):
             icon_url=interaction.user.display_avatar.url
         )
         
-        # Add a color preview (using a 1x1 pixel image with the color)
-        embed.set_thumbnail(url=f"https://via.placeholder.com/150x150/{color}/{color}.png")
+        # Swatch with darker/lighter shades, rendered off the event loop and cached
+        swatch = await self.renders.get(render_swatch, (r, g, b))
+        embed.set_thumbnail(url="attachment://swatch.png")
         
-        await interaction.response.send_message(embed=embed)
+        await interaction.response.send_message(embed=embed, file=discord.File(io.BytesIO(swatch), filename="swatch.png"))
     
     @app_commands.command(name="qr", description="Generate a QR code for text")
-    @app_commands.describe(text="Text to encode in QR code")
-    async def qr(self, interaction: discord.Interaction, text: str):
+    @app_commands.describe(text="Text to encode in QR code", size="Image size in pixels (default 300)")
+    async def qr(self, interaction: discord.Interaction, text: str, size: app_commands.Range[int, 100, 1000] = 300):
         """Generate a QR code for the given text"""
         if len(text) > 500:
             embed = EmbedBuilder.error("Text Too Long", "Please use 500 characters or less!")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # URL encode the text for the QR API
-        import urllib.parse
-        encoded_text = urllib.parse.quote(text)
-        
-        qr_url = f"https://api.qrserver.com/v1/create-qr-code/?size=300x300&data={encoded_text}"
-        
         embed = discord.Embed(
             title="📱 QR Code Generator",
             description=f"QR Code for: `{text[:100]}{'...' if len(text) > 100 else ''}`",
@@ -441,8 +433,6 @@ class ImagesCog(commands.Cog, name="Images & Memes"):
             timestamp=datetime.utcnow()
         )
         
-        embed.set_image(url=qr_url)
-        
         embed.add_field(
             name="📋 Instructions",
             value="Scan this QR code with your phone's camera or QR reader app!",
@@ -454,7 +444,18 @@ class ImagesCog(commands.Cog, name="Images & Memes"):
             icon_url=interaction.user.display_avatar.url
         )
         
-        await interaction.response.send_message(embed=embed)
+        if not QR_AVAILABLE:
+            # qrcode not installed; fall back to the hosted renderer
+            import urllib.parse
+            encoded_text = urllib.parse.quote(text)
+            embed.set_image(url=f"https://api.qrserver.com/v1/create-qr-code/?size={size}x{size}&data={encoded_text}")
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        # Rendered off the event loop; repeated codes come straight from the cache
+        png = await self.renders.get(render_qr, text, size)
+        embed.set_image(url="attachment://qr.png")
+        await interaction.response.send_message(embed=embed, file=discord.File(io.BytesIO(png), filename="qr.png"))
     
     @app_commands.command(name="emoji", description="Get information about an emoji")
     @app_commands.describe(emoji="The emoji to get information about")
@@ -6,11 +6,24 @@ from typing import Optional, Union
 import sqlite3
 import sys
 import os
+import io
+import time
 import logging
 
 # Add the parent directory to the path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.helpers import EmbedBuilder, ConfirmationView, TimeConverter, PermissionChecker, format_duration
+from utils.mass_ban import MassBanEngine, MassBanResult, parse_user_ids
+from utils.lockdown import ChannelReport, restore_overwrite, run_per_channel, snapshot_overwrite
+
+# /massban limits: IDs per run, bans in flight, seconds between progress edits
+MASSBAN_LIMIT = 1000
+MASSBAN_CONCURRENCY = 5
+MASSBAN_PROGRESS_INTERVAL = 2.0
+# Largest ID list attachment read, in bytes
+MASSBAN_FILE_LIMIT = 1024 * 1024
+# Channel permission edits in flight during /lockdown and unlocks
+LOCKDOWN_CONCURRENCY = 10
 
 # Create logger for moderation actions
 mod_logger = logging.getLogger('moderation_actions')
@@ -26,6 +39,9 @@ class ModerationCog(commands.Cog, name="Moderation"):
     def __init__(self, bot):
         self.bot = bot
         
+    async def cog_load(self):
+        self.bot.scheduler.register('lockdown_expiry', self.lockdown_expired)
+        
     @property
     def db(self):
         return self.bot.db
@@ -458,8 +474,9 @@ class ModerationCog(commands.Cog, name="Moderation"):
         embed.add_field(name="Total Warnings", value=str(len(warnings)), inline=True)
         
         # Show recent warnings
+        moderators = await self.bot.member_resolver.get_many(interaction.guild, (w[1] for w in warnings[:5]))
         for i, (warn_id, mod_id, warn_reason, timestamp) in enumerate(warnings[:5]):
-            moderator = interaction.guild.get_member(mod_id)
+            moderator = moderators[mod_id]
             mod_name = moderator.display_name if moderator else "Unknown"
             
             # Parse timestamp
@@ -631,13 +648,17 @@ class ModerationCog(commands.Cog, name="Moderation"):
     @app_commands.command(name="massban", description="Ban multiple users by ID")
     @app_commands.describe(
         user_ids="User IDs separated by spaces or commas",
-        reason="Reason for the mass ban"
+        file="Text file with user IDs (one per line or any separator)",
+        reason="Reason for the mass ban",
+        delete_days="Number of days of messages to delete (0-7, default 1)"
     )
     async def massban(
         self,
         interaction: discord.Interaction,
-        user_ids: str,
-        reason: str = "Mass ban"
+        user_ids: Optional[str] = None,
+        file: Optional[discord.Attachment] = None,
+        reason: str = "Mass ban",
+        delete_days: app_commands.Range[int, 0, 7] = 1
     ):
         """Ban multiple users by their IDs"""
         if not PermissionChecker.can_ban(interaction.user):
@@ -645,37 +666,73 @@ class ModerationCog(commands.Cog, name="Moderation"):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Parse user IDs
-        id_list = re.split(r'[\s,]+', user_ids.strip())
-        valid_ids = []
+        if file is not None and file.size > MASSBAN_FILE_LIMIT:
+            embed = EmbedBuilder.error("File Too Large", "ID list files must be 1 MB or smaller.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
         
-        for user_id in id_list:
+        # Parse user IDs from the text and/or the attached file
+        file_text = ""
+        if file is not None:
             try:
-                valid_ids.append(int(user_id))
-            except ValueError:
-                continue
+                file_text = (await file.read()).decode('utf-8', errors='ignore')
+            except discord.HTTPException:
+                embed = EmbedBuilder.error("Invalid File", "Couldn't download the attached file.")
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+        valid_ids = parse_user_ids(user_ids, file_text)
         
         if not valid_ids:
-            embed = EmbedBuilder.error("Invalid Input", "Please provide valid user IDs separated by spaces or commas.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            embed = EmbedBuilder.error("Invalid Input", "Please provide valid user IDs separated by spaces or commas, or attach a file of IDs.")
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
         
-        if len(valid_ids) > 10:
-            embed = EmbedBuilder.error("Too Many Users", "Mass ban is limited to 10 users at once for safety.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+        if len(valid_ids) > MASSBAN_LIMIT:
+            embed = EmbedBuilder.error("Too Many Users", f"Mass ban is limited to {MASSBAN_LIMIT} users at once.")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        # Never ban ourselves, the moderator, the owner or anyone above either of us
+        guild = interaction.guild
+        result = MassBanResult()
+        protected = {interaction.user.id: "you", self.bot.user.id: "the bot", guild.owner_id: "server owner"}
+        # Resolve through the member resolver so the hierarchy check also covers
+        # members that aren't cached in low-memory mode. Chunked guilds need no
+        # requests; otherwise IDs are queried 100 at a time, and any that can't
+        # be resolved are treated as non-members.
+        members = await self.bot.member_resolver.get_many(
+            guild, [user_id for user_id in valid_ids if user_id not in protected]
+        )
+        for user_id in valid_ids:
+            member = members.get(user_id)
+            if user_id in protected:
+                result.record(user_id, 'skipped', protected[user_id])
+            elif member is not None and not PermissionChecker.can_moderate(interaction.user, member):
+                result.record(user_id, 'skipped', "role hierarchy")
+            elif member is not None and member.top_role >= guild.me.top_role:
+                result.record(user_id, 'skipped', "above the bot's role")
+        to_ban = len(valid_ids) - len(result.outcomes)
+        
+        if not to_ban:
+            embed = EmbedBuilder.error("Nothing To Ban", "Every listed user is protected (you, the bot, the owner or above your role).")
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
         
         # Confirmation dialog
         embed = discord.Embed(
             title="⚡ Confirm Mass Ban",
-            description=f"Are you sure you want to ban {len(valid_ids)} users?",
+            description=f"Are you sure you want to ban {to_ban} users?",
             color=discord.Color.red()
         )
-        embed.add_field(name="User Count", value=str(len(valid_ids)), inline=True)
+        embed.add_field(name="User Count", value=str(to_ban), inline=True)
+        if result.outcomes:
+            embed.add_field(name="Skipped", value=str(len(result.outcomes)), inline=True)
         embed.add_field(name="Reason", value=reason, inline=False)
         
-        view = ConfirmationView()
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        view = ConfirmationView(interaction.user)
+        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
         
         await view.wait()
         
@@ -689,49 +746,75 @@ class ModerationCog(commands.Cog, name="Moderation"):
             await interaction.edit_original_response(embed=embed, view=None)
             return
         
-        # Execute mass ban
-        banned_count = 0
-        failed_bans = []
+        # Progress edits are throttled; the final one always goes through
+        last_update = 0.0
         
-        for user_id in valid_ids:
+        async def show_progress(done: int, total: int):
+            nonlocal last_update
+            now = time.monotonic()
+            if done < total and now - last_update < MASSBAN_PROGRESS_INTERVAL:
+                return
+            last_update = now
+            embed = EmbedBuilder.info("Mass Ban In Progress", f"Processed {done}/{total} users...")
             try:
-                user = discord.Object(user_id)
-                await interaction.guild.ban(user, reason=f"Mass ban by {interaction.user} | {reason}")
-                banned_count += 1
-            except Exception as e:
-                failed_bans.append(f"{user_id}: {str(e)[:50]}")
+                await interaction.edit_original_response(embed=embed, view=None)
+            except discord.HTTPException:
+                pass
+        
+        await show_progress(0, to_ban)
+        engine = MassBanEngine(
+            guild,
+            reason=f"Mass ban by {interaction.user} | {reason}",
+            delete_message_seconds=delete_days * 86400,
+            concurrency=MASSBAN_CONCURRENCY,
+            on_progress=show_progress
+        )
+        await engine.run(valid_ids, result)
+        banned_count = result.count('banned')
+        failed_count = result.count('failed')
         
         embed = EmbedBuilder.success(
             "Mass Ban Complete",
-            f"Successfully banned {banned_count}/{len(valid_ids)} users."
+            f"Successfully banned {banned_count}/{to_ban} users in {result.elapsed:.1f}s."
         )
         embed.add_field(name="Reason", value=reason, inline=False)
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=True)
+        embed.add_field(name="Method", value="Bulk ban" if result.used_bulk else "Individual bans", inline=True)
         
-        if failed_bans:
+        if failed_count or result.count('skipped'):
             embed.add_field(
-                name="Failed Bans",
-                value="\n".join(failed_bans[:5]) + ("\n..." if len(failed_bans) > 5 else ""),
+                name="Not Banned",
+                value=f"{failed_count} failed, {result.count('skipped')} skipped - see the attached report",
                 inline=False
             )
         
-        await interaction.edit_original_response(embed=embed, view=None)
+        report = discord.File(
+            io.BytesIO(result.report()),
+            filename=f"massban-{guild.id}-{datetime.utcnow():%Y%m%d-%H%M%S}.csv"
+        )
+        await interaction.edit_original_response(embed=embed, view=None, attachments=[report])
+        mod_logger.info(
+            f"Mass ban in {guild} by {interaction.user}: {banned_count} banned, "
+            f"{failed_count} failed, {result.count('skipped')} skipped in {result.elapsed:.1f}s"
+        )
         
         # Log the action
-        log_embed = EmbedBuilder.moderation_log("Mass Ban", discord.Object(0), interaction.user, reason)
+        log_embed = EmbedBuilder.moderation_log("Mass Ban", guild.default_role, interaction.user, reason)
         log_embed.add_field(name="Users Banned", value=str(banned_count), inline=True)
-        await self.log_action(interaction.guild, log_embed)
+        await self.log_action(guild, log_embed)
     
     @app_commands.command(name="lockdown", description="Lock down the entire server")
     @app_commands.describe(
         reason="Reason for the lockdown",
-        duration="Duration of lockdown (optional)"
+        duration="Duration of lockdown (optional)",
+        end="End the current lockdown and restore channel permissions instead"
     )
     async def lockdown(
         self,
         interaction: discord.Interaction,
         reason: str = "Server lockdown",
-        duration: Optional[str] = None
+        duration: Optional[str] = None,
+        end: bool = False
     ):
         """Lock down the entire server"""
         if not interaction.user.guild_permissions.administrator:
@@ -739,6 +822,10 @@ class ModerationCog(commands.Cog, name="Moderation"):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
+        if end:
+            await self.end_lockdown(interaction, "Lockdown ended" if reason == "Server lockdown" else reason)
+            return
+        
         # Parse duration if provided
         end_time = None
         if duration:
@@ -772,25 +859,13 @@ class ModerationCog(commands.Cog, name="Moderation"):
             return
         
         # Execute lockdown
-        locked_channels = 0
-        failed_channels = []
-        
-        for channel in interaction.guild.text_channels:
-            try:
-                overwrite = channel.overwrites_for(interaction.guild.default_role)
-                overwrite.send_messages = False
-                await channel.set_permissions(
-                    interaction.guild.default_role,
-                    overwrite=overwrite,
-                    reason=f"Server lockdown by {interaction.user} | {reason}"
-                )
-                locked_channels += 1
-            except Exception:
-                failed_channels.append(channel.name)
+        embed = EmbedBuilder.info("Locking Down", f"Locking {len(interaction.guild.text_channels)} text channels...")
+        await interaction.edit_original_response(embed=embed, view=None)
+        report = await self.lock_server(interaction.guild, interaction.user, reason)
         
         embed = EmbedBuilder.success(
             "Server Locked Down",
-            f"Locked {locked_channels} text channels."
+            f"Locked {len(report.succeeded)} text channels in {report.elapsed:.1f}s."
         )
         embed.add_field(name="Reason", value=reason, inline=False)
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=True)
@@ -798,37 +873,148 @@ class ModerationCog(commands.Cog, name="Moderation"):
         if end_time:
             embed.add_field(name="Ends", value=discord.utils.format_dt(end_time, style='R'), inline=True)
         
-        if failed_channels:
-            embed.add_field(name="Failed Channels", value=", ".join(failed_channels[:5]), inline=False)
-        
-        await interaction.edit_original_response(embed=embed, view=None)
+        self.add_channel_report(embed, report)
+        await interaction.edit_original_response(embed=embed, view=None, attachments=[self.channel_report_file(interaction.guild, report, "lockdown")])
         
-        # Schedule unlock if duration provided
+        # Schedule unlock if duration provided; the timer survives restarts
         if end_time:
-            await asyncio.sleep(time_delta.total_seconds())
-            await self.auto_unlock_server(interaction.guild, interaction.user, reason)
+            self.bot.scheduler.cancel('lockdown_expiry', interaction.guild.id)
+            self.bot.scheduler.schedule(
+                'lockdown_expiry',
+                end_time,
+                {'guild_id': interaction.guild.id, 'moderator_id': interaction.user.id, 'reason': reason},
+                guild_id=interaction.guild.id
+            )
+    
+    async def lockdown_expired(self, job: dict):
+        """Scheduler handler: unlock a server whose lockdown duration ran out"""
+        guild = self.bot.get_guild(job['guild_id'])
+        if guild is None:
+            return
+        await self.auto_unlock_server(guild, job['moderator_id'], job['reason'])
     
-    async def auto_unlock_server(self, guild: discord.Guild, moderator: discord.Member, original_reason: str):
-        """Automatically unlock server after lockdown duration"""
-        unlocked_channels = 0
+    async def lock_server(self, guild: discord.Guild, moderator: discord.Member, reason: str) -> ChannelReport:
+        """Snapshot @everyone overwrites, then deny Send Messages in every text channel"""
+        default_role = guild.default_role
+        channels = guild.text_channels
         
-        for channel in guild.text_channels:
-            try:
-                overwrite = channel.overwrites_for(guild.default_role)
-                overwrite.send_messages = None
-                await channel.set_permissions(
-                    guild.default_role,
-                    overwrite=overwrite,
-                    reason=f"Auto-unlock after lockdown by {moderator}"
-                )
-                unlocked_channels += 1
-            except Exception:
-                continue
+        # INSERT OR IGNORE: locking an already locked server keeps the original snapshot
+        cursor = self.db.cursor()
+        cursor.executemany(
+            "INSERT OR IGNORE INTO lockdown_snapshots (guild_id, channel_id, allow, deny, present) VALUES (?, ?, ?, ?, ?)",
+            [(guild.id, channel.id, *snapshot_overwrite(channel, default_role)) for channel in channels]
+        )
+        self.db.commit()
         
-        # Log auto-unlock
-        log_embed = EmbedBuilder.moderation_log("Auto Server Unlock", discord.Object(0), moderator, "Lockdown duration expired")
-        log_embed.add_field(name="Channels Unlocked", value=str(unlocked_channels), inline=True)
+        async def lock(channel):
+            overwrite = channel.overwrites_for(default_role)
+            overwrite.send_messages = False
+            await channel.set_permissions(
+                default_role,
+                overwrite=overwrite,
+                reason=f"Server lockdown by {moderator} | {reason}"
+            )
+        
+        return await run_per_channel(channels, lock, LOCKDOWN_CONCURRENCY)
+    
+    async def unlock_server(self, guild: discord.Guild, reason: str) -> Optional[ChannelReport]:
+        """Restore the pre-lockdown @everyone overwrites; None if there's no lockdown snapshot"""
+        cursor = self.db.cursor()
+        cursor.execute("SELECT channel_id, allow, deny, present FROM lockdown_snapshots WHERE guild_id = ?", (guild.id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        
+        snapshots = {}
+        missing = []
+        for channel_id, allow, deny, present in rows:
+            channel = guild.get_channel(channel_id)
+            if channel is None:
+                missing.append(channel_id)
+            else:
+                snapshots[channel] = restore_overwrite(allow, deny, bool(present))
+        
+        async def unlock(channel):
+            await channel.set_permissions(guild.default_role, overwrite=snapshots[channel], reason=reason)
+        
+        report = await run_per_channel(snapshots, unlock, LOCKDOWN_CONCURRENCY)
+        
+        # Keep snapshots of channels that failed so running the unlock again restores them
+        done = missing + [channel.id for channel, _, _ in report.succeeded]
+        cursor.executemany(
+            "DELETE FROM lockdown_snapshots WHERE guild_id = ? AND channel_id = ?",
+            [(guild.id, channel_id) for channel_id in done]
+        )
+        self.db.commit()
+        return report
+    
+    def add_channel_report(self, embed: discord.Embed, report: ChannelReport):
+        """Add timing and failure fields for a lockdown/unlock run"""
+        if report.rows:
+            slowest = "\n".join(f"#{channel.name}: {elapsed_ms:.0f}ms" for channel, elapsed_ms, _ in report.slowest())
+            embed.add_field(name="Slowest Channels", value=slowest, inline=True)
+        if report.failed:
+            failed = "\n".join(f"#{channel.name}: {error}" for channel, _, error in report.failed[:5])
+            if len(report.failed) > 5:
+                failed += f"\n... and {len(report.failed) - 5} more"
+            embed.add_field(name=f"Failed Channels ({len(report.failed)})", value=failed, inline=False)
+    
+    def channel_report_file(self, guild: discord.Guild, report: ChannelReport, action: str) -> discord.File:
+        return discord.File(
+            io.BytesIO(report.to_csv()),
+            filename=f"{action}-{guild.id}-{datetime.utcnow():%Y%m%d-%H%M%S}.csv"
+        )
+    
+    async def auto_unlock_server(self, guild: discord.Guild, moderator_id: int, original_reason: str):
+        """Automatically unlock server after lockdown duration.
+        
+        Raises if a channel failed for a transient reason so the scheduler
+        retries; the snapshots of restored channels are already gone by then.
+        Channels the bot can't edit are left for `/lockdown end:True`.
+        """
+        # The moderator may have left; only their ID is needed to unlock
+        moderator = guild.get_member(moderator_id) or self.bot.get_user(moderator_id)
+        report = await self.unlock_server(guild, f"Auto-unlock after lockdown by {moderator or moderator_id}")
+        if report is None:
+            return
+        
+        # Log auto-unlock (the bot stands in for a moderator who can't be resolved)
+        log_embed = EmbedBuilder.moderation_log("Auto Server Unlock", guild.default_role, moderator or guild.me, "Lockdown duration expired")
+        log_embed.add_field(name="Channels Unlocked", value=str(len(report.succeeded)), inline=True)
+        if report.failed:
+            log_embed.add_field(name="Channels Failed", value=str(len(report.failed)), inline=True)
         await self.log_action(guild, log_embed)
+        
+        transient = [row for row in report.failed if row[2] != 'missing permissions']
+        if transient:
+            raise RuntimeError(f"{len(transient)} channels in {guild.id} are still locked")
+    
+    async def end_lockdown(self, interaction: discord.Interaction, reason: str):
+        """Restore every channel to its pre-lockdown permissions (/lockdown end:True)"""
+        await interaction.response.defer(ephemeral=True)
+        self.bot.scheduler.cancel('lockdown_expiry', interaction.guild.id)
+        report = await self.unlock_server(interaction.guild, f"Server unlocked by {interaction.user} | {reason}")
+        
+        if report is None:
+            embed = EmbedBuilder.error("No Active Lockdown", "There is no lockdown to end in this server.")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        embed = EmbedBuilder.success(
+            "Server Unlocked",
+            f"Restored {len(report.succeeded)} text channels in {report.elapsed:.1f}s."
+        )
+        embed.add_field(name="Reason", value=reason, inline=False)
+        embed.add_field(name="Moderator", value=interaction.user.mention, inline=True)
+        self.add_channel_report(embed, report)
+        if report.failed:
+            embed.add_field(name="Retry", value="Run `/lockdown end:True` again to retry the failed channels.", inline=False)
+        
+        await interaction.followup.send(embed=embed, file=self.channel_report_file(interaction.guild, report, "unlock"), ephemeral=True)
+        
+        log_embed = EmbedBuilder.moderation_log("Server Unlock", interaction.guild.default_role, interaction.user, reason)
+        log_embed.add_field(name="Channels Unlocked", value=str(len(report.succeeded)), inline=True)
+        await self.log_action(interaction.guild, log_embed)
     
     @app_commands.command(name="mute", description="Mute a user (remove their ability to speak in voice channels)")
     @app_commands.describe(
@@ -129,10 +129,8 @@ class EntertainmentCog(commands.Cog, name="Entertainment"):
             "start_time": datetime.utcnow()
         }
         
-        # Auto-end after timeout
-        await asyncio.sleep(30)
-        if interaction.channel.id in self.trivia_sessions:
-            del self.trivia_sessions[interaction.channel.id]
+        # Auto-end after the 30 second timeout without holding this handler open
+        asyncio.get_running_loop().call_later(30, self.trivia_sessions.pop, interaction.channel.id, None)
     
     @app_commands.command(name="riddle", description="Get a riddle to solve")
     async def riddle(self, interaction: discord.Interaction):
@@ -7,11 +7,16 @@ import asyncio
 import sys
 import os
 import io
+import time
 
 # Add the parent directory to the path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.helpers import EmbedBuilder, ConfirmationView, time_to_seconds
 
+# Interaction tokens expire after 15 minutes; later updates go to the channel instead
+INTERACTION_EDIT_WINDOW = 14 * 60
+PROGRESS_INTERVAL = 5  # seconds between progress updates on long role removals
+
 class ServerManagementCog(commands.Cog, name="Server Management"):
     """Advanced server management and administration commands"""
     
@@ -213,16 +218,22 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             embed = EmbedBuilder.error("Error", f"Failed to create role: {str(e)}")
             await interaction.followup.send(embed=embed, ephemeral=True)
     
-    @app_commands.command(name="removerole", description="Delete a role")
+    @app_commands.command(name="removerole", description="Delete a role, or remove it from every member")
     @app_commands.describe(
         role="Role to delete",
-        reason="Reason for deleting the role"
+        reason="Reason for deleting the role",
+        mode="Delete the role (default) or take it away from everyone who has it"
     )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Delete the role", value="delete"),
+        app_commands.Choice(name="Remove from all members", value="members")
+    ])
     async def delete_role(
         self,
         interaction: discord.Interaction,
         role: discord.Role,
-        reason: Optional[str] = None
+        reason: Optional[str] = None,
+        mode: Literal["delete", "members"] = "delete"
     ):
         """Delete a role with confirmation"""
         if not interaction.user.guild_permissions.manage_roles:
@@ -230,6 +241,10 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
+        if mode == "members":
+            await self.clear_role(interaction, role, reason)
+            return
+        
         if role >= interaction.user.top_role and interaction.user != interaction.guild.owner:
             embed = EmbedBuilder.error("Permission Error", "You can only delete roles lower than your highest role!")
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -247,7 +262,7 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             timestamp=datetime.utcnow()
         )
         
-        embed.add_field(name="👥 Members", value=f"{len(role.members)} members have this role", inline=True)
+        embed.add_field(name="👥 Members", value=f"{self.bot.role_index.count_text(interaction.guild, role)} members have this role", inline=True)
         
         if reason:
             embed.add_field(name="📝 Reason", value=reason, inline=False)
@@ -281,6 +296,93 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             embed = EmbedBuilder.warning("Cancelled", "Role deletion cancelled.")
             await interaction.edit_original_response(embed=embed, view=None)
     
+    async def clear_role(self, interaction: discord.Interaction, role: discord.Role, reason: Optional[str] = None):
+        """/removerole mode:members - remove a role from all of its members with confirmation"""
+        if role >= interaction.user.top_role and interaction.user != interaction.guild.owner:
+            embed = EmbedBuilder.error("Permission Error", "You can only manage roles lower than your highest role!")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if role.is_default() or role.managed or role >= interaction.guild.me.top_role:
+            embed = EmbedBuilder.error("Invalid Role", "I can't remove that role from members!")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        # Iterate the role index instead of the whole member list
+        member_ids = self.bot.role_index.member_ids(interaction.guild, role)
+        if member_ids is None:
+            members = [member for member in await self.bot.member_resolver.guild_members(interaction.guild) if member.get_role(role.id)]
+        else:
+            members = [interaction.guild.get_member(member_id) for member_id in list(member_ids)]
+            members = [member for member in members if member is not None]
+        
+        if not members:
+            embed = EmbedBuilder.info("Nothing To Do", f"No members have {role.mention}.")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title="⚠️ Confirm Role Removal",
+            description=f"Remove {role.mention} from **{len(members)}** members?",
+            color=discord.Color.red(),
+            timestamp=datetime.utcnow()
+        )
+        if reason:
+            embed.add_field(name="📝 Reason", value=reason, inline=False)
+        
+        view = ConfirmationView(interaction.user)
+        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+        
+        await view.wait()
+        
+        if view.value is None:
+            embed = EmbedBuilder.error("Timeout", "Role removal cancelled due to timeout.")
+            await interaction.edit_original_response(embed=embed, view=None)
+            return
+        if not view.value:
+            embed = EmbedBuilder.warning("Cancelled", "Role removal cancelled.")
+            await interaction.edit_original_response(embed=embed, view=None)
+            return
+        
+        status_message = None
+        
+        async def report(embed: discord.Embed):
+            """Edit the interaction response while its token is valid, then a channel message"""
+            nonlocal status_message
+            try:
+                if (discord.utils.utcnow() - interaction.created_at).total_seconds() < INTERACTION_EDIT_WINDOW:
+                    await interaction.edit_original_response(embed=embed, view=None)
+                elif status_message is None:
+                    status_message = await interaction.channel.send(embed=embed)
+                else:
+                    await status_message.edit(embed=embed)
+            except discord.HTTPException:
+                pass  # Progress is best effort; the removals carry on
+        
+        removed = 0
+        failed = 0
+        last_update = time.monotonic()
+        await report(EmbedBuilder.info("Removing Role", f"Removing {role.mention} from **{len(members)}** members..."))
+        for done, member in enumerate(members, 1):
+            try:
+                await member.remove_roles(role, reason=reason or f"Role cleared by {interaction.user}")
+                removed += 1
+            except discord.HTTPException:
+                failed += 1
+            if time.monotonic() - last_update >= PROGRESS_INTERVAL and done < len(members):
+                last_update = time.monotonic()
+                await report(EmbedBuilder.info("Removing Role", f"Removing {role.mention}: **{done}/{len(members)}** members done..."))
+        
+        embed = EmbedBuilder.success(
+            "Role Cleared",
+            f"Removed {role.mention} from **{removed}** members"
+        )
+        if failed:
+            embed.add_field(name="❌ Failed", value=str(failed), inline=True)
+        await report(embed)
+    
     @app_commands.command(name="cleanup", description="Clean up bot messages")
     @app_commands.describe(
         amount="Number of messages to check (max 100)",
@@ -356,6 +458,18 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
     @app_commands.describe(role="The role to get information about")
     async def role_info(self, interaction: discord.Interaction, role: discord.Role):
         """Get detailed information about a role"""
+        member_ids = self.bot.role_index.member_ids(interaction.guild, role)
+        if member_ids is not None:
+            member_count = len(member_ids)
+            sample = self.bot.role_index.sample_members(interaction.guild, role, 5)
+        else:
+            # Low-memory mode: the member list is chunked just for this command
+            await interaction.response.defer()
+            members = await self.bot.member_resolver.guild_members(interaction.guild)
+            role_members = [member for member in members if member.get_role(role.id)]
+            member_count = len(role_members)
+            sample = role_members[:5]
+        
         embed = discord.Embed(
             title=f"📋 Role Information: {role.name}",
             color=role.color if role.color != discord.Color.default() else discord.Color.blue(),
@@ -373,7 +487,7 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
         embed.add_field(name="🤖 Bot Role", value="Yes" if role.is_bot_managed() else "No", inline=True)
         
         # Members
-        embed.add_field(name="👥 Members", value=f"{len(role.members)}", inline=True)
+        embed.add_field(name="👥 Members", value=f"{member_count}", inline=True)
         embed.add_field(name="📅 Created", value=f"<t:{int(role.created_at.timestamp())}:R>", inline=True)
         embed.add_field(name="🔧 Managed", value="Yes" if role.managed else "No", inline=True)
         
@@ -400,10 +514,10 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             )
         
         # Show some members if any
-        if role.members:
-            member_list = [member.mention for member in role.members[:5]]
-            if len(role.members) > 5:
-                member_list.append(f"... and {len(role.members) - 5} more")
+        if sample:
+            member_list = [member.mention for member in sample]
+            if member_count > len(sample):
+                member_list.append(f"... and {member_count - len(sample)} more")
             
             embed.add_field(
                 name="👥 Some Members",
@@ -411,7 +525,10 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
                 inline=False
             )
         
-        await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name="channelinfo", description="Get detailed information about a channel")
     @app_commands.describe(channel="The channel to get information about")
@@ -690,15 +807,15 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
         """Show detailed member statistics"""
         guild = interaction.guild
         
-        # Count members by status
-        online = len([m for m in guild.members if m.status == discord.Status.online])
-        idle = len([m for m in guild.members if m.status == discord.Status.idle])
-        dnd = len([m for m in guild.members if m.status == discord.Status.dnd])
-        offline = len([m for m in guild.members if m.status == discord.Status.offline])
+        stats = self.bot.guild_stats.get(guild)
+        if stats is None:
+            # Low-memory mode: counters are built from a one-off chunk on first use
+            await interaction.response.defer()
+            stats = await self.bot.guild_stats.stats_for(guild)
         
-        # Count bots vs humans
-        bots = len([m for m in guild.members if m.bot])
-        humans = guild.member_count - bots
+        # Counters are maintained from join/leave events
+        bots = stats.bots
+        humans = stats.humans
         
         embed = discord.Embed(
             title=f"📊 {guild.name} Member Statistics",
@@ -720,10 +837,18 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
             inline=True
         )
         
-        # Status breakdown
+        # Status breakdown (needs the presences intent; without it everyone reads as offline)
+        if stats.statuses is not None:
+            online = stats.status_count(discord.Status.online)
+            idle = stats.status_count(discord.Status.idle)
+            dnd = stats.status_count(discord.Status.dnd)
+            offline = stats.status_count(discord.Status.offline)
+            status = f"🟢 Online: **{online}**\\n🟡 Idle: **{idle}**\\n🔴 DND: **{dnd}**\\n⚫ Offline: **{offline}**"
+        else:
+            status = "Not tracked: the bot runs without the presences intent"
         embed.add_field(
             name="📶 Status",
-            value=f"🟢 Online: **{online}**\\n🟡 Idle: **{idle}**\\n🔴 DND: **{dnd}**\\n⚫ Offline: **{offline}**",
+            value=status,
             inline=True
         )
         
@@ -750,7 +875,10 @@ class ServerManagementCog(commands.Cog, name="Server Management"):
         if guild.icon:
             embed.set_thumbnail(url=guild.icon.url)
         
-        await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
 
 class EmojiPaginationView(discord.ui.View):
     """Pagination view for server emojis"""
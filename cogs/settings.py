@@ -203,6 +203,7 @@ class ChannelSelectView(discord.ui.View):
             (channel_id, interaction.guild.id)
         )
         interaction.client.db.commit()
+        interaction.client.dispatch('guild_settings_update', interaction.guild.id)
         
         embed = EmbedBuilder.success(
             "Channel Set",
@@ -249,6 +250,7 @@ class WarningLimitsModal(discord.ui.Modal):
                 (max_warns, action, interaction.guild.id)
             )
             interaction.client.db.commit()
+            interaction.client.dispatch('guild_settings_update', interaction.guild.id)
             
             embed = EmbedBuilder.success(
                 "Warning Settings Updated",
@@ -306,6 +308,7 @@ class SettingsCog(commands.Cog, name="Settings"):
             (interaction.guild.id, channel.id)
         )
         self.db.commit()
+        self.bot.dispatch('guild_settings_update', interaction.guild.id)
         
         embed = EmbedBuilder.success(
             "Log Channel Set",
@@ -343,6 +346,7 @@ class SettingsCog(commands.Cog, name="Settings"):
             (interaction.guild.id, enabled)
         )
         self.db.commit()
+        self.bot.dispatch('guild_settings_update', interaction.guild.id)
         
         status = "enabled" if enabled else "disabled"
         embed = EmbedBuilder.success(
@@ -448,6 +452,7 @@ class AutoModSettingsView(discord.ui.View):
             (interaction.guild.id, new_status)
         )
         interaction.client.db.commit()
+        interaction.client.dispatch('guild_settings_update', interaction.guild.id)
         
         status_text = "enabled" if new_status else "disabled"
         embed = EmbedBuilder.success(
@@ -95,6 +95,18 @@ class UtilityCog(commands.Cog, name="Utility"):
     def __init__(self, bot):
         self.bot = bot
     
+    def format_shard_row(self, row: tuple) -> str:
+        """One line of per-shard gateway stats"""
+        shard_id, latency_ms, events_per_minute, reconnects = row
+        latency = f"{latency_ms:.0f}ms" if latency_ms is not None else "offline"
+        return f"`#{shard_id}` {latency} • {events_per_minute:,} ev/min • {reconnects} reconnects"
+    
+    def format_host_row(self, row: dict) -> str:
+        """One line of per-host outbound API stats"""
+        state = "" if row['state'] == 'closed' else f" • **{row['state']}**"
+        return (f"`{row['host']}` p50 {row['p50_ms']:.0f}ms • p95 {row['p95_ms']:.0f}ms • "
+                f"{row['error_rate']:.0%} errors ({row['requests']:,} req){state}")
+    
     @app_commands.command(name="userinfo", description="Get detailed information about a user")
     @app_commands.describe(user="The user to get information about")
     async def userinfo(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
@@ -230,6 +242,12 @@ class UtilityCog(commands.Cog, name="Utility"):
         """Display comprehensive server information"""
         guild = interaction.guild
         
+        stats = self.bot.guild_stats.get(guild)
+        if stats is None:
+            # Low-memory mode: counters are built from a one-off chunk on first use
+            await interaction.response.defer()
+            stats = await self.bot.guild_stats.stats_for(guild)
+        
         embed = discord.Embed(
             title=f"🏰 Server Information: {guild.name}",
             color=discord.Color.blue(),
@@ -252,15 +270,15 @@ class UtilityCog(commands.Cog, name="Utility"):
         
         # Member statistics
         total_members = guild.member_count
-        online_members = sum(1 for member in guild.members if member.status != discord.Status.offline)
-        bots = sum(1 for member in guild.members if member.bot)
+        # Statuses are only known with the presences intent
+        online = f"{stats.online:,}" if stats.statuses is not None else "not tracked (presences intent off)"
         
         embed.add_field(
             name="👥 Members",
             value=f"**Total:** {total_members:,}\n"
-                  f"**Online:** {online_members:,}\n"
-                  f"**Bots:** {bots:,}\n"
-                  f"**Humans:** {total_members - bots:,}",
+                  f"**Online:** {online}\n"
+                  f"**Bots:** {stats.bots:,}\n"
+                  f"**Humans:** {stats.humans:,}",
             inline=True
         )
         
@@ -317,7 +335,10 @@ class UtilityCog(commands.Cog, name="Utility"):
         if guild.banner:
             embed.set_image(url=guild.banner.url)
         
-        await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name="roles", description="Manage roles for a user")
     @app_commands.describe(user="The user to manage roles for")
@@ -373,13 +394,33 @@ class UtilityCog(commands.Cog, name="Utility"):
             inline=False
         )
         
-        # Statistics
-        total_members = sum(guild.member_count for guild in bot.guilds)
+        # Statistics (summed across cluster workers when clustered)
+        clusters = await bot.cluster_stats()
+        total_guilds = sum(stats['guilds'] for stats in clusters)
+        total_members = sum(stats['users'] for stats in clusters)
+        cluster_info = f"\n**Clusters:** {len(clusters)} (this: #{bot.cluster_id})" if bot.cluster_id is not None else ""
         embed.add_field(
             name="📊 Statistics",
-            value=f"**Servers:** {len(bot.guilds):,}\n"
+            value=f"**Servers:** {total_guilds:,}\n"
                   f"**Users:** {total_members:,}\n"
-                  f"**Commands:** {len(bot.tree.get_commands())}",
+                  f"**Commands:** {len(bot.tree.get_commands())}"
+                  f"{cluster_info}",
+            inline=True
+        )
+        
+        # Gateway shards
+        shards = self.bot.shard_report()
+        latencies = [row[1] for row in shards if row[1] is not None]
+        avg_latency = f"{sum(latencies) / len(latencies):.0f}ms" if latencies else "n/a"
+        # DMs always arrive on shard 0
+        current = interaction.guild.shard_id if interaction.guild else 0
+        busiest = f"#{shards[0][0]}" if shards else "n/a"
+        embed.add_field(
+            name="🧩 Shards",
+            value=f"**Shards:** {len(shards)} (this server: #{current})\n"
+                  f"**Avg Latency:** {avg_latency}\n"
+                  f"**Events/min:** {sum(row[2] for row in shards):,} (busiest: {busiest})\n"
+                  f"**Reconnects:** {sum(row[3] for row in shards)}",
             inline=True
         )
         
@@ -464,6 +505,34 @@ class UtilityCog(commands.Cog, name="Utility"):
             inline=True
         )
         
+        # Per-shard gateway stats, busiest shards first
+        shards = self.bot.shard_report()
+        if len(shards) > 1:
+            current = interaction.guild.shard_id if interaction.guild else 0
+            lines = [self.format_shard_row(row) for row in shards[:10]]
+            if len(shards) > 10:
+                lines.append(f"... and {len(shards) - 10} more")
+            embed.add_field(
+                name=f"🧩 Shards ({len(shards)}, this server: #{current})",
+                value="\n".join(lines),
+                inline=False
+            )
+        elif shards:
+            embed.add_field(
+                name="🧩 Gateway",
+                value=self.format_shard_row(shards[0]),
+                inline=False
+            )
+        
+        # External APIs (image/meme sources), busiest first
+        hosts = self.bot.api_client.stats() if self.bot.api_client else []
+        if hosts:
+            embed.add_field(
+                name="🌐 External APIs",
+                value="\n".join(self.format_host_row(row) for row in hosts[:5]),
+                inline=False
+            )
+        
         # Color code based on latency
         avg_latency = (ws_latency + api_latency) / 2
         if avg_latency < 100:
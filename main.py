@@ -1,3 +1,6 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -10,17 +13,24 @@ from typing import Optional, Union
 import re
 import aiohttp
 import os
+import hashlib
+import heapq
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
+from utils.log_pipeline import setup_logging, apply_log_levels, log_event
+from utils.helpers import EmbedBuilder
+from utils.startup import StartupProfiler
+from utils.shard_metrics import ShardMetrics
+from utils.ipc import IPCClient
+from utils.member_cache import MemberResolver
+from utils.guild_stats import GuildStatsTracker
+from utils.role_index import RoleIndex
+from utils.http import ApiClient, create_session
+from utils.scheduler import Scheduler
+
+# Startup timeline (imports, login, database, cogs, sync, gateway ready)
+startup_profiler = StartupProfiler(STARTUP_STARTED)
+startup_profiler.mark('imports', STARTUP_STARTED)
 
 # Create logger for bot actions
 bot_logger = logging.getLogger('bot_actions')
@@ -47,6 +57,14 @@ class BotConfig:
                 self.prefix = config.get('prefix', '!')
                 self.owner_ids = config.get('owner_ids', [])
                 self.log_channel = config.get('log_channel', None)
+                self.logging = config.get('logging', {})
+                self.dev_guild_ids = config.get('dev_guild_ids', [])
+                self.deferred_cogs = config.get('deferred_cogs', [])
+                self.startup_report = config.get('startup_report', 'startup_report.json')
+                self.sharding = config.get('sharding', {})
+                self.cluster = config.get('cluster', {})
+                self.member_cache = config.get('member_cache', {})
+                self.http = config.get('http', {})
         except FileNotFoundError:
             self.create_default_config()
     
@@ -55,39 +73,251 @@ class BotConfig:
             "token": "YOUR_BOT_TOKEN_HERE",
             "prefix": "!",
             "owner_ids": [],
-            "log_channel": None
+            "log_channel": None,
+            "dev_guild_ids": [],
+            "deferred_cogs": [],
+            "startup_report": "startup_report.json",
+            "sharding": {
+                "enabled": False,
+                "shard_count": None,
+                "shard_ids": None
+            },
+            "cluster": {
+                "clusters": 2,
+                "shard_count": None,
+                "socket": "cluster.sock"
+            },
+            "member_cache": {
+                "low_memory": False,
+                "lru_size": 5000,
+                "ttl": 300
+            },
+            "http": {
+                "limit": 100,
+                "limit_per_host": 10,
+                "dns_cache_ttl": 300,
+                "keepalive_timeout": 30,
+                "total_timeout": 10,
+                "connect_timeout": 5,
+                "breaker_failures": 5,
+                "breaker_reset": 30,
+                "url_overrides": {}
+            },
+            "logging": {
+                "level": "INFO",
+                "file": "bot.log",
+                "max_bytes": 5242880,
+                "backup_count": 5,
+                "queue_size": 10000,
+                "format": "text",
+                "levels": {},
+                "sampling": {
+                    "member_join": 1.0,
+                    "flagged_message": 1.0
+                }
+            }
         }
         with open('config.json', 'w') as f:
             json.dump(default_config, f, indent=4)
         print("Created config.json - Please add your bot token and configure settings!")
+        
+        self.token = default_config['token']
+        self.prefix = default_config['prefix']
+        self.owner_ids = default_config['owner_ids']
+        self.log_channel = default_config['log_channel']
+        self.logging = default_config['logging']
+        self.dev_guild_ids = default_config['dev_guild_ids']
+        self.deferred_cogs = default_config['deferred_cogs']
+        self.startup_report = default_config['startup_report']
+        self.sharding = default_config['sharding']
+        self.cluster = default_config['cluster']
+        self.member_cache = default_config['member_cache']
+        self.http = default_config['http']
 
 config = BotConfig()
 
+# Cluster workers are started by cluster.py, which hands each one a shard range
+CLUSTER_ID = int(os.environ['BOT_CLUSTER_ID']) if 'BOT_CLUSTER_ID' in os.environ else None
+IPC_ADDRESS = os.environ.get('BOT_IPC_SOCKET')
+if CLUSTER_ID is not None:
+    config.sharding = {
+        'enabled': True,
+        'shard_count': int(os.environ['BOT_SHARD_COUNT']),
+        'shard_ids': os.environ['BOT_SHARD_IDS']
+    }
+    # One log file and startup report per process
+    config.logging = {**config.logging, 'file': f"cluster-{CLUSTER_ID}-{config.logging.get('file', 'bot.log')}"}
+    config.startup_report = f'cluster-{CLUSTER_ID}-{config.startup_report}'
+
+# Events relayed to the other cluster workers (arguments must be JSON-serializable)
+IPC_RELAYED_EVENTS = {'guild_settings_update'}
+
+# Configure logging: records go through a bounded queue and are written
+# by a background thread, so logging never blocks the event loop
+setup_logging(config.logging)
+
 # Bot setup with all necessary intents
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
 intents.moderation = True
 
-class ModerationBot(commands.Bot):
+# Low-memory mode: only the bot itself and members in voice are cached, and guilds
+# aren't chunked at startup. Other members are resolved through bot.member_resolver.
+LOW_MEMORY = bool(config.member_cache.get('low_memory'))
+if LOW_MEMORY:
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+    CACHE_OPTIONS = {'member_cache_flags': member_cache_flags, 'chunk_guilds_at_startup': False}
+else:
+    CACHE_OPTIONS = {}
+
+# Cog extensions in load order
+COGS = [
+    'cogs.moderation',
+    'cogs.admin',
+    'cogs.utility',
+    'cogs.automod',
+    'cogs.settings',
+    'cogs.fun',
+    'cogs.economy',
+    'cogs.social',
+    'cogs.images',
+    'cogs.server_management',
+    'cogs.music'
+]
+
+def sharding_options(sharding: dict) -> dict:
+    """AutoShardedBot arguments from the "sharding" config section"""
+    shard_count = sharding.get('shard_count')
+    shard_ids = sharding.get('shard_ids')
+    if shard_ids is None:
+        # Let Discord recommend a shard count unless one is pinned
+        return {'shard_count': shard_count}
+    if isinstance(shard_ids, str):
+        # "0-3" style range
+        first, _, last = shard_ids.partition('-')
+        shard_ids = list(range(int(first), int(last or first) + 1))
+    if not shard_count:
+        raise ValueError('sharding.shard_count is required when sharding.shard_ids is set')
+    if any(shard_id < 0 or shard_id >= shard_count for shard_id in shard_ids):
+        raise ValueError(f'sharding.shard_ids must be between 0 and {shard_count - 1}')
+    return {'shard_count': shard_count, 'shard_ids': list(shard_ids)}
+
+# Sharding mode: AutoShardedBot runs every shard (or the configured range) in this process
+SHARDED = bool(config.sharding.get('enabled'))
+BaseBot = commands.AutoShardedBot if SHARDED else commands.Bot
+SHARD_OPTIONS = sharding_options(config.sharding) if SHARDED else {}
+
+class ModerationBot(BaseBot):
     def __init__(self):
         super().__init__(
             command_prefix=config.prefix,
             intents=intents,
             help_command=None,
-            case_insensitive=True
+            case_insensitive=True,
+            owner_ids=set(config.owner_ids),
+            # Sent with IDENTIFY, so reconnects don't need a separate presence update
+            activity=discord.Activity(
+                type=discord.ActivityType.watching,
+                name="for rule violations"
+            ),
+            **SHARD_OPTIONS,
+            **CACHE_OPTIONS
         )
         self.config = config
         self.db = None
+        self.db_path = 'moderation.db'
+        self.profiler = startup_profiler
+        self.startup_finished = False
+        self._add_cog_started = None
+        self._connect_started = None
+        self.warmup_started = False
+        self.shard_metrics = ShardMetrics()
+        self.cluster_id = CLUSTER_ID
+        self.ipc = None
+        self.background_tasks = set()
+        self.member_resolver = MemberResolver(
+            maxsize=config.member_cache.get('lru_size', 5000),
+            ttl=config.member_cache.get('ttl', 300)
+        )
+        self.guild_stats = GuildStatsTracker(self.member_resolver, presences=intents.presences)
+        self.role_index = RoleIndex()
+        self.http_session = None
+        self.api_client = None
+        self.scheduler = Scheduler(self)
+    
+    async def login(self, token: str):
+        start = time.perf_counter()
+        await super().login(token)
+        self.profiler.mark('login', start)
         
     async def setup_hook(self):
         """Called when the bot is starting up"""
-        await self.setup_database()
-        await self.load_extensions()
+        with self.profiler.phase('database'):
+            await self.setup_database()
+        # Shared by every cog for outbound HTTP; created before cogs load
+        self.http_session = create_session(self.config.http)
+        self.api_client = ApiClient(self.http_session, self.config.http)
+        with self.profiler.phase('extensions'):
+            await self.load_extensions(include_deferred=False)
+        # Pending timers from before the restart; due ones run once the bot is ready
+        self.scheduler.start()
+        
+        # Cogs set default levels on import; config overrides win
+        apply_log_levels(self.config.logging.get('levels', {}))
+        
+        if IPC_ADDRESS:
+            self.start_ipc(IPC_ADDRESS)
+        
+        if self.config.deferred_cogs:
+            # Don't hold up the gateway connection for rarely used cogs
+            self.run_in_background(self.finish_startup(), 'finish-startup')
+        else:
+            await self.finish_startup()
+        
+        self._connect_started = time.perf_counter()
+    
+    async def finish_startup(self):
+        """Load deferred cogs, then sync slash commands"""
+        deferred = [cog for cog in COGS if cog in self.config.deferred_cogs]
+        if deferred:
+            with self.profiler.phase('deferred_extensions'):
+                for cog in deferred:
+                    await self.load_cog(cog, deferred=True)
+                    # Let gateway events through between cogs
+                    await asyncio.sleep(0)
+        
+        # Sync slash commands (skipped when the tree hasn't changed).
+        # Runs after deferred cogs so their commands are part of the tree.
+        # In a cluster only the first worker syncs; the tree is global.
+        with self.profiler.phase('command_sync'):
+            try:
+                if self.cluster_id:
+                    bot_logger.info(f'Cluster {self.cluster_id}: leaving command sync to cluster 0')
+                elif self.config.dev_guild_ids:
+                    for guild_id in self.config.dev_guild_ids:
+                        await self.sync_commands(guild=discord.Object(guild_id))
+                else:
+                    await self.sync_commands()
+            except Exception as e:
+                bot_logger.error(f'Failed to sync commands: {e}')
+                print(f'Failed to sync commands: {e}')
+        
+        self.startup_finished = True
+        self.write_startup_report()
+    
+    def write_startup_report(self):
+        """Write the startup timeline report and log a summary"""
+        bot_logger.info(self.profiler.summary())
+        try:
+            self.profiler.write_report(self.config.startup_report)
+        except OSError as e:
+            bot_logger.warning(f'Could not write startup report: {e}')
         
     async def setup_database(self):
         """Initialize the database"""
-        self.db = sqlite3.connect('moderation.db')
+        self.db = sqlite3.connect(self.db_path)
         cursor = self.db.cursor()
         
         # Create tables
@@ -123,6 +353,36 @@ class ModerationBot(commands.Bot):
             )
         ''')
         
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS automod_exemptions (
+                guild_id INTEGER,
+                target_id INTEGER,
+                target_type TEXT,
+                PRIMARY KEY (guild_id, target_id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS automod_scores (
+                user_id INTEGER,
+                guild_id INTEGER,
+                score REAL,
+                level INTEGER DEFAULT 0,
+                updated_at REAL,
+                PRIMARY KEY (user_id, guild_id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS auto_slowmode (
+                channel_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
+                min_delay INTEGER DEFAULT 0,
+                max_delay INTEGER DEFAULT 30,
+                threshold INTEGER DEFAULT 60
+            )
+        ''')
+        
         # Economy system tables
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_economy (
@@ -152,91 +412,348 @@ class ModerationBot(commands.Bot):
             )
         ''')
         
+        # Persistent timers (see utils/scheduler.py)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scheduled_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT,
+                guild_id INTEGER,
+                run_at REAL,
+                payload TEXT
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS giveaway_entries (
+                message_id INTEGER,
+                user_id INTEGER,
+                PRIMARY KEY (message_id, user_id)
+            )
+        ''')
+        
+        # @everyone overwrites as they were before a server lockdown
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS lockdown_snapshots (
+                guild_id INTEGER,
+                channel_id INTEGER,
+                allow INTEGER,
+                deny INTEGER,
+                present INTEGER,
+                locked_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (guild_id, channel_id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bot_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
         self.db.commit()
+    
+    def command_tree_hash(self, guild: Optional[discord.abc.Snowflake] = None) -> str:
+        """Hash the payload that tree.sync() would send for the given scope"""
+        payload = [command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda command: (command.get('type', 1), command['name']))
+        serialized = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+    
+    async def sync_commands(self, guild: Optional[discord.abc.Snowflake] = None, force: bool = False) -> Optional[list]:
+        """Sync the command tree if it changed since the last sync.
         
-    async def load_extensions(self):
-        """Load all cog extensions"""
+        With a guild, global commands are copied to that guild first so they
+        show up instantly (useful while developing). Returns the synced
+        commands, or None if the sync was skipped.
+        """
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        
+        key = f"command_tree_hash:{guild.id if guild else 'global'}"
+        tree_hash = self.command_tree_hash(guild)
+        
+        cursor = self.db.cursor()
+        cursor.execute("SELECT value FROM bot_meta WHERE key = ?", (key,))
+        result = cursor.fetchone()
+        
+        if not force and result and result[0] == tree_hash:
+            bot_logger.info(f'Command tree unchanged ({key}), skipping sync')
+            return None
+        
+        synced = await self.tree.sync(guild=guild)
+        cursor.execute("INSERT OR REPLACE INTO bot_meta (key, value) VALUES (?, ?)", (key, tree_hash))
+        self.db.commit()
+        
+        bot_logger.info(f'Successfully synced {len(synced)} slash command(s) ({key})')
+        print(f'Synced {len(synced)} command(s)')
+        return synced
+        
+    async def add_cog(self, cog: commands.Cog, /, **kwargs):
+        # Marks where a cog's module import and construction end, for the startup profiler
+        self._add_cog_started = time.perf_counter()
+        await super().add_cog(cog, **kwargs)
+    
+    async def load_cog(self, cog: str, deferred: bool = False) -> bool:
+        """Load a single cog extension and record its import and setup time"""
+        start = time.perf_counter()
+        self._add_cog_started = None
+        try:
+            await self.load_extension(cog)
+        except Exception as e:
+            self.profiler.record_cog(cog, (time.perf_counter() - start) * 1000, 0, deferred, error=str(e))
+            print(f"❌ Failed to load {cog}: {e}")
+            return False
+        
+        end = time.perf_counter()
+        split = self._add_cog_started or end
+        self.profiler.record_cog(cog, (split - start) * 1000, (end - split) * 1000, deferred)
+        print(f"✅ Loaded {cog} ({(end - start) * 1000:.0f}ms)")
+        return True
+        
+    async def load_extensions(self, include_deferred: bool = True):
+        """Load all cog extensions (optionally skipping the configured deferred cogs)"""
         cogs_to_load = [
-            'cogs.moderation',
-            'cogs.admin',
-            'cogs.utility',
-            'cogs.automod',
-            'cogs.settings',
-            'cogs.fun',
-            'cogs.economy',
-            'cogs.social',
-            'cogs.images',
-            'cogs.server_management',
-            'cogs.music'
+            cog for cog in COGS
+            if include_deferred or cog not in self.config.deferred_cogs
         ]
         
         loaded = 0
         for cog in cogs_to_load:
-            try:
-                await self.load_extension(cog)
+            if await self.load_cog(cog):
                 loaded += 1
-                print(f"✅ Loaded {cog}")
-            except Exception as e:
-                print(f"❌ Failed to load {cog}: {e}")
         
         print(f"Successfully loaded {loaded}/{len(cogs_to_load)} extensions!")
 
     async def on_ready(self):
         """Called when the bot is ready"""
-        bot_logger.info(f'{self.user} has connected to Discord!')
-        bot_logger.info(f'Bot is in {len(self.guilds)} guilds')
+        if self._connect_started is not None:
+            # First READY only; resumes and reconnects don't count towards startup
+            self.profiler.mark('gateway_ready', self._connect_started)
+            self._connect_started = None
+            if self.startup_finished:
+                self.write_startup_report()
+        
+        # One aggregate line instead of one line per guild
+        guilds = self.guilds
+        total_members = sum(guild.member_count or 0 for guild in guilds)
+        largest = heapq.nlargest(5, guilds, key=lambda guild: guild.member_count or 0)
+        largest_info = ", ".join(f"{guild.name} ({guild.id}): {guild.member_count}" for guild in largest)
+        
+        bot_logger.info(f'{self.user} has connected to Discord! Guilds: {len(guilds)}, members: {total_members}, largest: {largest_info or "none"}')
         print(f'{self.user} has connected to Discord!')
-        print(f'Bot is in {len(self.guilds)} guilds')
+        print(f'Bot is in {len(guilds)} guilds with {total_members} members')
         
-        # Log guild information
-        for guild in self.guilds:
-            bot_logger.info(f'Connected to guild: {guild.name} (ID: {guild.id}, Members: {guild.member_count})')
+        # Per-guild cache warmup runs once, in the background
+        if not self.warmup_started:
+            self.warmup_started = True
+            self.run_in_background(self.warm_guild_caches(), 'warm-guild-caches')
+    
+    async def warm_guild_caches(self, batch_size: int = 250):
+        """Hand guilds to cogs in small batches for low-priority cache warmup"""
+        guilds = list(self.guilds)
+        start = time.perf_counter()
         
-        # Sync slash commands
-        try:
-            synced = await self.tree.sync()
-            bot_logger.info(f'Successfully synced {len(synced)} slash command(s)')
-            print(f'Synced {len(synced)} command(s)')
-        except Exception as e:
-            bot_logger.error(f'Failed to sync commands: {e}')
-            print(f'Failed to sync commands: {e}')
-            
-        # Set bot status
-        await self.change_presence(
-            activity=discord.Activity(
-                type=discord.ActivityType.watching,
-                name="for rule violations"
-            )
-        )
-        bot_logger.info('Bot status set to "Watching for rule violations"')
+        for i in range(0, len(guilds), batch_size):
+            # Listeners (on_guild_warmup) run as their own tasks
+            self.dispatch('guild_warmup', guilds[i:i + batch_size])
+            # Give gateway events and commands priority between batches
+            await asyncio.sleep(0.1)
+        
+        bot_logger.info(f'Dispatched cache warmup for {len(guilds)} guilds in {(time.perf_counter() - start) * 1000:.0f}ms')
+    
+    async def on_guild_warmup(self, guilds: list):
+        """Build member counters and the role index once for guilds that are already chunked"""
+        for guild in guilds:
+            if not guild.chunked:
+                continue
+            if guild.id not in self.guild_stats.guilds:
+                self.guild_stats.initialize(guild.id, guild.members)
+            if guild.id not in self.role_index.guilds:
+                self.role_index.build(guild)
+            # One pass per guild, then let other events through
+            await asyncio.sleep(0)
+    
+    def start_ipc(self, address: str):
+        """Connect to the cluster launcher's IPC hub"""
+        self.ipc = IPCClient(address, self.cluster_id)
+        self.ipc.on_query('stats', self.ipc_stats)
+        for event in IPC_RELAYED_EVENTS:
+            self.ipc.on_event(event, lambda args, event=event: self.dispatch_local(event, *args))
+        self.ipc.start()
+    
+    async def ipc_stats(self, data=None) -> dict:
+        """This worker's share of the cluster-wide /botinfo numbers"""
+        return {
+            'cluster': self.cluster_id,
+            'shards': [row[0] for row in self.shard_report()],
+            'guilds': len(self.guilds),
+            'users': sum(guild.member_count or 0 for guild in self.guilds)
+        }
+    
+    async def cluster_stats(self) -> list:
+        """Stats from every cluster worker, or just this process when not clustered"""
+        if self.ipc is not None and self.ipc.connected:
+            try:
+                stats = await self.ipc.query('stats', timeout=1.5)
+                if stats:
+                    return stats
+            except (ConnectionError, asyncio.TimeoutError):
+                bot_logger.warning('Cluster stats query failed; showing local stats')
+        return [await self.ipc_stats()]
+    
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        super().dispatch(event_name, *args, **kwargs)
+        if self.ipc is not None and event_name in IPC_RELAYED_EVENTS:
+            # e.g. settings changed here: other workers drop their cached copy too
+            self.run_in_background(self.relay(event_name, list(args)), f'relay-{event_name}')
+    
+    def dispatch_local(self, event_name: str, *args):
+        """Dispatch an event received from another worker without relaying it again"""
+        super().dispatch(event_name, *args)
+    
+    async def relay(self, event_name: str, args: list):
+        if not await self.ipc.broadcast(event_name, args):
+            bot_logger.warning(f'IPC disconnected: {event_name} was not relayed to the other clusters')
+    
+    def run_in_background(self, coro, name: str) -> asyncio.Task:
+        """Start a task the bot keeps a reference to until it finishes; failures are logged"""
+        task = asyncio.create_task(coro, name=name)
+        self.background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+    
+    def _background_task_done(self, task: asyncio.Task):
+        self.background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            error_logger.error(f'Background task {task.get_name()} failed', exc_info=task.exception())
+    
+    async def close(self):
+        self.scheduler.stop()
+        if self.ipc is not None:
+            await self.ipc.close()
+        await super().close()
+        if self.http_session is not None:
+            await self.http_session.close()
+    
+    def shard_latencies(self) -> list:
+        """(shard_id, latency) pairs; a single shard 0 when not sharded"""
+        if SHARDED:
+            return self.latencies
+        return [(0, self.latency)]
+    
+    def shard_report(self) -> list:
+        """Per-shard rows of (shard_id, latency_ms, events/min, reconnects), busiest first"""
+        return self.shard_metrics.snapshot(self.shard_latencies())
+    
+    async def on_connect(self):
+        if not SHARDED:
+            self.shard_metrics.record_connect(0)
+    
+    async def on_resumed(self):
+        if not SHARDED:
+            self.shard_metrics.record_resume(0)
+    
+    async def on_disconnect(self):
+        if not SHARDED:
+            self.shard_metrics.record_disconnect(0)
+    
+    async def on_shard_connect(self, shard_id: int):
+        self.shard_metrics.record_connect(shard_id)
+    
+    async def on_shard_resumed(self, shard_id: int):
+        self.shard_metrics.record_resume(shard_id)
+        bot_logger.info(f'Shard {shard_id} resumed')
+    
+    async def on_shard_disconnect(self, shard_id: int):
+        self.shard_metrics.record_disconnect(shard_id)
+        bot_logger.warning(f'Shard {shard_id} disconnected')
+    
+    async def on_interaction(self, interaction: discord.Interaction):
+        self.shard_metrics.record_event(interaction.guild.shard_id if interaction.guild else 0)
     
     async def on_command(self, ctx):
         """Log when a prefix command is used"""
-        bot_logger.info(f'Prefix command used: {ctx.command.name} by {ctx.author} ({ctx.author.id}) in {ctx.guild.name if ctx.guild else "DM"}')
+        log_event(
+            bot_logger, 'prefix_command', 'Prefix command used: %s by %s (%s) in %s',
+            ctx.command.name, ctx.author, ctx.author.id, ctx.guild.name if ctx.guild else "DM",
+            command=ctx.command.name, user_id=ctx.author.id, guild_id=ctx.guild.id if ctx.guild else None
+        )
     
     async def on_app_command_completion(self, interaction: discord.Interaction, command: Union[app_commands.Command, app_commands.ContextMenu]):
         """Log when a slash command is completed"""
-        guild_info = f"{interaction.guild.name} ({interaction.guild.id})" if interaction.guild else "DM"
-        bot_logger.info(f'Slash command completed: /{command.name} by {interaction.user} ({interaction.user.id}) in {guild_info}')
+        latency_ms = (discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000
+        log_event(
+            bot_logger, 'slash_command', 'Slash command completed: /%s by %s (%s) in %s (%s) after %.0fms',
+            command.name, interaction.user, interaction.user.id,
+            interaction.guild.name if interaction.guild else "DM", interaction.guild_id, latency_ms,
+            command=command.name, user_id=interaction.user.id, guild_id=interaction.guild_id,
+            latency_ms=round(latency_ms, 1)
+        )
     
     async def on_member_join(self, member):
         """Log when a member joins"""
-        bot_logger.info(f'Member joined: {member} ({member.id}) in {member.guild.name} ({member.guild.id})')
+        self.shard_metrics.record_event(member.guild.shard_id)
+        self.guild_stats.member_joined(member)
+        self.role_index.member_joined(member)
+        log_event(
+            bot_logger, 'member_join', 'Member joined: %s (%s) in %s (%s)',
+            member, member.id, member.guild.name, member.guild.id,
+            user_id=member.id, guild_id=member.guild.id
+        )
     
     async def on_member_remove(self, member):
         """Log when a member leaves"""
-        bot_logger.info(f'Member left: {member} ({member.id}) from {member.guild.name} ({member.guild.id})')
+        self.shard_metrics.record_event(member.guild.shard_id)
+        log_event(
+            bot_logger, 'member_remove', 'Member left: %s (%s) from %s (%s)',
+            member, member.id, member.guild.name, member.guild.id,
+            user_id=member.id, guild_id=member.guild.id
+        )
+    
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        self.member_resolver.forget(payload.guild_id, payload.user.id)
+        self.guild_stats.member_left(payload.guild_id, payload.user)
+        self.role_index.member_left(payload.guild_id, payload.user.id)
+    
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before._roles != after._roles:
+            self.role_index.member_updated(before, after)
+    
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.role_index.role_deleted(role)
+    
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        self.guild_stats.status_changed(before, after)
+    
+    async def on_guild_available(self, guild):
+        # Jobs that came due during the outage run now
+        self.scheduler.guild_available(guild.id)
     
     async def on_guild_join(self, guild):
         """Log when bot joins a guild"""
-        bot_logger.info(f'Bot joined new guild: {guild.name} ({guild.id}) with {guild.member_count} members')
+        log_event(
+            bot_logger, 'guild_join', 'Bot joined new guild: %s (%s) with %s members',
+            guild.name, guild.id, guild.member_count,
+            guild_id=guild.id, member_count=guild.member_count
+        )
     
     async def on_guild_remove(self, guild):
         """Log when bot leaves a guild"""
-        bot_logger.info(f'Bot removed from guild: {guild.name} ({guild.id})')
+        self.member_resolver.forget_guild(guild.id)
+        self.guild_stats.drop(guild.id)
+        self.role_index.drop(guild.id)
+        self.scheduler.drop_guild(guild.id)
+        log_event(
+            bot_logger, 'guild_remove', 'Bot removed from guild: %s (%s)',
+            guild.name, guild.id,
+            guild_id=guild.id
+        )
     
     async def on_message(self, message):
         """Log automod actions and process commands"""
+        self.shard_metrics.record_event(message.guild.shard_id if message.guild else 0)
+        
         # Don't log bot messages to avoid spam
         if message.author.bot:
             return
@@ -246,7 +763,11 @@ class ModerationBot(commands.Bot):
             # Only log if message triggers automod or contains certain keywords
             content_lower = message.content.lower()
             if any(word in content_lower for word in ['spam', 'raid', 'discord.gg/', 'http']):
-                bot_logger.info(f'Potentially flagged message by {message.author} ({message.author.id}) in #{message.channel.name}: "{message.content[:50]}..."')
+                log_event(
+                    bot_logger, 'flagged_message', 'Potentially flagged message by %s (%s) in #%s: "%s..."',
+                    message.author, message.author.id, message.channel, message.content[:50],
+                    user_id=message.author.id, guild_id=message.guild.id, channel_id=message.channel.id
+                )
         
         await self.process_commands(message)
     
@@ -325,7 +846,7 @@ class HelpView(discord.ui.View):
         )
         moderation.add_field(
             name="🔐 Advanced Moderation",
-            value="• `/softban` - Softban a user (ban + unban)\n• `/massban` - Ban multiple users\n• `/lockdown` - Lock down channels\n• `/mute` - Mute a user\n• `/unmute` - Unmute a user",
+            value="• `/softban` - Softban a user (ban + unban)\n• `/massban` - Ban multiple users\n• `/lockdown` - Lock down (or `end:True` to lift) the server\n• `/mute` - Mute a user\n• `/unmute` - Unmute a user",
             inline=False
         )
         pages.append(moderation)
@@ -440,7 +961,7 @@ class HelpView(discord.ui.View):
         )
         server.add_field(
             name="👥 Role Management",
-            value="• `/createrole` - Create new roles\n• `/deleterole` - Delete roles\n• `/roleinfo` - Role information",
+            value="• `/createrole` - Create new roles\n• `/deleterole` - Delete roles\n• `/roleinfo` - Role information\n• `/removerole mode:members` - Remove a role from everyone",
             inline=False
         )
         server.add_field(
@@ -518,6 +1039,22 @@ async def help_command(interaction: discord.Interaction):
     embed = view.get_current_embed()
     await interaction.response.send_message(embed=embed, view=view)
 
+@bot.command(name="sync", hidden=True)
+@commands.is_owner()
+async def sync_command(ctx: commands.Context, scope: Optional[str] = None):
+    """Force a slash command sync (owner only).
+
+    ``!sync`` syncs globally, ``!sync guild`` syncs to the current guild
+    for development.
+    """
+    guild = ctx.guild if scope == "guild" and ctx.guild else None
+    try:
+        synced = await bot.sync_commands(guild=guild, force=True)
+        target = f"guild {guild.name}" if guild else "global scope"
+        await ctx.send(embed=EmbedBuilder.success("Commands Synced", f"Synced {len(synced)} command(s) to {target}."))
+    except Exception as e:
+        await ctx.send(embed=EmbedBuilder.error("Sync Failed", str(e)))
+
 # Global error handler
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
@@ -613,4 +1150,5 @@ if __name__ == "__main__":
     if not config.token or config.token == "YOUR_BOT_TOKEN_HERE":
         print("Please configure your bot token in config.json!")
     else:
-        bot.run(config.token)
+        # log_handler=None keeps discord.py from installing its own handler over our queue pipeline
+        bot.run(config.token, log_handler=None)
@@ -0,0 +1,32 @@
+"""Every cog loads into the real bot, within Discord's global command limit"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import main
+from utils.http import ApiClient, create_session
+
+# Discord rejects more than this many global slash commands
+GLOBAL_COMMAND_LIMIT = 100
+
+def test_every_cog_loads_within_command_limit():
+    async def run():
+        # The module-level bot, which also carries /help
+        bot = main.bot
+        bot.db_path = ':memory:'
+        await bot.setup_database()
+        bot.http_session = create_session(bot.config.http)
+        bot.api_client = ApiClient(bot.http_session, bot.config.http)
+        try:
+            failed = [cog for cog in main.COGS if not await bot.load_cog(cog)]
+            assert failed == []
+            assert len(bot.tree.get_commands()) <= GLOBAL_COMMAND_LIMIT
+        finally:
+            for cog in main.COGS:
+                if cog in bot.extensions:
+                    await bot.unload_extension(cog)
+            await bot.http_session.close()
+            bot.db.close()
+    asyncio.run(run())
@@ -0,0 +1,145 @@
+"""Unit tests for the outbound HTTP client (utils/http.py)"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import aiohttp
+from utils.http import ApiClient, CircuitBreaker, CircuitOpenError
+
+class FakeResponse:
+    def __init__(self, status: int, body: str):
+        self.status = status
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return json.loads(self.body)
+
+class FakeSession:
+    """Answers every GET with the next queued (status, body), after a short delay"""
+
+    def __init__(self, *responses, delay: float = 0.01):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        session = self
+
+        class Request:
+            async def __aenter__(self):
+                await asyncio.sleep(session.delay)
+                outcome = session.responses.pop(0) if len(session.responses) > 1 else session.responses[0]
+                if isinstance(outcome, Exception):
+                    raise outcome
+                return FakeResponse(*outcome)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+def test_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+def test_breaker_half_open_probe_outcomes():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_identical_gets_are_coalesced():
+    async def run():
+        session = FakeSession((200, '{"url": "x"}'))
+        client = ApiClient(session)
+        results = await asyncio.gather(*(client.get_json('https://api.example/a') for _ in range(10)))
+        await client.get_json('https://api.example/b')
+        return session, client, results
+
+    session, client, results = asyncio.run(run())
+    assert session.calls == 2
+    assert results == [{'url': 'x'}] * 10
+    assert client.hosts['api.example'].coalesced == 9
+
+def test_open_circuit_fails_fast():
+    async def run():
+        session = FakeSession((503, ''))
+        client = ApiClient(session, {'breaker_failures': 2, 'breaker_reset': 60})
+        assert await client.get_json('https://down.example/') is None
+        assert await client.get_json('https://down.example/') is None
+        try:
+            await client.get_json('https://down.example/')
+        except CircuitOpenError:
+            return session.calls
+        raise AssertionError('expected CircuitOpenError')
+
+    assert asyncio.run(run()) == 2
+
+def test_bad_json_probe_releases_breaker():
+    async def run():
+        session = FakeSession(aiohttp.ClientError(), (200, 'not json'), (200, '{"ok": true}'))
+        client = ApiClient(session, {'breaker_failures': 1, 'breaker_reset': 0})
+        for _ in range(2):
+            try:
+                await client.get_json('https://flaky.example/')
+            except (aiohttp.ClientError, ValueError):
+                pass
+        assert client.breaker('flaky.example').state == CircuitBreaker.OPEN
+        # The failed probe must not leave the breaker stuck half-open
+        return await client.get_json('https://flaky.example/')
+
+    assert asyncio.run(run()) == {'ok': True}
+
+def test_cancelled_probe_releases_breaker():
+    async def run():
+        session = FakeSession((200, '{"ok": true}'), delay=1)
+        client = ApiClient(session, {'breaker_failures': 1, 'breaker_reset': 0})
+        client.breaker('slow.example').record_failure()
+        request = asyncio.ensure_future(client.get_json('https://slow.example/'))
+        await asyncio.sleep(0.05)
+        client.inflight[('https://slow.example/', '[]')].cancel()
+        try:
+            await request
+        except asyncio.CancelledError:
+            pass
+        return client.breaker('slow.example')
+
+    breaker = asyncio.run(run())
+    assert not breaker.probing
+    assert breaker.allow()
@@ -0,0 +1,75 @@
+"""Unit tests for on-demand member lookups (utils/member_cache.py)"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.member_cache import MemberResolver
+
+class FakeMember:
+    def __init__(self, user_id: int, guild):
+        self.id = user_id
+        self.guild = guild
+
+class FakeGuild:
+    """Members 1..count; only ``cached_ids`` are in the gateway cache"""
+
+    def __init__(self, count: int, cached_ids=(), chunked: bool = False, timeout_batches=()):
+        self.id = 1
+        self.count = count
+        self.cached_ids = set(cached_ids)
+        self.chunked = chunked
+        self.timeout_batches = set(timeout_batches)
+        self.queries = []
+        self.fetches = 0
+
+    def get_member(self, user_id):
+        return FakeMember(user_id, self) if user_id in self.cached_ids else None
+
+    async def fetch_member(self, user_id):
+        self.fetches += 1
+        return FakeMember(user_id, self)
+
+    async def query_members(self, *, user_ids, limit, cache):
+        assert len(user_ids) <= 100 and cache is False
+        self.queries.append(list(user_ids))
+        batch = len(self.queries)
+        await asyncio.sleep(0)
+        if batch in self.timeout_batches:
+            raise asyncio.TimeoutError
+        return [FakeMember(user_id, self) for user_id in user_ids if user_id <= self.count]
+
+def test_chunked_guild_misses_are_not_members():
+    async def main():
+        guild = FakeGuild(1000, cached_ids=[1, 2], chunked=True)
+        resolver = MemberResolver()
+        assert await resolver.get(guild, 5) is None
+        found = await resolver.get_many(guild, [1, 2, 5, 6])
+        assert [user_id for user_id, member in found.items() if member] == [1, 2]
+        assert guild.fetches == 0 and guild.queries == []
+    asyncio.run(main())
+
+def test_get_many_batches_gateway_queries():
+    async def main():
+        guild = FakeGuild(300, cached_ids=[1])
+        resolver = MemberResolver()
+        # 1 is cached; 2..250 are queried in batches; 900.. aren't members
+        found = await resolver.get_many(guild, list(range(1, 251)) + list(range(900, 1000)))
+        assert guild.fetches == 0
+        assert [len(batch) for batch in guild.queries] == [100, 100, 100, 49]
+        assert all(found[user_id] is not None for user_id in range(1, 251))
+        assert all(found[user_id] is None for user_id in range(900, 1000))
+        # Looked-up members are remembered
+        again = await resolver.get_many(guild, [2, 3])
+        assert all(again.values()) and len(guild.queries) == 4
+    asyncio.run(main())
+
+def test_timed_out_batch_does_not_abort():
+    async def main():
+        guild = FakeGuild(300, timeout_batches=[1])
+        resolver = MemberResolver()
+        found = await resolver.get_many(guild, range(1, 201))
+        resolved = [user_id for user_id, member in found.items() if member is not None]
+        assert len(found) == 200 and len(resolved) == 100
+    asyncio.run(main())
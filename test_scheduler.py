@@ -0,0 +1,244 @@
+"""Unit tests for the persistent job scheduler (utils/scheduler.py)"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import discord
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import scheduler as scheduler_module
+from utils.scheduler import Scheduler
+
+def make_db() -> sqlite3.Connection:
+    db = sqlite3.connect(':memory:')
+    db.execute('''
+        CREATE TABLE scheduled_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT,
+            guild_id INTEGER,
+            run_at REAL,
+            payload TEXT
+        )
+    ''')
+    return db
+
+class FakeGuild:
+    def __init__(self, unavailable: bool = False):
+        self.unavailable = unavailable
+
+class FakeBot:
+    def __init__(self, db, guild_ids=()):
+        self.db = db
+        self.guilds = {guild_id: FakeGuild() for guild_id in guild_ids}
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_guild(self, guild_id):
+        return self.guilds.get(guild_id)
+
+def rows(db) -> list:
+    return db.execute("SELECT id, kind FROM scheduled_jobs ORDER BY id").fetchall()
+
+async def settle(scheduler: Scheduler, seconds: float = 0.1):
+    """Run the dispatcher for a moment"""
+    scheduler.start()
+    await asyncio.sleep(seconds)
+    scheduler.stop()
+
+def test_load_runs_overdue_jobs_in_order():
+    async def main():
+        db = make_db()
+        now = time.time()
+        # Inserted out of order; two came due while the bot was down
+        for kind, run_at in [('b', now - 10), ('c', now + 3600), ('a', now - 60)]:
+            db.execute("INSERT INTO scheduled_jobs (kind, guild_id, run_at, payload) VALUES (?, NULL, ?, '{}')", (kind, run_at))
+        db.commit()
+        ran = []
+        scheduler = Scheduler(FakeBot(db))
+        for kind in 'abc':
+            scheduler.register(kind, lambda payload, kind=kind: asyncio.sleep(0, ran.append(kind)))
+        await settle(scheduler)
+        assert ran == ['a', 'b']
+        assert [kind for _, kind in rows(db)] == ['c']
+    asyncio.run(main())
+
+def test_sooner_job_wakes_dispatcher():
+    async def main():
+        db = make_db()
+        ran = []
+        scheduler = Scheduler(FakeBot(db))
+        scheduler.register('job', lambda payload: asyncio.sleep(0, ran.append(payload['n'])))
+        scheduler.schedule('job', datetime.utcnow() + timedelta(hours=1), {'n': 1})
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        scheduler.schedule('job', datetime.utcnow(), {'n': 2})
+        await asyncio.sleep(0.05)
+        scheduler.stop()
+        assert ran == [2]
+        assert len(rows(db)) == 1
+    asyncio.run(main())
+
+def test_cancel_drops_matching_jobs():
+    async def main():
+        db = make_db()
+        ran = []
+        scheduler = Scheduler(FakeBot(db, guild_ids=[1, 2]))
+        scheduler.register('expiry', lambda payload: asyncio.sleep(0, ran.append(payload['channel'])))
+        now = datetime.utcnow()
+        scheduler.schedule('expiry', now, {'channel': 10}, guild_id=1)
+        scheduler.schedule('expiry', now, {'channel': 11}, guild_id=1)
+        scheduler.schedule('expiry', now, {'channel': 20}, guild_id=2)
+        assert scheduler.cancel('expiry', guild_id=1, channel=11) == 1
+        assert scheduler.cancel('expiry', guild_id=3) == 0
+        await settle(scheduler)
+        assert sorted(ran) == [10, 20]
+        assert rows(db) == []
+    asyncio.run(main())
+
+def test_jobs_wait_for_deferred_handler():
+    async def main():
+        db = make_db()
+        ran = []
+        scheduler = Scheduler(FakeBot(db))
+        scheduler.schedule('late', datetime.utcnow(), {})
+        await settle(scheduler)
+        assert ran == [] and len(rows(db)) == 1
+        scheduler.register('late', lambda payload: asyncio.sleep(0, ran.append('late')))
+        await settle(scheduler)
+        assert ran == ['late'] and rows(db) == []
+    asyncio.run(main())
+
+def test_failed_job_is_kept_and_retried(monkeypatch):
+    async def main():
+        db = make_db()
+        calls = []
+
+        async def flaky(payload):
+            calls.append(time.time())
+            if len(calls) < 3:
+                raise RuntimeError('channel still locked')
+
+        scheduler = Scheduler(FakeBot(db))
+        scheduler.register('flaky', flaky)
+        job_id = scheduler.schedule('flaky', datetime.utcnow(), {})
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        # First failure: row kept and pushed back by RETRY_BASE
+        assert len(calls) == 1 and job_id in scheduler.jobs
+        run_at = db.execute("SELECT run_at FROM scheduled_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        assert run_at == scheduler.jobs[job_id][2]
+        assert 0 < run_at - calls[0] <= 0.2
+        await asyncio.sleep(0.6)
+        scheduler.stop()
+        assert len(calls) == 3
+        assert calls[2] - calls[1] > calls[1] - calls[0]  # backoff grows
+        assert rows(db) == [] and job_id not in scheduler.attempts
+    monkeypatch.setattr(scheduler_module, 'RETRY_BASE', 0.1)
+    asyncio.run(main())
+
+def test_job_cancelled_while_running_is_not_retried():
+    async def main():
+        db = make_db()
+        scheduler = Scheduler(FakeBot(db))
+
+        async def fail(payload):
+            scheduler.cancel('job')
+            raise RuntimeError('boom')
+
+        scheduler.register('job', fail)
+        scheduler.schedule('job', datetime.utcnow(), {})
+        await settle(scheduler)
+        assert scheduler.jobs == {} and rows(db) == []
+    asyncio.run(main())
+
+def test_jobs_for_left_guilds_are_deleted():
+    async def main():
+        db = make_db()
+        ran = []
+        bot = FakeBot(db, guild_ids=[1])
+        scheduler = Scheduler(bot)
+        scheduler.register('job', lambda payload: asyncio.sleep(0, ran.append(payload['n'])))
+        scheduler.schedule('job', datetime.utcnow(), {'n': 1}, guild_id=1)
+        scheduler.schedule('job', datetime.utcnow(), {'n': 2}, guild_id=2)
+        scheduler.schedule('job', datetime.utcnow() + timedelta(hours=1), {'n': 3}, guild_id=1)
+        await settle(scheduler)
+        assert ran == [1] and len(rows(db)) == 1
+        scheduler.drop_guild(1)
+        assert scheduler.jobs == {} and rows(db) == []
+    asyncio.run(main())
+
+def test_jobs_for_other_shards_are_left_alone():
+    async def main():
+        db = make_db()
+        bot = FakeBot(db)
+        bot.shard_count, bot.shard_ids = 2, [0]
+        scheduler = Scheduler(bot)
+        scheduler.register('job', lambda payload: asyncio.sleep(0))
+        # Shard 1 of 2, which another worker runs
+        scheduler.schedule('job', datetime.utcnow(), {}, guild_id=1 << 22)
+        await settle(scheduler)
+        assert scheduler.jobs == {} and len(rows(db)) == 1
+    asyncio.run(main())
+
+def test_jobs_for_unavailable_guilds_wait_for_it():
+    async def main():
+        db = make_db()
+        ran = []
+        bot = FakeBot(db)
+        bot.guilds[1] = FakeGuild(unavailable=True)
+        scheduler = Scheduler(bot)
+        scheduler.register('job', lambda payload: asyncio.sleep(0, ran.append(1)))
+        scheduler.schedule('job', datetime.utcnow(), {}, guild_id=1)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert ran == [] and len(rows(db)) == 1
+        bot.guilds[1].unavailable = False
+        scheduler.guild_available(1)
+        await asyncio.sleep(0.05)
+        scheduler.stop()
+        assert ran == [1] and rows(db) == []
+    asyncio.run(main())
+
+class FakeResponse:
+    status = 403
+    reason = 'Forbidden'
+
+def test_failed_job_gives_up_after_max_attempts(monkeypatch):
+    async def main():
+        db = make_db()
+        calls = []
+
+        async def broken(payload):
+            calls.append(1)
+            raise RuntimeError('still broken')
+
+        scheduler = Scheduler(FakeBot(db))
+        scheduler.register('broken', broken)
+        scheduler.schedule('broken', datetime.utcnow(), {})
+        await settle(scheduler, 0.3)
+        assert len(calls) == 3
+        assert scheduler.jobs == {} and rows(db) == [] and not scheduler.attempts
+    monkeypatch.setattr(scheduler_module, 'RETRY_BASE', 0.01)
+    monkeypatch.setattr(scheduler_module, 'MAX_ATTEMPTS', 3)
+    asyncio.run(main())
+
+def test_forbidden_is_not_retried():
+    async def main():
+        db = make_db()
+        calls = []
+
+        async def forbidden(payload):
+            calls.append(1)
+            raise discord.Forbidden(FakeResponse(), 'Missing Permissions')
+
+        scheduler = Scheduler(FakeBot(db))
+        scheduler.register('job', forbidden)
+        scheduler.schedule('job', datetime.utcnow(), {})
+        await settle(scheduler)
+        assert calls == [1] and rows(db) == []
+    asyncio.run(main())
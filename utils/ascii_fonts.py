@@ -0,0 +1,68 @@
+"""Glyph tables for /ascii banners"""
+
+# 4-row block letters (the original /ascii font)
+BLOCK = {
+    'A': ['  ▄▀█  ', ' █▀▀█  ', ' █▄▄█  ', ' ▀  ▀  '],
+    'B': [' █▀▀▄  ', ' █▀▀▄  ', ' █▄▄▀  ', '       '],
+    'C': [' ▄▀█▀▄ ', ' █     ', ' ▀▄█▄▀ ', '       '],
+    'D': [' █▀▀▄  ', ' █   █ ', ' █▄▄▀  ', '       '],
+    'E': [' █▀▀▀  ', ' █▀▀   ', ' █▄▄▄  ', '       '],
+    'H': [' █   █ ', ' █▀▀▀█ ', ' █   █ ', '       '],
+    'I': [' ▀█▀   ', '  █    ', ' ▄█▄   ', '       '],
+    'L': [' █     ', ' █     ', ' █▄▄▄  ', '       '],
+    'O': [' ▄▀█▀▄ ', ' █   █ ', ' ▀▄█▄▀ ', '       '],
+    'R': [' █▀▀▄  ', ' █▀▀▄  ', ' █  ▀▄ ', '       '],
+    'S': [' ▄▀▀▀▄ ', ' ▀▀▀▄  ', ' ▄▄▄▀  ', '       '],
+    'T': [' ▀▀█▀▀ ', '   █   ', '   █   ', '       '],
+    'U': [' █   █ ', ' █   █ ', ' ▀▄▄▄▀ ', '       '],
+    ' ': ['       ', '       ', '       ', '       ']
+}
+BLOCK_FALLBACK = [' █████ '] * 4
+
+# 5x5 bitmaps ('#' = set) used by the pixel and banner fonts
+BITMAP = {
+    'A': ['.###.', '#...#', '#####', '#...#', '#...#'],
+    'B': ['####.', '#...#', '####.', '#...#', '####.'],
+    'C': ['.####', '#....', '#....', '#....', '.####'],
+    'D': ['####.', '#...#', '#...#', '#...#', '####.'],
+    'E': ['#####', '#....', '####.', '#....', '#####'],
+    'F': ['#####', '#....', '####.', '#....', '#....'],
+    'G': ['.####', '#....', '#..##', '#...#', '.###.'],
+    'H': ['#...#', '#...#', '#####', '#...#', '#...#'],
+    'I': ['#####', '..#..', '..#..', '..#..', '#####'],
+    'J': ['..###', '...#.', '...#.', '#..#.', '.##..'],
+    'K': ['#...#', '#..#.', '###..', '#..#.', '#...#'],
+    'L': ['#....', '#....', '#....', '#....', '#####'],
+    'M': ['#...#', '##.##', '#.#.#', '#...#', '#...#'],
+    'N': ['#...#', '##..#', '#.#.#', '#..##', '#...#'],
+    'O': ['.###.', '#...#', '#...#', '#...#', '.###.'],
+    'P': ['####.', '#...#', '####.', '#....', '#....'],
+    'Q': ['.###.', '#...#', '#.#.#', '#..#.', '.##.#'],
+    'R': ['####.', '#...#', '####.', '#..#.', '#...#'],
+    'S': ['.####', '#....', '.###.', '....#', '####.'],
+    'T': ['#####', '..#..', '..#..', '..#..', '..#..'],
+    'U': ['#...#', '#...#', '#...#', '#...#', '.###.'],
+    'V': ['#...#', '#...#', '#...#', '.#.#.', '..#..'],
+    'W': ['#...#', '#...#', '#.#.#', '##.##', '#...#'],
+    'X': ['#...#', '.#.#.', '..#..', '.#.#.', '#...#'],
+    'Y': ['#...#', '.#.#.', '..#..', '..#..', '..#..'],
+    'Z': ['#####', '...#.', '..#..', '.#...', '#####'],
+    '0': ['.###.', '#..##', '#.#.#', '##..#', '.###.'],
+    '1': ['..#..', '.##..', '..#..', '..#..', '.###.'],
+    '2': ['.###.', '#...#', '..##.', '.#...', '#####'],
+    '3': ['####.', '....#', '.###.', '....#', '####.'],
+    '4': ['#..#.', '#..#.', '#####', '...#.', '...#.'],
+    '5': ['#####', '#....', '####.', '....#', '####.'],
+    '6': ['.###.', '#....', '####.', '#...#', '.###.'],
+    '7': ['#####', '...#.', '..#..', '.#...', '.#...'],
+    '8': ['.###.', '#...#', '.###.', '#...#', '.###.'],
+    '9': ['.###.', '#...#', '.####', '....#', '.###.'],
+    '!': ['..#..', '..#..', '..#..', '.....', '..#..'],
+    '?': ['.###.', '#...#', '..##.', '.....', '..#..'],
+    '.': ['.....', '.....', '.....', '.....', '..#..'],
+    '-': ['.....', '.....', '.###.', '.....', '.....'],
+    ' ': ['.....', '.....', '.....', '.....', '.....']
+}
+BITMAP_FALLBACK = ['#####'] * 5
+
+FONTS = ['block', 'pixel', 'banner']
@@ -0,0 +1,89 @@
+from collections import Counter
+from typing import Iterable, Optional
+
+import discord
+
+class GuildStats:
+    """Member counters for one guild: by status (None when untracked), and bots vs humans"""
+
+    __slots__ = ('statuses', 'bots', 'humans')
+
+    def __init__(self, track_status: bool = True):
+        self.statuses = Counter() if track_status else None
+        self.bots = 0
+        self.humans = 0
+
+    def add(self, member, sign: int = 1):
+        if self.statuses is not None:
+            status = getattr(member, 'status', discord.Status.offline)
+            self.statuses[status] += sign
+        if member.bot:
+            self.bots += sign
+        else:
+            self.humans += sign
+
+    def status_count(self, status: discord.Status) -> int:
+        return max(0, self.statuses[status])
+
+    @property
+    def online(self) -> int:
+        """Members not offline (online, idle or dnd)"""
+        return sum(count for status, count in self.statuses.items() if status != discord.Status.offline and count > 0)
+
+class GuildStatsTracker:
+    """Per-guild member counters kept up to date from gateway events.
+
+    Counters are built with one pass over the member list the first time a
+    guild is seen (after chunking, or from an on-demand chunk in low-memory
+    mode) and then adjusted on join, leave and presence updates.
+
+    Statuses are only counted with ``presences=True``: without the presences
+    intent there are no presence updates and every member reads as offline.
+    """
+
+    def __init__(self, resolver=None, presences: bool = False):
+        self.resolver = resolver
+        self.presences = presences
+        self.guilds = {}
+
+    def initialize(self, guild_id: int, members: Iterable):
+        stats = GuildStats(track_status=self.presences)
+        for member in members:
+            stats.add(member)
+        self.guilds[guild_id] = stats
+        return stats
+
+    def get(self, guild: discord.Guild) -> Optional[GuildStats]:
+        """Counters for the guild, or None if it still needs an on-demand chunk"""
+        stats = self.guilds.get(guild.id)
+        if stats is None and guild.chunked:
+            stats = self.initialize(guild.id, guild.members)
+        return stats
+
+    async def stats_for(self, guild: discord.Guild) -> GuildStats:
+        stats = self.get(guild)
+        if stats is None:
+            members = await self.resolver.guild_members(guild)
+            # A concurrent caller may have finished first
+            stats = self.guilds.get(guild.id) or self.initialize(guild.id, members)
+        return stats
+
+    def member_joined(self, member: discord.Member):
+        stats = self.guilds.get(member.guild.id)
+        if stats is not None:
+            stats.add(member)
+
+    def member_left(self, guild_id: int, user):
+        # A plain User (uncached member) has no status; it was most likely counted as offline
+        stats = self.guilds.get(guild_id)
+        if stats is not None:
+            stats.add(user, -1)
+
+    def status_changed(self, before: discord.Member, after: discord.Member):
+        stats = self.guilds.get(after.guild.id)
+        if stats is not None and stats.statuses is not None and before.status != after.status:
+            stats.statuses[before.status] -= 1
+            stats.statuses[after.status] += 1
+
+    def drop(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import aiohttp
+
+DEFAULT_HTTP_CONFIG = {
+    "limit": 100,
+    "limit_per_host": 10,
+    "dns_cache_ttl": 300,
+    "keepalive_timeout": 30,
+    "total_timeout": 10,
+    "connect_timeout": 5,
+    "user_agent": "DiscordModerationBot",
+    # Prefix rewrites, e.g. {"https://api.thecatapi.com": "http://127.0.0.1:8080"}
+    # to point the bot at a local stub server in tests
+    "url_overrides": {},
+    # Consecutive failures before a host is short-circuited, and for how long
+    "breaker_failures": 5,
+    "breaker_reset": 30
+}
+
+def http_settings(config: dict = None) -> dict:
+    settings = dict(DEFAULT_HTTP_CONFIG)
+    settings.update(config or {})
+    return settings
+
+def create_session(config: dict = None) -> aiohttp.ClientSession:
+    """One pooled session for all outbound HTTP (must be created inside the event loop)"""
+    settings = http_settings(config)
+    connector = aiohttp.TCPConnector(
+        limit=settings["limit"],
+        limit_per_host=settings["limit_per_host"],
+        ttl_dns_cache=settings["dns_cache_ttl"],
+        keepalive_timeout=settings["keepalive_timeout"]
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings["total_timeout"],
+        connect=settings["connect_timeout"]
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"User-Agent": settings["user_agent"]}
+    )
+
+def rewrite_url(url: str, overrides: dict) -> str:
+    """Apply the longest matching url_overrides prefix"""
+    for prefix in sorted(overrides, key=len, reverse=True):
+        if url.startswith(prefix):
+            return overrides[prefix] + url[len(prefix):]
+    return url
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}; retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe after a cooldown"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.retry_in() == 0:
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.state == self.HALF_OPEN and not self.probing:
+            # Exactly one trial request; everyone else keeps failing fast
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+class HostStats:
+    """Request counts and latency for one upstream host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.short_circuited = 0
+        self.coalesced = 0
+        self.latencies = deque(maxlen=200)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile in ms over the last 200 requests"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+class ApiClient:
+    """Outbound JSON GETs with single-flight coalescing and per-host circuit breakers.
+
+    Identical GETs that are already in flight share one request. A host that
+    keeps failing is short-circuited with CircuitOpenError for ``reset_timeout``
+    seconds instead of tying up callers until their timeouts.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, config: dict = None):
+        settings = http_settings(config)
+        self.session = session
+        self.overrides = settings["url_overrides"]
+        self.failure_threshold = settings["breaker_failures"]
+        self.reset_timeout = settings["breaker_reset"]
+        self.inflight = {}
+        self.breakers = {}
+        self.hosts = defaultdict(HostStats)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[host]
+
+    async def get_json(self, url: str, **kwargs):
+        """Parsed JSON for a 200 response, None for other statuses.
+
+        Raises CircuitOpenError when the host is short-circuited, and
+        aiohttp/timeout errors from the request itself.
+        """
+        if self.overrides:
+            url = rewrite_url(url, self.overrides)
+        host = urlsplit(url).hostname or url
+        key = (url, repr(sorted(kwargs.items())))
+
+        task = self.inflight.get(key)
+        if task is not None:
+            self.hosts[host].coalesced += 1
+        else:
+            breaker = self.breaker(host)
+            if not breaker.allow():
+                self.hosts[host].short_circuited += 1
+                raise CircuitOpenError(host, breaker.retry_in())
+            task = asyncio.ensure_future(self._get_json(host, url, kwargs))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _get_json(self, host: str, url: str, kwargs: dict):
+        stats = self.hosts[host]
+        breaker = self.breaker(host)
+        stats.requests += 1
+        start = time.perf_counter()
+        healthy = False
+        try:
+            async with self.session.get(url, **kwargs) as resp:
+                if resp.status >= 500 or resp.status == 429:
+                    return None
+                data = await resp.json() if resp.status == 200 else None
+            healthy = True
+            return data
+        finally:
+            # Every outcome (bad JSON, cancellation, ...) settles the breaker,
+            # otherwise a half-open probe would never be released
+            stats.latencies.append((time.perf_counter() - start) * 1000)
+            if healthy:
+                breaker.record_success()
+            else:
+                stats.errors += 1
+                breaker.record_failure()
+
+    def stats(self) -> list:
+        """Per-host rows, busiest first"""
+        rows = []
+        for host, stats in self.hosts.items():
+            breaker = self.breakers.get(host)
+            rows.append({
+                "host": host,
+                "state": breaker.state if breaker else CircuitBreaker.CLOSED,
+                "requests": stats.requests,
+                "error_rate": stats.error_rate,
+                "p50_ms": stats.percentile(50),
+                "p95_ms": stats.percentile(95),
+                "coalesced": stats.coalesced,
+                "short_circuited": stats.short_circuited
+            })
+        rows.sort(key=lambda row: row["requests"], reverse=True)
+        return rows
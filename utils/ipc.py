@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+# Cluster IPC: newline-delimited JSON over a Unix socket (or "host:port" TCP
+# on platforms without Unix sockets). The launcher runs the hub; every worker
+# connects with a client.
+#
+#   hello      worker -> hub     {"op": "hello", "cluster": 0}
+#   broadcast  worker -> hub     {"op": "broadcast", "event": "...", "data": ...}
+#   event      hub -> workers    same payload, relayed to every other worker
+#   query      worker -> hub     {"op": "query", "id": 1, "query": "stats", "timeout": 2.0}
+#   request    hub -> workers    {"op": "request", "id": 7, "query": "stats", "data": ...}
+#   reply      worker -> hub     {"op": "reply", "id": 7, "data": ...}
+#   response   hub -> worker     {"op": "response", "id": 1, "data": [...one entry per worker...]}
+
+logger = logging.getLogger('cluster')
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+def parse_address(address: str):
+    """("tcp", host, port) for "host:port", otherwise ("unix", path)"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and '/' not in address:
+        return ('tcp', host or '127.0.0.1', int(port))
+    return ('unix', address)
+
+def spawn(tasks: set, coro) -> asyncio.Task:
+    """Start a task that stays in ``tasks`` until it finishes; failures are logged"""
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(lambda done: finished(tasks, done))
+    return task
+
+def finished(tasks: set, task: asyncio.Task):
+    tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error('IPC task failed', exc_info=task.exception())
+
+async def start_server(handler, address: str) -> asyncio.AbstractServer:
+    kind, *target = parse_address(address)
+    if kind == 'tcp':
+        return await asyncio.start_server(handler, *target)
+    return await asyncio.start_unix_server(handler, target[0])
+
+async def open_connection(address: str):
+    kind, *target = parse_address(address)
+    if kind == 'tcp':
+        return await asyncio.open_connection(*target)
+    return await asyncio.open_unix_connection(target[0])
+
+class IPCServer:
+    """Hub run by the cluster launcher: relays broadcasts and fans out queries"""
+
+    def __init__(self, address: str, query_timeout: float = 2.0):
+        self.address = address
+        self.query_timeout = query_timeout
+        self.clients = {}
+        self.pending = {}
+        self.tasks = set()
+        self.server = None
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        if parse_address(self.address)[0] == 'unix':
+            # Remove a stale socket left by a previous run
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+        self.server = await start_server(self.handle_client, self.address)
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for task in list(self.tasks):
+            task.cancel()
+        for writer in list(self.clients.values()):
+            writer.close()
+        self.clients.clear()
+
+    async def send(self, writer: asyncio.StreamWriter, message: dict):
+        try:
+            writer.write(encode(message))
+            await writer.drain()
+        except (ConnectionError, RuntimeError):
+            pass
+
+    async def send_all(self, message: dict, exclude=None):
+        await asyncio.gather(*(
+            self.send(writer, message)
+            for cluster_id, writer in list(self.clients.items())
+            if cluster_id != exclude
+        ))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cluster_id = None
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                op = message.get('op')
+                if op == 'hello':
+                    cluster_id = message.get('cluster')
+                    self.clients[cluster_id] = writer
+                    logger.info(f'Cluster {cluster_id} connected to IPC')
+                elif op == 'broadcast':
+                    await self.send_all({**message, 'op': 'event'}, exclude=cluster_id)
+                elif op == 'query':
+                    spawn(self.tasks, self.answer_query(writer, message))
+                elif op == 'reply':
+                    self.collect_reply(cluster_id, message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if cluster_id is not None and self.clients.get(cluster_id) is writer:
+                del self.clients[cluster_id]
+                logger.warning(f'Cluster {cluster_id} disconnected from IPC')
+            writer.close()
+
+    async def query(self, name: str, data=None, timeout: Optional[float] = None) -> list:
+        """Ask every connected worker; returns replies ordered by cluster id.
+
+        Workers that don't answer within the timeout are left out.
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        targets = set(self.clients)
+        replies = {}
+        self.pending[request_id] = (future, targets, replies)
+        try:
+            if targets:
+                await self.send_all({'op': 'request', 'id': request_id, 'query': name, 'data': data})
+                await asyncio.wait_for(future, timeout or self.query_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f'IPC query {name!r} timed out; {len(replies)}/{len(targets)} clusters answered')
+        finally:
+            self.pending.pop(request_id, None)
+        return [replies[cluster_id] for cluster_id in sorted(replies, key=str)]
+
+    def collect_reply(self, cluster_id, message: dict):
+        entry = self.pending.get(message.get('id'))
+        if entry is None:
+            return
+        future, targets, replies = entry
+        replies[cluster_id] = message.get('data')
+        if targets <= replies.keys() and not future.done():
+            future.set_result(None)
+
+    async def answer_query(self, writer: asyncio.StreamWriter, message: dict):
+        replies = await self.query(message.get('query'), message.get('data'), message.get('timeout'))
+        await self.send(writer, {'op': 'response', 'id': message.get('id'), 'data': replies})
+
+class IPCClient:
+    """Worker-side connection to the cluster hub; reconnects automatically"""
+
+    def __init__(self, address: str, cluster_id: int, reconnect_delay: float = 1.0):
+        self.address = address
+        self.cluster_id = cluster_id
+        self.reconnect_delay = reconnect_delay
+        self.query_handlers = {}
+        self.event_listeners = {}
+        self.pending = {}
+        self.tasks = set()
+        self.writer = None
+        self.ready = asyncio.Event()
+        self._ids = itertools.count(1)
+        self._task = None
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    def on_query(self, name: str, handler: Callable[[object], Awaitable[object]]):
+        """Answer cluster-wide queries with ``await handler(data)``"""
+        self.query_handlers[name] = handler
+
+    def on_event(self, event: str, listener: Callable[[object], None]):
+        """Call ``listener(data)`` for broadcasts from other workers"""
+        self.event_listeners[event] = listener
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self.tasks):
+            task.cancel()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def run(self):
+        while True:
+            try:
+                reader, writer = await open_connection(self.address)
+            except (ConnectionError, FileNotFoundError, OSError):
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            self.writer = writer
+            await self.send({'op': 'hello', 'cluster': self.cluster_id})
+            self.ready.set()
+            try:
+                async for line in reader:
+                    try:
+                        self.handle(json.loads(line))
+                    except ValueError:
+                        continue
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            finally:
+                self.ready.clear()
+                self.writer = None
+                writer.close()
+                for future in self.pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError('IPC connection lost'))
+                self.pending.clear()
+
+            logger.warning(f'Lost IPC connection, retrying in {self.reconnect_delay}s')
+            await asyncio.sleep(self.reconnect_delay)
+
+    def handle(self, message: dict):
+        op = message.get('op')
+        if op == 'request':
+            spawn(self.tasks, self.answer(message))
+        elif op == 'event':
+            listener = self.event_listeners.get(message.get('event'))
+            if listener is not None:
+                try:
+                    listener(message.get('data'))
+                except Exception:
+                    logger.exception(f'IPC listener for {message.get("event")!r} failed')
+        elif op == 'response':
+            future = self.pending.pop(message.get('id'), None)
+            if future is not None and not future.done():
+                future.set_result(message.get('data'))
+
+    async def answer(self, message: dict):
+        handler = self.query_handlers.get(message.get('query'))
+        data = None
+        if handler is not None:
+            try:
+                data = await handler(message.get('data'))
+            except Exception:
+                logger.exception(f'IPC query handler for {message.get("query")!r} failed')
+        await self.send({'op': 'reply', 'id': message.get('id'), 'data': data})
+
+    async def send(self, message: dict) -> bool:
+        if not self.connected:
+            return False
+        try:
+            self.writer.write(encode(message))
+            await self.writer.drain()
+            return True
+        except (ConnectionError, RuntimeError):
+            return False
+
+    async def broadcast(self, event: str, data=None) -> bool:
+        """Send an event to every other worker (dropped while disconnected)"""
+        return await self.send({'op': 'broadcast', 'event': event, 'data': data})
+
+    async def query(self, name: str, data=None, timeout: float = 2.0) -> list:
+        """Ask every worker, including this one; one reply per worker that answered"""
+        if not self.connected:
+            raise ConnectionError('Not connected to the cluster hub')
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await self.send({'op': 'query', 'id': request_id, 'query': name, 'data': data, 'timeout': timeout})
+            # The hub waits up to `timeout` for stragglers; leave room for the round trip
+            return await asyncio.wait_for(future, timeout + 1.0)
+        finally:
+            self.pending.pop(request_id, None)
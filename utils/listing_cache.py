@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger('bot_actions')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+class RedditListingCache:
+    """Per-subreddit hot listings, refreshed on a TTL and served from memory.
+
+    Each refresh is one ``hot.json?limit=100`` request; NSFW, stickied and
+    non-image posts are filtered out up front. Expired listings keep being
+    served while a background refresh runs. Recently shown post ids are
+    remembered per channel so a channel doesn't see the same meme twice in a row.
+    """
+
+    def __init__(self, fetch_json: Callable[[str], Awaitable[Optional[dict]]],
+                 ttl: float = 300.0, recent_per_channel: int = 50):
+        self.fetch_json = fetch_json
+        self.ttl = ttl
+        self.recent_per_channel = recent_per_channel
+        self.listings = {}
+        self.refreshing = {}
+        self.recent = defaultdict(lambda: deque(maxlen=self.recent_per_channel))
+
+    @staticmethod
+    def parse_listing(subreddit: str, data: dict) -> list:
+        posts = []
+        for child in data.get('data', {}).get('children', []):
+            post = child.get('data', {})
+            if post.get('over_18') or post.get('stickied'):
+                continue
+            if not post.get('url', '').endswith(IMAGE_EXTENSIONS):
+                continue
+            posts.append({
+                'id': post['id'],
+                'title': post['title'][:256],  # Discord title limit
+                'permalink': post['permalink'],
+                'image': post['url'],
+                'ups': post.get('ups', 0),
+                'comments': post.get('num_comments', 0),
+                'subreddit': subreddit,
+                'author': post.get('author', 'unknown')
+            })
+        return posts
+
+    def start_refresh(self, subreddit: str) -> asyncio.Task:
+        """The subreddit's in-flight refresh, starting one if there is none.
+
+        ``refreshing`` holds the task until it's done, so background refreshes
+        don't need a caller to keep a reference.
+        """
+        task = self.refreshing.get(subreddit)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(subreddit))
+            self.refreshing[subreddit] = task
+            task.add_done_callback(lambda done: self.refresh_done(subreddit, done))
+        return task
+
+    def refresh_done(self, subreddit: str, task: asyncio.Task):
+        self.refreshing.pop(subreddit, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f'Refreshing r/{subreddit} failed', exc_info=task.exception())
+
+    async def refresh(self, subreddit: str) -> list:
+        """Fetch the hot listing; concurrent refreshes of one subreddit share a request"""
+        return await asyncio.shield(self.start_refresh(subreddit))
+
+    async def _refresh(self, subreddit: str) -> list:
+        try:
+            data = await self.fetch_json(f'https://www.reddit.com/r/{subreddit}/hot.json?limit=100')
+        except Exception as e:
+            logger.warning(f'Failed to refresh r/{subreddit} listing: {e}')
+            data = None
+        if not data:
+            # Keep serving the old listing; retry after another TTL
+            stored = self.listings.get(subreddit)
+            if stored:
+                self.listings[subreddit] = (time.monotonic(), stored[1])
+                return stored[1]
+            return []
+        posts = self.parse_listing(subreddit, data)
+        self.listings[subreddit] = (time.monotonic(), posts)
+        return posts
+
+    async def posts(self, subreddit: str) -> list:
+        stored = self.listings.get(subreddit)
+        if stored is None:
+            return await self.refresh(subreddit)
+        fetched_at, posts = stored
+        if time.monotonic() - fetched_at >= self.ttl and subreddit not in self.refreshing:
+            # Stale-while-revalidate: answer from memory, refresh in the background
+            self.start_refresh(subreddit)
+        return posts
+
+    def is_warm(self, subreddits: list) -> bool:
+        """Whether at least one subreddit can be served without waiting on Reddit"""
+        return any(subreddit in self.listings and self.listings[subreddit][1] for subreddit in subreddits)
+
+    async def random_post(self, channel_id: int, subreddits: list) -> Optional[dict]:
+        """A random post not recently shown in the channel"""
+        recent = self.recent[channel_id]
+        fallback = None
+        # Only wait on Reddit when nothing is loaded yet; missing listings load in the background
+        loaded = [subreddit for subreddit in subreddits if subreddit in self.listings]
+        for subreddit in subreddits:
+            if subreddit not in self.listings:
+                self.start_refresh(subreddit)
+        candidates = loaded or subreddits
+        for subreddit in random.sample(candidates, len(candidates)):
+            posts = await self.posts(subreddit)
+            if not posts:
+                continue
+            fresh = [post for post in posts if post['id'] not in recent]
+            if fresh:
+                post = random.choice(fresh)
+                recent.append(post['id'])
+                return post
+            fallback = fallback or posts
+        if fallback:
+            # Everything was shown recently; start the rotation over,
+            # without repeating the very last post
+            last = recent[-1] if recent else None
+            recent.clear()
+            post = random.choice([post for post in fallback if post['id'] != last] or fallback)
+            recent.append(post['id'])
+            return post
+        return None
@@ -0,0 +1,79 @@
+import asyncio
+import csv
+import io
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+import discord
+
+def snapshot_overwrite(channel: discord.abc.GuildChannel, target) -> tuple:
+    """(allow, deny, present) bitfields of the channel's overwrite for ``target``"""
+    overwrite = channel.overwrites.get(target)
+    if overwrite is None:
+        return 0, 0, False
+    allow, deny = overwrite.pair()
+    return allow.value, deny.value, True
+
+def restore_overwrite(allow: int, deny: int, present: bool) -> Optional[discord.PermissionOverwrite]:
+    """The overwrite to put back; None removes it (there wasn't one before)"""
+    if not present:
+        return None
+    return discord.PermissionOverwrite.from_pair(discord.Permissions(allow), discord.Permissions(deny))
+
+class ChannelReport:
+    """Per-channel timing and errors for a lockdown or unlock run"""
+
+    def __init__(self):
+        self.rows = []
+        self.elapsed = 0.0
+
+    def record(self, channel: discord.abc.GuildChannel, elapsed_ms: float, error: Optional[str] = None):
+        self.rows.append((channel, elapsed_ms, error))
+
+    @property
+    def succeeded(self) -> list:
+        return [row for row in self.rows if row[2] is None]
+
+    @property
+    def failed(self) -> list:
+        return [row for row in self.rows if row[2] is not None]
+
+    def slowest(self, count: int = 3) -> list:
+        return sorted(self.rows, key=lambda row: row[1], reverse=True)[:count]
+
+    def to_csv(self) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['channel_id', 'channel', 'ms', 'status'])
+        for channel, elapsed_ms, error in self.rows:
+            writer.writerow([channel.id, channel.name, f'{elapsed_ms:.0f}', error or 'ok'])
+        return buffer.getvalue().encode()
+
+async def run_per_channel(channels: Iterable[discord.abc.GuildChannel],
+                          action: Callable[[discord.abc.GuildChannel], Awaitable[None]],
+                          concurrency: int = 10) -> ChannelReport:
+    """Run ``action`` on every channel with at most ``concurrency`` in flight.
+
+    Permission edits are bucketed per channel, so running them side by side
+    is what makes a 300-channel lockdown take seconds instead of minutes;
+    discord.py still waits out any 429s.
+    """
+    report = ChannelReport()
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async def run(channel):
+        async with semaphore:
+            start = time.perf_counter()
+            error = None
+            try:
+                await action(channel)
+            except discord.Forbidden:
+                error = 'missing permissions'
+            except discord.HTTPException as e:
+                error = str(e)[:100]
+            report.record(channel, (time.perf_counter() - start) * 1000, error)
+
+    await asyncio.gather(*(run(channel) for channel in channels))
+    report.elapsed = time.perf_counter() - started
+    return report
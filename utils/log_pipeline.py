@@ -0,0 +1,167 @@
+import logging
+import logging.handlers
+import queue
+import atexit
+import copy
+import json
+import random
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+DEFAULT_LOGGING_CONFIG = {
+    "level": "INFO",
+    "file": "bot.log",
+    "max_bytes": 5 * 1024 * 1024,
+    "backup_count": 5,
+    "queue_size": 10000,
+    "console": True,
+    "format": "text",
+    "sampling": {},
+    "levels": {
+        "discord": "INFO",
+        "discord.gateway": "WARNING",
+        "discord.http": "WARNING"
+    }
+}
+
+_exception_formatter = logging.Formatter()
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records are dropped and counted when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs on the logging thread (the event loop) once the level and
+        # sampling gates have passed. Arguments such as members and channels
+        # are live discord objects the loop keeps mutating, so they are
+        # stringified here; the listener thread only sees plain strings.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self._unreported:
+                # Let the log file show that records went missing
+                notice = logging.LogRecord(
+                    'logging', logging.WARNING, __file__, 0,
+                    f'Log queue overflow: dropped {self._unreported} record(s)', None, None
+                )
+                self.queue.put_nowait(notice)
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line with typed event fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, 'event', None),
+            "msg": record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        elif record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+_sample_rates = {}
+
+def setup_logging(config: Optional[dict] = None) -> DroppingQueueHandler:
+    """Route all logging through a bounded queue to handlers running on a background thread"""
+    global _listener, _queue_handler
+
+    settings = dict(DEFAULT_LOGGING_CONFIG)
+    settings.update(config or {})
+    settings['levels'] = {**DEFAULT_LOGGING_CONFIG['levels'], **(config or {}).get('levels', {})}
+
+    if settings['format'] == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(LOG_FORMAT)
+    _sample_rates.clear()
+    _sample_rates.update(settings['sampling'])
+    handlers = []
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        settings['file'],
+        maxBytes=settings['max_bytes'],
+        backupCount=settings['backup_count'],
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+
+    if settings['console']:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    if _listener is not None:
+        _listener.stop()
+
+    log_queue = queue.Queue(maxsize=settings['queue_size'])
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(settings['level'])
+
+    apply_log_levels(settings['levels'])
+
+    return _queue_handler
+
+def apply_log_levels(levels: dict):
+    """Set per-logger levels, e.g. {"discord": "INFO", "bot_actions": "WARNING"}"""
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+def log_event(logger: logging.Logger, event: str, msg: str, *args, level: int = logging.INFO, **fields):
+    """Log a structured event.
+
+    Nothing is built when the level is filtered out or the event is sampled
+    away (see the "sampling" config, e.g. {"member_join": 0.1}). ``msg`` and
+    ``args`` use lazy %-formatting; ``fields`` become typed JSON keys such as
+    guild_id, user_id, command and latency_ms.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = _sample_rates.get(event, 1.0)
+    if rate < 1.0 and random.random() >= rate:
+        return
+    logger.log(level, msg, *args, extra={'event': event, 'fields': fields})
+
+def dropped_log_records() -> int:
+    """Number of log records dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+def stop_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
@@ -0,0 +1,130 @@
+import asyncio
+import csv
+import io
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+import discord
+
+logger = logging.getLogger('moderation_actions')
+
+# Discord's bulk-ban endpoint takes at most this many users per request
+BULK_BAN_LIMIT = 200
+SNOWFLAKE = re.compile(r'\b\d{15,20}\b')
+
+def parse_user_ids(*sources: str) -> list:
+    """Unique user IDs found in the given texts, in first-seen order"""
+    seen = {}
+    for text in sources:
+        for match in SNOWFLAKE.findall(text or ''):
+            seen.setdefault(int(match), None)
+    return list(seen)
+
+class MassBanResult:
+    """Per-user outcome of a mass ban: 'banned', 'failed' or 'skipped' plus a detail"""
+
+    def __init__(self):
+        self.outcomes = {}
+        self.elapsed = 0.0
+        self.used_bulk = False
+
+    def record(self, user_id: int, status: str, detail: str = ''):
+        self.outcomes[user_id] = (status, detail)
+
+    def count(self, status: str) -> int:
+        return sum(1 for outcome, _ in self.outcomes.values() if outcome == status)
+
+    def report(self) -> bytes:
+        """CSV of every user and what happened to them"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['user_id', 'status', 'detail'])
+        for user_id, (status, detail) in self.outcomes.items():
+            writer.writerow([user_id, status, detail])
+        return buffer.getvalue().encode()
+
+class MassBanEngine:
+    """Bans a list of user IDs as fast as Discord allows.
+
+    Uses ``Guild.bulk_ban`` (up to 200 users per request) when the bot has
+    Manage Server; otherwise, or if the bulk endpoint is refused, bans one at
+    a time with at most ``concurrency`` requests in flight. discord.py queues
+    those on the guild's ban route bucket and retries 429s itself, so the
+    semaphore only bounds how far ahead of the bucket we get.
+    """
+
+    def __init__(self, guild: discord.Guild, reason: str, delete_message_seconds: int = 0,
+                 concurrency: int = 5, on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None):
+        self.guild = guild
+        self.reason = reason
+        self.delete_message_seconds = delete_message_seconds
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.total = 0
+        self.done = 0
+
+    async def progress(self, count: int):
+        self.done += count
+        if self.on_progress is not None:
+            await self.on_progress(self.done, self.total)
+
+    async def run(self, user_ids: Iterable[int], result: Optional[MassBanResult] = None) -> MassBanResult:
+        result = result or MassBanResult()
+        started = time.perf_counter()
+        pending = [user_id for user_id in user_ids if user_id not in result.outcomes]
+        self.total = len(pending)
+        if self.guild.me.guild_permissions.manage_guild:
+            pending = await self.bulk_ban(pending, result)
+        if pending:
+            await self.ban_each(pending, result)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def bulk_ban(self, user_ids: list, result: MassBanResult) -> list:
+        """Ban in chunks; returns the IDs still left to ban individually"""
+        for start in range(0, len(user_ids), BULK_BAN_LIMIT):
+            chunk = user_ids[start:start + BULK_BAN_LIMIT]
+            try:
+                outcome = await self.guild.bulk_ban(
+                    [discord.Object(user_id) for user_id in chunk],
+                    reason=self.reason,
+                    delete_message_seconds=self.delete_message_seconds
+                )
+            except discord.HTTPException as e:
+                logger.warning(f'Bulk ban refused in {self.guild.id} ({e}); falling back to single bans')
+                return user_ids[start:]
+            result.used_bulk = True
+            for user in outcome.banned:
+                result.record(user.id, 'banned', 'bulk')
+            for user in outcome.failed:
+                # Usually already banned or not a valid user
+                result.record(user.id, 'failed', 'rejected by bulk ban')
+            for user_id in chunk:
+                if user_id not in result.outcomes:
+                    result.record(user_id, 'failed', 'not reported by bulk ban')
+            await self.progress(len(chunk))
+        return []
+
+    async def ban_each(self, user_ids: list, result: MassBanResult):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def ban(user_id: int):
+            async with semaphore:
+                try:
+                    await self.guild.ban(
+                        discord.Object(user_id),
+                        reason=self.reason,
+                        delete_message_seconds=self.delete_message_seconds
+                    )
+                    result.record(user_id, 'banned')
+                except discord.NotFound:
+                    result.record(user_id, 'failed', 'unknown user')
+                except discord.Forbidden:
+                    result.record(user_id, 'failed', 'missing permissions')
+                except discord.HTTPException as e:
+                    result.record(user_id, 'failed', str(e)[:100])
+            await self.progress(1)
+
+        await asyncio.gather(*(ban(user_id) for user_id in user_ids))
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import discord
+
+# The gateway answers a member query for at most this many user IDs
+QUERY_BATCH = 100
+
+class MemberResolver:
+    """Looks members up without keeping whole guilds in memory.
+
+    Order: the gateway member cache, then a small LRU of recently fetched
+    members, then ``guild.fetch_member``. A chunked guild's cache is complete,
+    so a miss there means the user isn't a member and nothing is fetched.
+    Concurrent lookups of the same member share one HTTP request, and
+    concurrent full-list requests for the same guild share one chunk request.
+    """
+
+    def __init__(self, maxsize: int = 5000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.members = OrderedDict()
+        self.inflight = {}
+        self.chunking = {}
+        self.hits = 0
+        self.fetches = 0
+
+    def cached(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """The member from the gateway cache or the LRU, without any requests"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+
+        key = (guild.id, user_id)
+        entry = self.members.get(key)
+        if entry is not None:
+            member, stored = entry
+            if time.monotonic() - stored < self.ttl:
+                self.members.move_to_end(key)
+                self.hits += 1
+                return member
+            del self.members[key]
+        return None
+
+    async def get(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """Resolve a member, or None if they aren't in the guild"""
+        member = self.cached(guild, user_id)
+        if member is not None or guild.chunked:
+            return member
+
+        key = (guild.id, user_id)
+        task = self.inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(guild, user_id))
+            self.inflight[key] = task
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+    async def get_many(self, guild: discord.Guild, user_ids: Iterable[int], concurrency: int = 2) -> dict:
+        """Resolve several members; {user_id: member or None}.
+
+        Misses are looked up QUERY_BATCH at a time with a gateway member query
+        (at most ``concurrency`` in flight) rather than one fetch_member each.
+        IDs in a batch that times out come back as None, like non-members.
+        """
+        resolved = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            resolved[user_id] = self.cached(guild, user_id)
+            if resolved[user_id] is None:
+                missing.append(user_id)
+        if not missing or guild.chunked:
+            return resolved
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def query(batch: list):
+            async with semaphore:
+                self.fetches += 1
+                try:
+                    members = await guild.query_members(user_ids=batch, limit=QUERY_BATCH, cache=False)
+                except (asyncio.TimeoutError, discord.ClientException):
+                    return
+            for member in members:
+                self.remember(member)
+                resolved[member.id] = member
+
+        await asyncio.gather(*(query(missing[start:start + QUERY_BATCH]) for start in range(0, len(missing), QUERY_BATCH)))
+        return resolved
+
+    async def _fetch(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        key = (guild.id, user_id)
+        try:
+            self.fetches += 1
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+        finally:
+            self.inflight.pop(key, None)
+
+        self.remember(member)
+        return member
+
+    def remember(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self.members[key] = (member, time.monotonic())
+        self.members.move_to_end(key)
+        while len(self.members) > self.maxsize:
+            self.members.popitem(last=False)
+
+    def forget(self, guild_id: int, user_id: int):
+        self.members.pop((guild_id, user_id), None)
+
+    def forget_guild(self, guild_id: int):
+        for key in [key for key in self.members if key[0] == guild_id]:
+            del self.members[key]
+
+    async def guild_members(self, guild: discord.Guild) -> list:
+        """Every member of the guild, chunking on demand when the cache isn't full.
+
+        The chunked list isn't cached, so it's freed once the caller is done.
+        """
+        if guild.chunked:
+            return guild.members
+
+        task = self.chunking.get(guild.id)
+        if task is None:
+            task = asyncio.ensure_future(guild.chunk(cache=False))
+            self.chunking[guild.id] = task
+            task.add_done_callback(lambda _: self.chunking.pop(guild.id, None))
+        return await asyncio.shield(task)
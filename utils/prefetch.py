@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger('bot_actions')
+
+class PrefetchBuffer:
+    """Queue of ready-to-send payloads kept topped up in the background.
+
+    When a pop leaves fewer than ``low`` items, a background task refills the
+    queue up to ``high``. Payloads older than ``max_age`` seconds are dropped.
+    If the fetcher keeps failing, refilling pauses until the next pop.
+    """
+
+    def __init__(self, name: str, fetcher: Callable[[], Awaitable[Optional[dict]]],
+                 low: int = 2, high: int = 5, max_age: float = 600.0, max_failures: int = 3):
+        self.name = name
+        self.fetcher = fetcher
+        self.low = low
+        self.high = high
+        self.max_age = max_age
+        self.max_failures = max_failures
+        self.items = deque()
+        self.wanted = asyncio.Event()
+        self.task = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        self.wanted.set()
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def fetch(self) -> Optional[dict]:
+        """One live fetch; None on any failure"""
+        try:
+            return await self.fetcher()
+        except Exception as e:
+            logger.debug(f'Prefetch {self.name} fetch failed: {e}')
+            return None
+
+    async def run(self):
+        while True:
+            await self.wanted.wait()
+            failures = 0
+            while len(self.items) < self.high and failures < self.max_failures:
+                payload = await self.fetch()
+                if payload is None:
+                    failures += 1
+                    await asyncio.sleep(2 ** failures)
+                    continue
+                failures = 0
+                self.items.append((time.monotonic(), payload))
+            self.wanted.clear()
+
+    def pop(self) -> Optional[dict]:
+        """A buffered payload, or None if the buffer is empty"""
+        now = time.monotonic()
+        payload = None
+        while self.items:
+            stored, item = self.items.popleft()
+            if now - stored < self.max_age:
+                payload = item
+                break
+        if len(self.items) < self.low:
+            self.wanted.set()
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import struct
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Union
+
+from utils.ascii_fonts import BITMAP, BITMAP_FALLBACK, BLOCK, BLOCK_FALLBACK
+
+try:
+    import qrcode
+    QR_AVAILABLE = True
+except ImportError:
+    QR_AVAILABLE = False
+
+def encode_png(width: int, height: int, rows: list, rgb: bool = False) -> bytes:
+    """Encode 8-bit grayscale (or RGB) rows, one ``bytes`` of ``width`` pixels each, as a PNG"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    raw = b''.join(b'\x00' + row for row in rows)  # filter type 0 per scanline
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2 if rgb else 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6))
+            + chunk(b'IEND', b''))
+
+def render_qr(text: str, size: int = 300) -> bytes:
+    """PNG bytes of a QR code about ``size`` pixels square (requires the qrcode package)"""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=4)
+    qr.add_data(text)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    box = max(1, size // len(matrix))
+    rows = []
+    for modules in matrix:
+        row = b''.join((b'\x00' if dark else b'\xff') * box for dark in modules)
+        rows.extend([row] * box)
+    width = len(matrix) * box
+    return encode_png(width, width, rows)
+
+def render_swatch(rgb: tuple, width: int = 240, height: int = 160) -> bytes:
+    """PNG of the color with a strip of darker and lighter shades along the bottom"""
+    band = height // 4
+    main = bytes(rgb) * width
+    shades = b''
+    steps = [0.4, 0.7, 1.0, 1.3, 1.6]
+    for i, factor in enumerate(steps):
+        shade = bytes(min(255, int(channel * factor)) if factor <= 1
+                      else int(channel + (255 - channel) * (factor - 1)) for channel in rgb)
+        shades += shade * (width * (i + 1) // len(steps) - width * i // len(steps))
+    rows = [main] * (height - band) + [shades] * band
+    return encode_png(width, height, rows, rgb=True)
+
+def render_ascii(text: str, font: str = 'block') -> str:
+    """Banner text in one of ascii_fonts.FONTS"""
+    text = text.upper()
+    if font == 'block':
+        glyphs = [BLOCK.get(char, BLOCK_FALLBACK) for char in text]
+        return '\n'.join(''.join(glyph[i] for glyph in glyphs).rstrip() for i in range(4))
+    lines = []
+    for i in range(5):
+        line = ''
+        for char in text:
+            glyph = BITMAP.get(char)
+            # pixel draws with blocks; banner draws each letter with itself,
+            # except unknown characters (a '`' would close the code block)
+            if font == 'pixel' or char == ' ':
+                ink = '█'
+            elif glyph is None:
+                ink = '#'
+            else:
+                ink = char
+            glyph = glyph or BITMAP_FALLBACK
+            # Blank out the '.' cells first: a '.' glyph's ink is '.' too
+            line += glyph[i].replace('.', ' ').replace('#', ink) + ' '
+        lines.append(line.rstrip())
+    return '\n'.join(lines)
+
+def content_key(render: Callable, args: tuple) -> str:
+    """Hash of the renderer and its inputs"""
+    return hashlib.sha256(repr((render.__name__, args)).encode()).hexdigest()
+
+class RenderCache:
+    """Content-addressed cache of rendered output, rendering misses on an executor.
+
+    Entries are keyed by a hash of the renderer and its inputs, and the
+    least recently used are evicted once ``max_bytes`` is exceeded.
+    Concurrent requests for the same render share one job, so popular
+    inputs (e.g. a server invite QR code) are only rendered once.
+    """
+
+    def __init__(self, executor: Executor, max_bytes: int = 8 * 1024 * 1024):
+        self.executor = executor
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.rendering = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, render: Callable[..., Union[bytes, str]], *args) -> Union[bytes, str]:
+        key = content_key(render, args)
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+        self.misses += 1
+        future = self.rendering.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, render, *args)
+            self.rendering[key] = future
+            future.add_done_callback(lambda done: self.store(key, done))
+        return await asyncio.shield(future)
+
+    def store(self, key: str, future: asyncio.Future):
+        self.rendering.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        data = future.result()
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        self.entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
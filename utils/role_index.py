@@ -0,0 +1,99 @@
+from collections import defaultdict
+from itertools import islice
+from typing import Optional
+
+import discord
+
+class RoleIndex:
+    """Per-guild role id -> member id sets, kept current from member events.
+
+    A guild's index is built with one pass over its cached members the first
+    time it's needed; after that counts and samples don't touch guild.members.
+    Guilds that aren't chunked (low-memory mode) aren't indexed, since member
+    updates for uncached members never reach the bot.
+    """
+
+    def __init__(self):
+        self.guilds = {}
+
+    @staticmethod
+    def role_ids(member) -> tuple:
+        # Member._roles is the raw snowflake list; Member.roles would sort Role objects
+        return tuple(member._roles)
+
+    def build(self, guild: discord.Guild) -> dict:
+        roles = defaultdict(set)
+        for member in guild.members:
+            for role_id in self.role_ids(member):
+                roles[role_id].add(member.id)
+        self.guilds[guild.id] = roles
+        return roles
+
+    def roles_for(self, guild: discord.Guild) -> Optional[dict]:
+        roles = self.guilds.get(guild.id)
+        if roles is None and guild.chunked:
+            roles = self.build(guild)
+        return roles
+
+    def member_ids(self, guild: discord.Guild, role: discord.Role) -> Optional[set]:
+        """IDs of members with the role, or None if the guild isn't indexed"""
+        if role.is_default():
+            return {member.id for member in guild.members}
+        roles = self.roles_for(guild)
+        if roles is None:
+            return None
+        return roles.get(role.id, set())
+
+    def member_count(self, guild: discord.Guild, role: discord.Role) -> int:
+        """Members with the role; only cached ones when the guild isn't indexed"""
+        if role.is_default():
+            return guild.member_count or 0
+        roles = self.roles_for(guild)
+        if roles is None:
+            return len(role.members)
+        return len(roles.get(role.id, ()))
+
+    def count_text(self, guild: discord.Guild, role: discord.Role) -> str:
+        """member_count for display, marked as a lower bound when it's cache-only"""
+        count = self.member_count(guild, role)
+        if role.is_default() or self.roles_for(guild) is not None:
+            return f"{count:,}"
+        return f"at least {count:,} (uncached members not counted)"
+
+    def sample_members(self, guild: discord.Guild, role: discord.Role, limit: int = 5) -> list:
+        """Up to ``limit`` cached members with the role"""
+        roles = None if role.is_default() else self.roles_for(guild)
+        if roles is None:
+            return role.members[:limit]
+        members = (guild.get_member(member_id) for member_id in roles.get(role.id, ()))
+        return list(islice((member for member in members if member is not None), limit))
+
+    def member_joined(self, member: discord.Member):
+        roles = self.guilds.get(member.guild.id)
+        if roles is not None:
+            for role_id in self.role_ids(member):
+                roles[role_id].add(member.id)
+
+    def member_left(self, guild_id: int, user_id: int):
+        roles = self.guilds.get(guild_id)
+        if roles is not None:
+            for members in roles.values():
+                members.discard(user_id)
+
+    def member_updated(self, before: discord.Member, after: discord.Member):
+        roles = self.guilds.get(after.guild.id)
+        if roles is None:
+            return
+        old, new = set(self.role_ids(before)), set(self.role_ids(after))
+        for role_id in old - new:
+            roles[role_id].discard(after.id)
+        for role_id in new - old:
+            roles[role_id].add(after.id)
+
+    def role_deleted(self, role: discord.Role):
+        roles = self.guilds.get(role.guild.id)
+        if roles is not None:
+            roles.pop(role.id, None)
+
+    def drop(self, guild_id: int):
+        self.guilds.pop(guild_id, None)
@@ -0,0 +1,208 @@
+import asyncio
+import heapq
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+import discord
+
+logger = logging.getLogger('bot_actions')
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+# Failed jobs are retried after RETRY_BASE * 2**(attempt - 1) seconds, at most RETRY_MAX,
+# and dropped after MAX_ATTEMPTS runs (about an hour of retries)
+RETRY_BASE = 30
+RETRY_MAX = 3600
+MAX_ATTEMPTS = 8
+# Retrying won't help: the bot lost access, or the target is gone
+PERMANENT_ERRORS = (discord.Forbidden, discord.NotFound)
+
+def timestamp(when: datetime) -> float:
+    """Unix time for a datetime; naive datetimes are treated as UTC (datetime.utcnow())"""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+class Scheduler:
+    """Persistent timers for delayed actions (lockdown expiry, giveaways, ...).
+
+    Jobs are rows in the ``scheduled_jobs`` table, mirrored in a min-heap of
+    (run_at, job_id) that one dispatcher task sleeps on. On startup every
+    pending row is loaded, so jobs that came due while the bot was down run
+    as soon as it's ready. Cogs register a handler per job kind; jobs of a
+    kind with no handler yet (e.g. a deferred cog) wait until one registers,
+    and jobs for a guild that's in an outage wait until it's available again.
+    Each cluster worker only runs the jobs of guilds on its own shards.
+    A job's row is deleted once its handler succeeds; if the handler raises,
+    the job is kept and retried with exponential backoff, up to MAX_ATTEMPTS
+    runs. Forbidden and NotFound errors drop the job straight away.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.handlers = {}
+        self.jobs = {}
+        self.heap = []
+        self.waiting = defaultdict(list)
+        self.parked = defaultdict(list)
+        self.attempts = defaultdict(int)
+        self.running = set()
+        self.wake = asyncio.Event()
+        self.task = None
+
+    @property
+    def db(self):
+        return self.bot.db
+
+    def register(self, kind: str, handler: JobHandler):
+        self.handlers[kind] = handler
+        for job_id in self.waiting.pop(kind, []):
+            self.push(job_id)
+
+    def push(self, job_id: int):
+        heapq.heappush(self.heap, (self.jobs[job_id][2], job_id))
+        self.wake.set()
+
+    def load(self):
+        cursor = self.db.cursor()
+        cursor.execute("SELECT id, kind, guild_id, run_at, payload FROM scheduled_jobs")
+        for job_id, kind, guild_id, run_at, payload in cursor.fetchall():
+            if job_id in self.jobs:
+                continue  # already queued by schedule()
+            self.jobs[job_id] = (kind, guild_id, run_at, json.loads(payload))
+            self.push(job_id)
+
+    def schedule(self, kind: str, when: datetime, payload: dict, guild_id: Optional[int] = None) -> int:
+        """Persist a job to run at ``when`` and return its id"""
+        run_at = timestamp(when)
+        cursor = self.db.cursor()
+        cursor.execute(
+            "INSERT INTO scheduled_jobs (kind, guild_id, run_at, payload) VALUES (?, ?, ?, ?)",
+            (kind, guild_id, run_at, json.dumps(payload))
+        )
+        self.db.commit()
+        job_id = cursor.lastrowid
+        self.jobs[job_id] = (kind, guild_id, run_at, payload)
+        self.push(job_id)
+        return job_id
+
+    def cancel(self, kind: str, guild_id: Optional[int] = None, **match) -> int:
+        """Drop pending jobs of a kind (for a guild, with matching payload values); returns how many"""
+        cancelled = [
+            job_id for job_id, (job_kind, job_guild, _, payload) in self.jobs.items()
+            if job_kind == kind
+            and (guild_id is None or job_guild == guild_id)
+            and all(payload.get(key) == value for key, value in match.items())
+        ]
+        self.forget(cancelled)
+        return len(cancelled)
+
+    def drop_guild(self, guild_id: int):
+        """Delete every job of a guild the bot has left"""
+        self.parked.pop(guild_id, None)
+        self.forget([job_id for job_id, job in self.jobs.items() if job[1] == guild_id])
+
+    def guild_available(self, guild_id: int):
+        """Re-queue the jobs that came due while the guild was unavailable"""
+        for job_id in self.parked.pop(guild_id, []):
+            if job_id in self.jobs:
+                self.push(job_id)
+
+    def forget(self, job_ids: list):
+        for job_id in job_ids:
+            # Heap entries for dropped jobs are skipped when they come up
+            del self.jobs[job_id]
+            self.attempts.pop(job_id, None)
+        if job_ids:
+            self.db.cursor().executemany("DELETE FROM scheduled_jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+            self.db.commit()
+
+    def owns_guild(self, guild_id: int) -> bool:
+        """Whether the guild is on one of this process's shards"""
+        shard_ids = getattr(self.bot, 'shard_ids', None)
+        if shard_ids is None or not self.bot.shard_count:
+            return True
+        return (guild_id >> 22) % self.bot.shard_count in shard_ids
+
+    def start(self):
+        self.load()
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self.wake.clear()
+            if not self.heap:
+                await self.wake.wait()
+                continue
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    # Woken early when a sooner job is scheduled
+                    await asyncio.wait_for(self.wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, job_id = heapq.heappop(self.heap)
+            if job_id in self.jobs:
+                self.dispatch(job_id)
+
+    def dispatch(self, job_id: int):
+        kind, guild_id, _, payload = self.jobs[job_id]
+        if guild_id is not None:
+            if not self.owns_guild(guild_id):
+                # Another cluster worker runs this guild's jobs; leave its row alone
+                del self.jobs[job_id]
+                return
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                # The bot left the guild while it was down
+                self.forget([job_id])
+                return
+            if guild.unavailable:
+                self.parked[guild_id].append(job_id)
+                return
+        if kind not in self.handlers:
+            self.waiting[kind].append(job_id)
+            return
+        task = asyncio.create_task(self.execute(job_id, kind, payload))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+
+    async def execute(self, job_id: int, kind: str, payload: dict):
+        try:
+            await self.handlers[kind](payload)
+        except Exception as e:
+            self.retry(job_id, e)
+            return
+        self.attempts.pop(job_id, None)
+        self.jobs.pop(job_id, None)
+        self.db.cursor().execute("DELETE FROM scheduled_jobs WHERE id = ?", (job_id,))
+        self.db.commit()
+
+    def retry(self, job_id: int, error: Exception):
+        """Push a failed job back with exponential backoff, or drop it for good"""
+        if job_id not in self.jobs:
+            return  # cancelled while running
+        self.attempts[job_id] += 1
+        kind, guild_id, _, payload = self.jobs[job_id]
+        if isinstance(error, PERMANENT_ERRORS) or self.attempts[job_id] >= MAX_ATTEMPTS:
+            logger.error(f'Scheduled job {job_id} ({kind}) failed: {error}; giving up after {self.attempts[job_id]} attempt(s)')
+            self.forget([job_id])
+            return
+        delay = min(RETRY_BASE * 2 ** (self.attempts[job_id] - 1), RETRY_MAX)
+        run_at = time.time() + delay
+        logger.error(f'Scheduled job {job_id} ({kind}) failed: {error}; retrying in {delay}s')
+        self.jobs[job_id] = (kind, guild_id, run_at, payload)
+        self.db.cursor().execute("UPDATE scheduled_jobs SET run_at = ? WHERE id = ?", (run_at, job_id))
+        self.db.commit()
+        self.push(job_id)
@@ -0,0 +1,71 @@
+import time
+from collections import defaultdict
+from typing import Optional
+
+class ShardStats:
+    """Counters for a single gateway shard"""
+
+    __slots__ = ('connects', 'disconnects', 'resumes', 'last_connect', 'minute', 'events_this_minute', 'events_last_minute', 'total_events')
+
+    def __init__(self):
+        self.connects = 0
+        self.disconnects = 0
+        self.resumes = 0
+        self.last_connect = None
+        self.minute = 0
+        self.events_this_minute = 0
+        self.events_last_minute = 0
+        self.total_events = 0
+
+    @property
+    def reconnects(self) -> int:
+        # The first connect isn't a reconnect
+        return max(0, self.connects - 1) + self.resumes
+
+class ShardMetrics:
+    """Per-shard event rates and reconnect counts"""
+
+    def __init__(self):
+        self.shards = defaultdict(ShardStats)
+
+    def record_event(self, shard_id: Optional[int]):
+        stats = self.shards[shard_id or 0]
+        minute = int(time.monotonic() // 60)
+        if minute != stats.minute:
+            # Roll the one-minute window; anything older than a minute counts as idle
+            stats.events_last_minute = stats.events_this_minute if minute == stats.minute + 1 else 0
+            stats.events_this_minute = 0
+            stats.minute = minute
+        stats.events_this_minute += 1
+        stats.total_events += 1
+
+    def events_per_minute(self, shard_id: int) -> int:
+        """Events seen during the last complete minute"""
+        stats = self.shards[shard_id]
+        minute = int(time.monotonic() // 60)
+        if minute == stats.minute:
+            return stats.events_last_minute
+        if minute == stats.minute + 1:
+            return stats.events_this_minute
+        return 0
+
+    def record_connect(self, shard_id: Optional[int]):
+        stats = self.shards[shard_id or 0]
+        stats.connects += 1
+        stats.last_connect = time.time()
+
+    def record_disconnect(self, shard_id: Optional[int]):
+        self.shards[shard_id or 0].disconnects += 1
+
+    def record_resume(self, shard_id: Optional[int]):
+        self.shards[shard_id or 0].resumes += 1
+
+    def snapshot(self, latencies: list) -> list:
+        """Per-shard rows: (shard_id, latency_ms, events/min, reconnects), hottest first"""
+        rows = []
+        for shard_id, latency in latencies:
+            stats = self.shards[shard_id]
+            latency_ms = latency * 1000 if latency == latency and latency != float('inf') else None
+            rows.append((shard_id, latency_ms, self.events_per_minute(shard_id), stats.reconnects))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
@@ -0,0 +1,66 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+class StartupProfiler:
+    """Records a timeline of startup phases and per-cog load times"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = []
+        self.cogs = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name: str, start: float, end: Optional[float] = None):
+        """Record a phase that ran between two perf_counter() timestamps"""
+        end = end if end is not None else time.perf_counter()
+        self.phases.append({
+            "phase": name,
+            "start_ms": round((start - self.started) * 1000, 2),
+            "duration_ms": round((end - start) * 1000, 2)
+        })
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, start)
+
+    def record_cog(self, name: str, import_ms: float, setup_ms: float, deferred: bool = False, error: Optional[str] = None):
+        self.cogs.append({
+            "cog": name,
+            "import_ms": round(import_ms, 2),
+            "setup_ms": round(setup_ms, 2),
+            "total_ms": round(import_ms + setup_ms, 2),
+            "deferred": deferred,
+            "error": error
+        })
+
+    def summary(self) -> str:
+        """One-line summary of the slowest phases and cogs"""
+        phases = sorted(self.phases, key=lambda p: p["duration_ms"], reverse=True)[:3]
+        cogs = sorted(self.cogs, key=lambda c: c["total_ms"], reverse=True)[:3]
+        return (
+            f"Startup {self.elapsed_ms():.0f}ms | slowest phases: "
+            + ", ".join(f"{p['phase']} {p['duration_ms']:.0f}ms" for p in phases)
+            + " | slowest cogs: "
+            + ", ".join(f"{c['cog']} {c['total_ms']:.0f}ms" for c in cogs)
+        )
+
+    def write_report(self, path: str):
+        """Write the full timeline as JSON"""
+        report = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "total_ms": round(self.elapsed_ms(), 2),
+            "phases": self.phases,
+            "cogs": self.cogs
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)